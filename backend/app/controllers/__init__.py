@@ -5,6 +5,8 @@ from app.controllers.user_controller import UserController
 from app.controllers.admin_controller import AdminController
 from app.controllers.analytics_controller import AnalyticsController
 from app.controllers.email_controller import EmailController
+from app.controllers.search_controller import SearchController
+from app.controllers.stream_controller import StreamController
 
 __all__ = [
     "AuthController",
@@ -12,5 +14,7 @@ __all__ = [
     "UserController",
     "AdminController",
     "AnalyticsController",
-    "EmailController"
+    "EmailController",
+    "SearchController",
+    "StreamController"
 ]
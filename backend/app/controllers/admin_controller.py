@@ -2,18 +2,27 @@
 # ADMIN CONTROLLER - Admin Business Logic
 # ============================================
 
-from typing import Optional, List
+import asyncio
+import os
+import shutil
+import tempfile
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException, status
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import FileResponse
 
-from app.services import AdminService
+from app.services import AdminService, ImportService, snapshot_writer
+from app.services.import_service import IMPORT_KINDS, IMPORT_FORMATS
+from app.repositories import InvalidCursorError, SNAPSHOT_TABLES
 from app.schemas import (
     UserResponse,
     AdminUserResponse,
     AdminActionRequest,
     AdminAuditLogResponse,
     CurrentUser,
-    MessageResponse
+    MessageResponse,
+    ImportJobResponse,
+    SnapshotManifestResponse
 )
 
 
@@ -123,11 +132,18 @@ class AdminController:
         self,
         current_user: CurrentUser,
         skip: int = 0,
-        limit: int = 50
-    ) -> List[AdminAuditLogResponse]:
-        """Get admin audit logs"""
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[AdminAuditLogResponse], Optional[str]]:
+        """Get admin audit logs. Returns (logs, next_cursor)"""
         self._check_admin(current_user)
-        return await self.admin_service.get_audit_logs(skip, limit)
+        try:
+            return await self.admin_service.get_audit_logs(skip, limit, cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
     
     async def deactivate_user(
         self,
@@ -180,3 +196,96 @@ class AdminController:
             )
         
         return MessageResponse(message="User reactivated successfully")
+    
+    async def start_import(
+        self,
+        current_user: CurrentUser,
+        kind: str,
+        upload: UploadFile,
+        format: Optional[str] = None
+    ) -> ImportJobResponse:
+        """Start a background import of an uploaded file"""
+        self._check_admin(current_user)
+        
+        if kind not in IMPORT_KINDS:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown import kind (expected one of: {', '.join(IMPORT_KINDS)})"
+            )
+        
+        # Without an explicit format, go by the file extension
+        if not format:
+            format = os.path.splitext(upload.filename or "")[1].lstrip(".").lower()
+        if format not in IMPORT_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported import format (expected one of: {', '.join(IMPORT_FORMATS)})"
+            )
+        
+        # The upload is gone once the request ends; the import reads a copy
+        with tempfile.NamedTemporaryFile(suffix=f".{format}", delete=False) as file:
+            await asyncio.to_thread(shutil.copyfileobj, upload.file, file)
+        
+        return ImportService.start_job(kind, format, file.name, current_user.id)
+    
+    async def get_import_job(
+        self,
+        current_user: CurrentUser,
+        job_id: str
+    ) -> ImportJobResponse:
+        """Get the progress report of an import"""
+        self._check_admin(current_user)
+        
+        job = ImportService.get_job(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Import job not found"
+            )
+        
+        return job
+    
+    async def get_snapshot(self, current_user: CurrentUser) -> SnapshotManifestResponse:
+        """Get the partitions of the latest analytics snapshot"""
+        self._check_admin(current_user)
+        return snapshot_writer.describe()
+    
+    async def start_snapshot(self, current_user: CurrentUser, full: bool = False) -> SnapshotManifestResponse:
+        """Start writing the analytics snapshot in the background"""
+        self._check_admin(current_user)
+        
+        if not snapshot_writer.start(full):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A snapshot is already being written"
+            )
+        
+        return snapshot_writer.describe()
+    
+    async def download_snapshot(
+        self,
+        current_user: CurrentUser,
+        table: str,
+        month: str
+    ) -> FileResponse:
+        """Download the Parquet file of one month of a snapshot table"""
+        self._check_admin(current_user)
+        
+        if table not in SNAPSHOT_TABLES:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown snapshot table (expected one of: {', '.join(SNAPSHOT_TABLES)})"
+            )
+        
+        path = snapshot_writer.partition_path(table, month)
+        if not os.path.isfile(path):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Snapshot partition not found"
+            )
+        
+        return FileResponse(
+            path,
+            media_type="application/vnd.apache.parquet",
+            filename=f"{table}-{month}.parquet"
+        )
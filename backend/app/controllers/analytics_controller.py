@@ -2,14 +2,19 @@
 # ANALYTICS CONTROLLER - Analytics Business Logic
 # ============================================
 
+from datetime import date, datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.services import AnalyticsService
+from app.services import AnalyticsService, PivotUnavailableError
 from app.schemas import (
     AnalyticsResponse,
     DashboardStats,
+    TimeSeriesResponse,
+    PivotResponse,
+    TicketCountFilters,
+    TicketCountsResponse,
     CurrentUser
 )
 
@@ -47,3 +52,61 @@ class AnalyticsController:
     async def get_category_summary(self) -> list:
         """Get summary by SAP category"""
         return await self.analytics_service.get_category_summary()
+    
+    async def get_timeseries(
+        self,
+        metric: str,
+        granularity: str = "day",
+        group_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> TimeSeriesResponse:
+        """Get a metric as a gap-filled time series"""
+        try:
+            return await self.analytics_service.get_timeseries(metric, granularity, group_by, start, end)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def get_backlog_history(
+        self,
+        group_by: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> TimeSeriesResponse:
+        """Get open tickets per day, replayed from the status history"""
+        try:
+            return await self.analytics_service.get_backlog_history(group_by, start, end)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def get_pivot(
+        self,
+        rows: str,
+        cols: Optional[str] = None,
+        measure: str = "count",
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> PivotResponse:
+        """Get a pivot over the analytics snapshot"""
+        try:
+            return await self.analytics_service.get_pivot(rows, cols, measure, start, end)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except PivotUnavailableError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
+    
+    async def get_ticket_counts(self, filters: TicketCountFilters, engine: str = "memory") -> TicketCountsResponse:
+        """Get ticket counts per status, priority and category under filters"""
+        return await self.analytics_service.get_ticket_counts(filters, engine)
@@ -3,11 +3,12 @@
 # ============================================
 # Uses Microsoft Graph API with SSO token
 
-from typing import Optional
+from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.services import EmailProcessor, EmailService
+from app.repositories import InvalidCursorError
 from app.schemas import (
     EmailSourceResponse,
     CurrentUser,
@@ -24,6 +25,14 @@ class EmailController:
         self.email_processor = EmailProcessor(db)
         self.email_service = EmailService(db)
     
+    def _check_admin(self, current_user: CurrentUser):
+        """Check if current user is admin"""
+        if not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin access required"
+            )
+    
     async def trigger_email_fetch(
         self,
         access_token: str,
@@ -115,12 +124,20 @@ class EmailController:
         current_user: CurrentUser,
         category: str,
         skip: int = 0,
-        limit: int = 50
-    ) -> list:
-        """Get emails by detected category"""
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Get emails by detected category. Returns (emails, next_cursor)"""
         self._check_admin(current_user)
-        return await self.email_service.get_emails_by_category(
-            category=category,
-            skip=skip,
-            limit=limit
-        )
+        try:
+            return await self.email_service.get_emails_by_category(
+                category=category,
+                skip=skip,
+                limit=limit,
+                cursor=cursor
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
@@ -0,0 +1,27 @@
+# ============================================
+# SEARCH CONTROLLER - Search Business Logic
+# ============================================
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.services import SearchService
+from app.schemas import SearchSuggestResponse
+
+
+class SearchController:
+    """Controller for search operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.search_service = SearchService(db)
+    
+    async def suggest(self, query: str, limit: int = 5) -> SearchSuggestResponse:
+        """Autocomplete suggestions for a partial query"""
+        query = query.strip()
+        if len(query) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must be at least 2 characters"
+            )
+        
+        return await self.search_service.suggest(query, limit)
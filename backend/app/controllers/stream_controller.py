@@ -0,0 +1,21 @@
+# ============================================
+# STREAM CONTROLLER - Server-Sent Event Streams
+# ============================================
+
+from typing import Optional
+from fastapi.responses import StreamingResponse
+
+from app.services import dashboard_stream
+
+
+class StreamController:
+    """Controller for live update streams"""
+    
+    async def stream_dashboard(self, last_event_id: Optional[str] = None) -> StreamingResponse:
+        """Live dashboard deltas as text/event-stream"""
+        return StreamingResponse(
+            dashboard_stream.connect(last_event_id),
+            media_type="text/event-stream",
+            # No caching or proxy buffering, so each event is delivered as it is sent
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
@@ -3,20 +3,31 @@
 # ============================================
 
 from typing import Optional, List
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_400_BAD_REQUEST
 
-from app.services import TicketService
+from app.services import TicketService, ExportService
+from app.services.export_service import EXPORT_MEDIA_TYPES
+from app.repositories import InvalidCursorError
 from app.schemas import (
     TicketCreate,
     TicketUpdate,
+    TicketBulkUpdate,
+    TicketBulkResponse,
     TicketResponse,
     TicketDetailResponse,
     TicketListResponse,
-    TicketLogResponse,
+    TicketChangesResponse,
+    TicketLogPage,
     TicketCommentCreate,
     TicketCommentUpdate,
     TicketCommentResponse,
+    TicketCommentPage,
+    AttachmentPage,
+    TicketTimelinePage,
     CurrentUser,
     MessageResponse
 )
@@ -27,21 +38,24 @@ class TicketController:
     
     def __init__(self, db: AsyncSession):
         self.ticket_service = TicketService(db)
+        self.export_service = ExportService()
     
     async def create_ticket(
         self,
         ticket_data: TicketCreate,
-        current_user: CurrentUser
+        current_user: CurrentUser,
+        idempotency_key: Optional[str] = None
     ) -> TicketResponse:
         """Create a new ticket"""
-        return await self.ticket_service.create_ticket(ticket_data, current_user)
+        return await self.ticket_service.create_ticket(ticket_data, current_user, idempotency_key)
     
     async def get_ticket(
         self,
-        ticket_id: int
+        ticket_id: int,
+        section_limit: int = 20
     ) -> TicketDetailResponse:
-        """Get ticket by ID with full details"""
-        ticket = await self.ticket_service.get_ticket(ticket_id)
+        """Get ticket by ID with the first page of each detail section"""
+        ticket = await self.ticket_service.get_ticket(ticket_id, section_limit)
         
         if not ticket:
             raise HTTPException(
@@ -53,10 +67,11 @@ class TicketController:
     
     async def get_ticket_by_ticket_id(
         self,
-        ticket_id: str
+        ticket_id: str,
+        section_limit: int = 20
     ) -> TicketDetailResponse:
         """Get ticket by ticket_id (T-001 format)"""
-        ticket = await self.ticket_service.get_ticket_by_ticket_id(ticket_id)
+        ticket = await self.ticket_service.get_ticket_by_ticket_id(ticket_id, section_limit)
         
         if not ticket:
             raise HTTPException(
@@ -77,20 +92,82 @@ class TicketController:
         created_by: Optional[int] = None,
         search: Optional[str] = None,
         order_by: str = "created_at",
-        order_desc: bool = True
+        order_desc: bool = True,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        count_mode: str = "exact"
     ) -> TicketListResponse:
         """Get paginated list of tickets with filters"""
-        return await self.ticket_service.get_tickets(
-            skip=skip,
-            limit=limit,
-            status=status,
-            priority=priority,
-            category=category,
-            assigned_to=assigned_to,
-            created_by=created_by,
-            search=search,
-            order_by=order_by,
-            order_desc=order_desc
+        try:
+            return await self.ticket_service.get_tickets(
+                skip=skip,
+                limit=limit,
+                status=status,
+                priority=priority,
+                category=category,
+                assigned_to=assigned_to,
+                created_by=created_by,
+                search=search,
+                order_by=order_by,
+                order_desc=order_desc,
+                cursor=cursor,
+                include_total=include_total,
+                count_mode=count_mode
+            )
+        except InvalidCursorError as e:
+            # `status` is shadowed by the filter argument here
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def get_changes(self, since: Optional[str] = None, limit: int = 500) -> TicketChangesResponse:
+        """Get tickets created, updated or deleted since a cursor"""
+        try:
+            return await self.ticket_service.get_changes(since, limit)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def export_tickets(
+        self,
+        format: str = "csv",
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        category: Optional[str] = None,
+        assigned_to: Optional[int] = None,
+        created_by: Optional[int] = None,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True
+    ) -> StreamingResponse:
+        """Stream all tickets matching the list filters as a csv or xlsx download"""
+        try:
+            chunks = self.export_service.export_tickets(
+                format=format,
+                status=status,
+                priority=priority,
+                category=category,
+                assigned_to=assigned_to,
+                created_by=created_by,
+                search=search,
+                order_by=order_by,
+                order_desc=order_desc
+            )
+        except ValueError as e:
+            # `status` is shadowed by the filter argument here
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        filename = f"tickets_{date.today().isoformat()}.{format}"
+        return StreamingResponse(
+            chunks,
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
     
     async def update_ticket(
@@ -112,6 +189,26 @@ class TicketController:
         
         return ticket
     
+    async def bulk_update(
+        self,
+        update_data: TicketBulkUpdate,
+        current_user: CurrentUser
+    ) -> TicketBulkResponse:
+        """Update status, priority and/or assignee of several tickets"""
+        if update_data.status is None and update_data.priority is None and update_data.assigned_to is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Nothing to update: set status, priority or assigned_to"
+            )
+        
+        try:
+            return await self.ticket_service.bulk_update(update_data, current_user)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
     async def delete_ticket(
         self,
         ticket_id: int,
@@ -195,21 +292,86 @@ class TicketController:
     
     async def get_ticket_logs(
         self,
-        ticket_id: int
-    ) -> List[TicketLogResponse]:
-        """Get logs for a ticket"""
-        return await self.ticket_service.get_ticket_logs(ticket_id)
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> TicketLogPage:
+        """Get one page of logs for a ticket"""
+        try:
+            return await self.ticket_service.get_ticket_logs(ticket_id, limit, cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def get_ticket_comments(
+        self,
+        ticket_id: int,
+        include_internal: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> TicketCommentPage:
+        """Get one page of comments for a ticket"""
+        try:
+            return await self.ticket_service.get_ticket_comments(
+                ticket_id, include_internal, limit, cursor
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def get_ticket_attachments(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> AttachmentPage:
+        """Get one page of attachments for a ticket"""
+        try:
+            return await self.ticket_service.get_ticket_attachments(ticket_id, limit, cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    async def get_ticket_timeline(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        order_desc: bool = True
+    ) -> TicketTimelinePage:
+        """Get one page of a ticket's merged activity timeline"""
+        try:
+            return await self.ticket_service.get_ticket_timeline(ticket_id, limit, cursor, order_desc)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
     
     async def get_my_tickets(
         self,
         current_user: CurrentUser,
         skip: int = 0,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> TicketListResponse:
         """Get tickets for current user"""
-        return await self.ticket_service.get_user_tickets(
-            current_user.id, skip, limit
-        )
+        try:
+            return await self.ticket_service.get_user_tickets(
+                current_user.id, skip, limit, cursor, include_total
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
     
     async def get_recent_tickets(
         self,
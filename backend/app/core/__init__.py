@@ -1,7 +1,14 @@
 # Core Package
 from app.core.config import settings
-from app.core.database import get_db, init_db, close_db, Base, AsyncSessionLocal
+from app.core.database import (
+    get_db, init_db, close_db, Base, AsyncSessionLocal, is_database_unavailable, advisory_lock
+)
 from app.core.scheduler import start_scheduler, stop_scheduler, get_scheduler_status
+from app.core.spool import ticket_spool
+from app.core.events import ticket_events, queue_ticket_event
+from app.core.cache import analytics_cache
+from app.core.spool_replayer import start_spool_replayer, stop_spool_replayer
+from app.core.event_relay import ticket_event_relay, start_event_relay, stop_event_relay
 
 __all__ = [
     "settings",
@@ -10,7 +17,18 @@ __all__ = [
     "close_db",
     "Base",
     "AsyncSessionLocal",
+    "is_database_unavailable",
+    "advisory_lock",
     "start_scheduler",
     "stop_scheduler",
-    "get_scheduler_status"
+    "get_scheduler_status",
+    "ticket_spool",
+    "ticket_events",
+    "queue_ticket_event",
+    "analytics_cache",
+    "start_spool_replayer",
+    "stop_spool_replayer",
+    "ticket_event_relay",
+    "start_event_relay",
+    "stop_event_relay"
 ]
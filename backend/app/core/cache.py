@@ -0,0 +1,265 @@
+# ============================================
+# CACHE - Analytics Response Cache
+# ============================================
+# Analytics endpoints are polled by every open dashboard and recompute the
+# same aggregates each time. Their results are cached per endpoint and
+# parameters for ANALYTICS_CACHE_TTL_SECONDS. After that (or as soon as a
+# ticket write commits, see app/core/events.py) an entry is stale: it is
+# still served, for up to ANALYTICS_CACHE_STALE_SECONDS, while a single
+# background recompute refreshes it (stale-while-revalidate). Requests for
+# a missing entry wait for one shared recompute.
+#
+# Backends (ANALYTICS_CACHE_BACKEND):
+#   memory   - a dict in this process (default; one server process)
+#   postgres - the UNLOGGED analytics_cache table, shared by all workers
+#   none     - no caching
+# Recomputes are deduplicated per process, so with the postgres backend
+# each worker recomputes a stale entry at most once.
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+
+@dataclass
+class CacheEntry:
+    value: Any  # JSON-serializable
+    fresh_until: float  # Unix time
+    stale_until: float
+
+
+# ============================================
+# Backends
+# ============================================
+
+class MemoryCacheBackend:
+    """
+    Entries in a dict of this process, at most ANALYTICS_CACHE_MAX_ENTRIES
+    (least recently used first out): keys carry client parameters, such as
+    time series ranges, so their number is not bounded otherwise
+    """
+    
+    name = "memory"
+    shared = False
+    
+    def __init__(self):
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.analytics_cache_max_entries:
+            self._entries.popitem(last=False)
+    
+    async def expire_all(self) -> None:
+        # Expired entries are dropped here, like the postgres backend does
+        now = time.time()
+        for key in [key for key, entry in self._entries.items() if entry.stale_until <= now]:
+            del self._entries[key]
+        for entry in self._entries.values():
+            entry.fresh_until = 0
+
+
+class PostgresCacheBackend:
+    """Entries in the UNLOGGED analytics_cache table, shared by all workers"""
+    
+    name = "postgres"
+    shared = True
+    
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("""
+                    SELECT value, fresh_until, stale_until FROM analytics_cache
+                    WHERE key = :key AND stale_until > extract(epoch FROM now())
+                """),
+                {"key": key}
+            )
+            row = result.one_or_none()
+        return CacheEntry(row.value, row.fresh_until, row.stale_until) if row else None
+    
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("""
+                    INSERT INTO analytics_cache (key, value, fresh_until, stale_until)
+                    VALUES (:key, CAST(:value AS json), :fresh_until, :stale_until)
+                    ON CONFLICT (key) DO UPDATE SET
+                        value = excluded.value,
+                        fresh_until = excluded.fresh_until,
+                        stale_until = excluded.stale_until
+                """),
+                {
+                    "key": key,
+                    "value": _json(entry.value),
+                    "fresh_until": entry.fresh_until,
+                    "stale_until": entry.stale_until
+                }
+            )
+            await db.commit()
+    
+    async def expire_all(self) -> None:
+        async with AsyncSessionLocal() as db:
+            # Expired entries are dropped here, so the table stays small
+            await db.execute(text("DELETE FROM analytics_cache WHERE stale_until <= extract(epoch FROM now())"))
+            await db.execute(text("UPDATE analytics_cache SET fresh_until = 0 WHERE fresh_until > 0"))
+            await db.commit()
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+CACHE_BACKENDS = {
+    "memory": MemoryCacheBackend,
+    "postgres": PostgresCacheBackend,
+}
+
+
+# ============================================
+# Cache
+# ============================================
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    recomputes: int = 0
+    recompute_ms_total: float = 0.0
+    last_recompute_ms: Optional[float] = None
+
+
+class ResponseCache:
+    """Stale-while-revalidate cache with one recompute per key at a time"""
+    
+    def __init__(self, backend, ttl_seconds: float, stale_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, CacheStats] = {}
+        # Bumped by every invalidation; results computed across one are stored as stale
+        self._generation = 0
+    
+    async def get(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached value of key (an endpoint name, then its parameters after
+        ':'), computed by compute() - which returns JSON-serializable data -
+        when missing. Stale values are returned as they are and refreshed in
+        the background.
+        """
+        if self.backend is None:
+            return await compute()
+        stats = self._stats.setdefault(key.split(":", 1)[0], CacheStats())
+        
+        try:
+            entry = await self.backend.get(key)
+        except Exception as e:
+            print(f"[Cache] Read of {key} failed, recomputing: {e}")
+            entry = None
+        
+        if entry is not None:
+            if entry.fresh_until > time.time():
+                stats.hits += 1
+            else:
+                stats.stale_hits += 1
+                self._recompute(key, compute, stats)
+            return entry.value
+        
+        stats.misses += 1
+        return await asyncio.shield(self._recompute(key, compute, stats))
+    
+    def _recompute(self, key: str, compute: Callable[[], Awaitable[Any]], stats: CacheStats) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_store(key, compute, stats))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._recompute_done(key, done))
+        return task
+    
+    def _recompute_done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # Waiting requests get the error; a background refresh only logs it
+        if not task.cancelled() and task.exception():
+            print(f"[Cache] Recompute of {key} failed: {task.exception()}")
+    
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]], stats: CacheStats) -> Any:
+        generation = self._generation
+        start = time.perf_counter()
+        value = await compute()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats.recomputes += 1
+        stats.recompute_ms_total += elapsed_ms
+        stats.last_recompute_ms = elapsed_ms
+        
+        now = time.time()
+        # Tickets changed while computing: the value may predate the change
+        fresh_until = now + self.ttl_seconds if generation == self._generation else now
+        try:
+            await self.backend.set(key, CacheEntry(value, fresh_until, now + self.ttl_seconds + self.stale_seconds))
+        except Exception as e:
+            print(f"[Cache] Write of {key} failed: {e}")
+        return value
+    
+    async def invalidate(self, event: Optional[dict] = None) -> None:
+        """Mark every entry stale (subscribed to ticket write events)"""
+        self._generation += 1
+        # A shared backend was already expired by the worker the event came from
+        relayed = event is not None and event.get("origin") is not None
+        if self.backend is not None and not (relayed and self.backend.shared):
+            await self.backend.expire_all()
+    
+    def stats(self) -> dict:
+        """Hit rate and recompute times per endpoint, for the health check"""
+        endpoints = {}
+        for name, stats in sorted(self._stats.items()):
+            requests = stats.hits + stats.stale_hits + stats.misses
+            endpoints[name] = {
+                "requests": requests,
+                "hit_rate": round((stats.hits + stats.stale_hits) / requests, 4) if requests else None,
+                "stale_hits": stats.stale_hits,
+                "recomputes": stats.recomputes,
+                "avg_recompute_ms": round(stats.recompute_ms_total / stats.recomputes, 2) if stats.recomputes else None,
+                "last_recompute_ms": round(stats.last_recompute_ms, 2) if stats.last_recompute_ms is not None else None
+            }
+        return {
+            "backend": self.backend.name if self.backend else "none",
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "endpoints": endpoints
+        }
+
+
+def _create_backend(name: str):
+    if name == "none":
+        return None
+    if name not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown ANALYTICS_CACHE_BACKEND {name!r} (use {', '.join(CACHE_BACKENDS)} or none)")
+    return CACHE_BACKENDS[name]()
+
+
+# Dashboard and analytics responses (see AnalyticsService)
+analytics_cache = ResponseCache(
+    _create_backend(settings.analytics_cache_backend),
+    settings.analytics_cache_ttl_seconds,
+    settings.analytics_cache_stale_seconds
+)
@@ -5,6 +5,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import List
+from datetime import timedelta
 from functools import lru_cache
 
 
@@ -19,7 +20,7 @@ class Settings(BaseSettings):
     secret_key: str = Field(default="change-me-in-production")
     api_version: str = Field(default="v1")
     allowed_hosts: str = Field(default="http://localhost:3000")
-
+    
     # Server
     host: str = Field(default="0.0.0.0")
     port: int = Field(default=8000)
@@ -31,6 +32,79 @@ class Settings(BaseSettings):
     db_user: str = Field(default="postgres")
     db_password: str = Field(default="password")
     
+    # Planner estimates at or above this row count are returned as-is for
+    # count_mode=estimated; smaller (selective) results are counted exactly
+    count_estimate_threshold: int = Field(default=10000)
+    
+    # Minimum pg_trgm similarity (0-1) for fuzzy user lookups and search term correction
+    search_similarity_threshold: float = Field(default=0.3)
+    
+    # How often the title word lexicon used for typo correction is rebuilt
+    search_terms_refresh_minutes: int = Field(default=60)
+    
+    # Rows fetched per round trip from the server-side cursor of ticket exports
+    export_batch_size: int = Field(default=2000)
+    
+    # Deleted ticket ids kept for /tickets/changes; older cursors are reset (the client reloads)
+    ticket_tombstone_retention_days: int = Field(default=30)
+    
+    # Columnar (Parquet) snapshots of tickets, logs and email classifications for BI tools:
+    # changed months are rewritten every interval, all months every SNAPSHOT_REBUILD_DAYS
+    snapshot_dir: str = Field(default="snapshots")
+    snapshot_interval_minutes: int = Field(default=60)
+    snapshot_rebuild_days: int = Field(default=7)
+    # /analytics/pivot (DuckDB over the snapshot): results kept per process, largest pivot allowed
+    pivot_cache_size: int = Field(default=256)
+    pivot_max_cells: int = Field(default=20000)
+    
+    # Rows validated, copied and committed together by bulk imports
+    import_chunk_size: int = Field(default=20000)
+    
+    # Write-behind spool for tickets created while the database is unreachable
+    spool_dir: str = Field(default="spool")
+    spool_replay_interval_seconds: int = Field(default=15)
+    spool_replay_batch_size: int = Field(default=500)
+    
+    # How often the analytics rollup is checked against tickets and corrected
+    rollup_reconcile_minutes: int = Field(default=360)
+    
+    # Most buckets one /analytics/timeseries response may have
+    timeseries_max_points: int = Field(default=5000)
+    
+    # How often the replayed open ticket history is rebuilt from the ticket logs
+    backlog_history_rebuild_hours: int = Field(default=24)
+    
+    # Keep the ticket dimension columns in memory for /analytics/counts (loaded at startup)
+    ticket_mirror_enabled: bool = Field(default=True)
+    
+    # Analytics response cache: memory (per process), postgres (shared by workers) or none
+    analytics_cache_backend: str = Field(default="memory")
+    analytics_cache_ttl_seconds: int = Field(default=15)
+    # How long an expired or invalidated response may still be served while it is recomputed
+    analytics_cache_stale_seconds: int = Field(default=120)
+    # Most responses the memory backend keeps (least recently used first out)
+    analytics_cache_max_entries: int = Field(default=1000)
+    
+    # Ticket events are relayed to the other workers with PostgreSQL LISTEN/NOTIFY
+    event_relay_enabled: bool = Field(default=True)
+    
+    # Live dashboard stream (/stream/dashboard): events within this window are
+    # sent as one delta; a comment line keeps idle connections open
+    stream_coalesce_ms: int = Field(default=250)
+    stream_heartbeat_seconds: int = Field(default=15)
+    # Recent deltas kept for clients resuming with Last-Event-ID
+    stream_buffer_events: int = Field(default=500)
+    # Deltas queued per connection; a client further behind gets a new snapshot instead
+    stream_queue_size: int = Field(default=100)
+    
+    # SLA resolution targets per priority (hours from creation to resolution)
+    sla_hours_critical: int = Field(default=4)
+    sla_hours_high: int = Field(default=24)
+    sla_hours_medium: int = Field(default=48)
+    sla_hours_low: int = Field(default=120)
+    # Open tickets due within this many hours are reported as at risk
+    sla_at_risk_hours: int = Field(default=4)
+    
     # Supabase API (optional)
     supabase_url: str = Field(default="")
     supabase_key: str = Field(default="")
@@ -76,12 +150,16 @@ class Settings(BaseSettings):
     
     # Logging
     log_level: str = Field(default="INFO")
-
+    
     # Scheduler
     scheduler_enabled: bool = Field(default=False)
     scheduler_email_hour: int = Field(default=8)
     scheduler_email_minute: int = Field(default=0)
     
+    def sla_target(self, priority: str) -> timedelta:
+        """Resolution target of a ticket priority, by name (e.g. HIGH)"""
+        return timedelta(hours=getattr(self, f"sla_hours_{priority.lower()}"))
+    
     @property
     def allowed_origins(self) -> List[str]:
         """Parse allowed hosts into a list"""
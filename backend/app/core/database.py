@@ -2,10 +2,13 @@
 # CORE - Database Connection & Session Management
 # ============================================
 
+import asyncio
+from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import create_engine
-from typing import AsyncGenerator
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy import create_engine, text
+from typing import AsyncGenerator, AsyncIterator
 from app.core.config import settings
 
 
@@ -57,9 +60,38 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def is_database_unavailable(error: Exception) -> bool:
+    """True if error means the database could not be reached (not that a statement failed)"""
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated
+    # Connection refused, host unreachable, DNS failure, connect timeout,
+    # or every pooled connection stuck connecting
+    return isinstance(error, (OSError, asyncio.TimeoutError, PoolTimeoutError))
+
+
+@asynccontextmanager
+async def advisory_lock(key: int) -> AsyncIterator[bool]:
+    """
+    Try to take a PostgreSQL advisory lock for the block; yields whether it
+    was taken (by one process at a time). The lock is held by a connection
+    outside any transaction, so long jobs do not hold back the ticket change
+    horizon (TicketRepository.get_change_horizon).
+    """
+    async with async_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        locked = (await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})).scalar_one()
+        try:
+            yield locked
+        finally:
+            if locked:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
 async def init_db():
     """Initialize database - create all tables"""
     async with async_engine.begin() as conn:
+        # Trigram indexes (fuzzy search) need the pg_trgm operator classes
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -0,0 +1,121 @@
+# ============================================
+# EVENT RELAY - Ticket Events Across Workers (LISTEN/NOTIFY)
+# ============================================
+# ticket_events only reaches the subscribers of the process that committed.
+# The relay sends each local event to the other workers with pg_notify on
+# the ticket_events channel, and publishes the events of the other workers
+# it LISTENs to on the local bus, marked with their origin (so they are not
+# sent back). It uses its own connection, reconnecting every
+# EVENT_RELAY_RETRY_SECONDS after it is lost; events published meanwhile
+# stay in their own worker.
+
+import asyncio
+import json
+import uuid
+from typing import List, Optional
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.events import ticket_events
+
+
+CHANNEL = "ticket_events"
+
+# NOTIFY payloads must stay under 8000 bytes
+MAX_IDS_PER_NOTIFY = 500
+
+EVENT_RELAY_RETRY_SECONDS = 5
+
+# Identifies this worker in relayed events
+WORKER_ID = uuid.uuid4().hex
+
+
+class TicketEventRelay:
+    """Relays ticket_events between workers through one LISTEN connection"""
+    
+    def __init__(self):
+        self._connection: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.received = 0
+    
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+    
+    def status(self) -> dict:
+        return {"connected": self.connected, "worker_id": WORKER_ID, "sent": self.sent, "received": self.received}
+    
+    async def forward(self, payload: dict) -> None:
+        """ticket_events handler: NOTIFY the other workers of a local event"""
+        if payload.get("origin") or not self.connected:
+            return
+        ids = payload["ticket_ids"]
+        chunks: List[list] = [ids[i:i + MAX_IDS_PER_NOTIFY] for i in range(0, len(ids), MAX_IDS_PER_NOTIFY)] or [[]]
+        async with self._lock:
+            for chunk in chunks:
+                message = json.dumps({**payload, "ticket_ids": chunk, "origin": WORKER_ID})
+                await self._connection.execute("SELECT pg_notify($1, $2)", CHANNEL, message)
+                self.sent += 1
+    
+    def _on_notify(self, connection, pid: int, channel: str, message: str) -> None:
+        payload = json.loads(message)
+        if payload.get("origin") == WORKER_ID:
+            return
+        self.received += 1
+        ticket_events.publish(payload)
+    
+    async def _run(self) -> None:
+        last_error = None
+        while True:
+            try:
+                self._connection = await asyncpg.connect(settings.database_sync_url)
+                lost = asyncio.Event()
+                self._connection.add_termination_listener(lambda connection: lost.set())
+                await self._connection.add_listener(CHANNEL, self._on_notify)
+                print(f"[EventRelay] Listening on {CHANNEL} (worker {WORKER_ID[:8]})")
+                last_error = None
+                await lost.wait()
+                print("[EventRelay] Connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Report each new error once, not on every retry
+                if str(e) != last_error:
+                    print(f"[EventRelay] Cannot listen, retrying every {EVENT_RELAY_RETRY_SECONDS}s: {e}")
+                last_error = str(e)
+            await asyncio.sleep(EVENT_RELAY_RETRY_SECONDS)
+    
+    async def start(self) -> None:
+        ticket_events.subscribe(self.forward)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        ticket_events.unsubscribe(self.forward)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+ticket_event_relay = TicketEventRelay()
+
+
+async def start_event_relay():
+    """Start relaying ticket events between workers (EVENT_RELAY_ENABLED)"""
+    if not settings.event_relay_enabled:
+        print("[EventRelay] Event relay is disabled")
+        return
+    await ticket_event_relay.start()
+
+
+async def stop_event_relay():
+    await ticket_event_relay.stop()
@@ -0,0 +1,76 @@
+# ============================================
+# EVENTS - In-process Ticket Change Events
+# ============================================
+# Services record which tickets a transaction created, updated or deleted
+# (queue_ticket_event); the events are published to the subscribers of
+# ticket_events once that transaction commits, and dropped if it rolls
+# back, so subscribers (e.g. the analytics cache) never see uncommitted
+# changes. The event relay (event_relay.py) passes them on to the other
+# workers.
+
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+TicketEventHandler = Callable[[dict], Union[None, Awaitable[None]]]
+
+
+class EventBus:
+    """Publish / subscribe; coroutine handlers run as background tasks"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._handlers: List[TicketEventHandler] = []
+        self._tasks: set = set()
+    
+    def subscribe(self, handler: TicketEventHandler) -> None:
+        self._handlers.append(handler)
+    
+    def unsubscribe(self, handler: TicketEventHandler) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+    
+    def publish(self, payload: dict) -> None:
+        for handler in list(self._handlers):
+            try:
+                result = handler(payload)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.get_running_loop().create_task(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._task_done)
+            except Exception as e:
+                # A failing subscriber must not fail the request that committed
+                print(f"[Events] {self.name} handler {getattr(handler, '__qualname__', handler)} failed: {e}")
+    
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"[Events] {self.name} handler failed: {task.exception()}")
+
+
+# Ticket changes: {"type": "created" | "updated" | "deleted", "ticket_ids": [...]},
+# plus "origin" (worker id) for events relayed from another worker
+ticket_events = EventBus("tickets")
+
+
+def queue_ticket_event(db: AsyncSession, type: str, ticket_ids: Optional[Iterable[int]] = None) -> None:
+    """Publish a ticket event when db's current transaction commits"""
+    db.sync_session.info.setdefault("ticket_events", []).append({
+        "type": type,
+        "ticket_ids": list(ticket_ids or [])
+    })
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    for payload in session.info.pop("ticket_events", []):
+        ticket_events.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop("ticket_events", None)
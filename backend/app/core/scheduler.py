@@ -6,11 +6,12 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
-from app.services import EmailProcessor
+from app.services import EmailProcessor, snapshot_writer
+from app.repositories import SearchTermRepository, TicketRollupRepository, ResolutionSketchRepository, TicketRepository
 
 
 # Global scheduler instance
@@ -39,12 +40,72 @@ async def process_daily_emails():
             await db.commit()
             
             print(f"[Scheduler] Email processing completed: {result}")
-            
+        
         except Exception as e:
             await db.rollback()
             print(f"[Scheduler] Email processing error: {e}")
 
 
+async def refresh_search_terms():
+    """
+    Scheduled task to rebuild the search term lexicon from ticket titles.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            count = await SearchTermRepository(db).refresh()
+            await db.commit()
+            print(f"[Scheduler] Search terms refreshed: {count} terms")
+        except Exception as e:
+            await db.rollback()
+            print(f"[Scheduler] Search term refresh error: {e}")
+
+
+async def reconcile_ticket_rollup():
+    """
+    Scheduled task to correct any drift of the analytics rollup and the
+    resolution time sketches from tickets.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await TicketRollupRepository(db).reconcile()
+            sketches = await ResolutionSketchRepository(db).reconcile()
+            await db.commit()
+            print(f"[Scheduler] Ticket rollup reconciled: {result['fixed']} groups fixed, {result['removed']} removed")
+            print(f"[Scheduler] Resolution sketches reconciled: {sketches['fixed']} buckets fixed, {sketches['removed']} removed")
+        except Exception as e:
+            await db.rollback()
+            print(f"[Scheduler] Ticket rollup reconcile error: {e}")
+
+
+async def prune_ticket_tombstones():
+    """
+    Scheduled task to forget tickets deleted longer ago than the
+    /tickets/changes cursors are kept.
+    """
+    before = datetime.now(timezone.utc) - timedelta(days=settings.ticket_tombstone_retention_days)
+    async with AsyncSessionLocal() as db:
+        try:
+            count = await TicketRepository(db).prune_tombstones(before)
+            await db.commit()
+            print(f"[Scheduler] Ticket tombstones pruned: {count}")
+        except Exception as e:
+            await db.rollback()
+            print(f"[Scheduler] Ticket tombstone prune error: {e}")
+
+
+async def write_analytics_snapshot():
+    """
+    Scheduled task to rewrite the months of the Parquet snapshots with
+    changed rows.
+    """
+    try:
+        manifest = await snapshot_writer.run()
+        if manifest:
+            print(f"[Scheduler] Analytics snapshot written (changes until {manifest['taken_at']})")
+    except Exception as e:
+        print(f"[Scheduler] Analytics snapshot error: {e}")
+
+
 async def health_check():
     """
     Periodic health check task.
@@ -73,6 +134,43 @@ def start_scheduler():
         replace_existing=True
     )
     
+    # Add search term lexicon refresh (also runs once at startup)
+    scheduler.add_job(
+        refresh_search_terms,
+        trigger=IntervalTrigger(minutes=settings.search_terms_refresh_minutes),
+        id="search_terms_refresh",
+        name="Search Terms Refresh",
+        next_run_time=datetime.now(),
+        replace_existing=True
+    )
+    
+    # Add analytics rollup reconciliation
+    scheduler.add_job(
+        reconcile_ticket_rollup,
+        trigger=IntervalTrigger(minutes=settings.rollup_reconcile_minutes),
+        id="ticket_rollup_reconcile",
+        name="Ticket Rollup Reconcile",
+        replace_existing=True
+    )
+    
+    # Add deleted ticket tombstone pruning (daily)
+    scheduler.add_job(
+        prune_ticket_tombstones,
+        trigger=IntervalTrigger(hours=24),
+        id="ticket_tombstone_prune",
+        name="Ticket Tombstone Prune",
+        replace_existing=True
+    )
+    
+    # Add Parquet analytics snapshots
+    scheduler.add_job(
+        write_analytics_snapshot,
+        trigger=IntervalTrigger(minutes=settings.snapshot_interval_minutes),
+        id="analytics_snapshot",
+        name="Analytics Snapshot",
+        replace_existing=True
+    )
+    
     # Add health check job (every 5 minutes)
     scheduler.add_job(
         health_check,
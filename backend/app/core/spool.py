@@ -0,0 +1,210 @@
+# ============================================
+# SPOOL - Durable Write-Behind Queue (JSON Lines)
+# ============================================
+# Writes that cannot reach the database (ticket creation while PostgreSQL is
+# down) are appended to a local spool and replayed into the database later
+# by the spool replayer (see spool_replayer.py).
+#
+# Records are appended to the active segment, active.jsonl. Appends are
+# group-committed: records arriving while a write + fsync is in progress are
+# written together by the next one, so one fsync covers many records, and
+# append() returns only once its record is on disk.
+#
+# To replay, the active segment is sealed (renamed to <time>.ready) and each
+# ready segment is claimed (renamed to .replaying), replayed in batches and
+# deleted. Replay must be idempotent - records carry an idempotency key - as
+# a segment is replayed again when the process stops before deleting it.
+# A spool directory belongs to one server process.
+
+import asyncio
+import glob
+import json
+import os
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class Spool:
+    """Append-only, fsync-batched JSON Lines spool"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.active_path = os.path.join(directory, "active.jsonl")
+        self.rejected_path = os.path.join(directory, "rejected.jsonl")
+        self.depth = 0
+        self.last_replay_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._file = None
+        # Serializes segment writes with sealing
+        self._lock = asyncio.Lock()
+    
+    # ============================================
+    # Appending
+    # ============================================
+    
+    async def append(self, record: dict) -> None:
+        """Append a record; returns once it is written and fsynced"""
+        line = (json.dumps(record, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((line, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        await future
+    
+    async def _flush(self) -> None:
+        """Write pending records, one write + fsync per batch, until none are left"""
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                async with self._lock:
+                    await asyncio.to_thread(self._write, b"".join(line for line, _ in batch))
+                self.depth += len(batch)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+    
+    def _write(self, data: bytes) -> None:
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.active_path, "ab")
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    # ============================================
+    # Segments
+    # ============================================
+    
+    async def seal(self) -> None:
+        """Close the active segment and queue it for replay"""
+        async with self._lock:
+            await asyncio.to_thread(self._seal)
+    
+    def _seal(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.active_path) and os.path.getsize(self.active_path):
+            os.replace(self.active_path, os.path.join(self.directory, f"{time.time_ns()}.ready"))
+    
+    def _segments(self, suffix: str) -> List[str]:
+        # Segment names are timestamps, so sorting replays them in write order
+        return sorted(glob.glob(os.path.join(self.directory, f"*.{suffix}")))
+    
+    async def recover(self) -> None:
+        """
+        At startup: queue segments left by the previous run (its active
+        segment and any it was replaying) and count the spooled records.
+        """
+        def recover() -> int:
+            self._seal()
+            for path in self._segments("replaying"):
+                os.replace(path, path[:-len("replaying")] + "ready")
+            depth = 0
+            for path in self._segments("ready"):
+                with open(path, "rb") as file:
+                    depth += sum(1 for _ in file)
+            return depth
+        
+        async with self._lock:
+            self.depth = await asyncio.to_thread(recover)
+        if self.depth:
+            print(f"[Spool] {self.depth} spooled records in {self.directory} waiting for replay")
+    
+    async def close(self) -> None:
+        """Wait for pending appends and seal the active segment"""
+        if self._flusher is not None:
+            await self._flusher
+        await self.seal()
+    
+    # ============================================
+    # Replay
+    # ============================================
+    
+    async def drain(
+        self,
+        replay: Callable[[List[dict]], Awaitable[List[dict]]],
+        batch_size: int
+    ) -> int:
+        """
+        Replay all spooled records in batches of batch_size, oldest first.
+        replay stores a batch (durably) and returns the records that can
+        never be stored; those go to rejected.jsonl. A segment is deleted
+        once all its batches are replayed. If replay raises, the segment is
+        put back and the error propagates. Returns the number of records
+        replayed.
+        """
+        await self.seal()
+        replayed = 0
+        for path in self._segments("ready"):
+            claimed = path[:-len("ready")] + "replaying"
+            os.replace(path, claimed)
+            try:
+                replayed += await self._drain_segment(claimed, replay, batch_size)
+            except Exception as e:
+                os.replace(claimed, path)
+                self.last_error = str(e)
+                raise
+            os.remove(claimed)
+        self.last_replay_at = datetime.now(timezone.utc)
+        self.last_error = None
+        return replayed
+    
+    async def _drain_segment(
+        self,
+        path: str,
+        replay: Callable[[List[dict]], Awaitable[List[dict]]],
+        batch_size: int
+    ) -> int:
+        replayed = lines_read = 0
+        with open(path, "rb") as file:
+            while True:
+                lines = await asyncio.to_thread(list, islice(file, batch_size))
+                if not lines:
+                    break
+                lines_read += len(lines)
+                records = []
+                for line in lines:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A torn last line: the append never completed, so it was not acknowledged
+                        print(f"[Spool] Skipping unreadable record in {path}")
+                rejected = await replay(records) if records else []
+                if rejected:
+                    await asyncio.to_thread(self._reject, rejected)
+                replayed += len(records) - len(rejected)
+        # Counted only once the whole segment is stored: a failed segment is replayed again
+        self.depth = max(0, self.depth - lines_read)
+        return replayed
+    
+    def _reject(self, records: List[dict]) -> None:
+        print(f"[Spool] {len(records)} records cannot be replayed, moved to {self.rejected_path}")
+        with open(self.rejected_path, "ab") as file:
+            for record in records:
+                file.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+    
+    def status(self) -> dict:
+        """Spool state for the health check"""
+        return {
+            "depth": self.depth,
+            "last_replay_at": self.last_replay_at.isoformat() if self.last_replay_at else None,
+            "last_error": self.last_error
+        }
+
+
+# Tickets created while the database was unreachable (see TicketService.create_ticket)
+ticket_spool = Spool(os.path.join(settings.spool_dir, "tickets"))
@@ -0,0 +1,80 @@
+# ============================================
+# SPOOL REPLAYER - Drains the Ticket Spool into PostgreSQL
+# ============================================
+# Runs for the lifetime of the application (independently of the optional
+# APScheduler jobs). Every SPOOL_REPLAY_INTERVAL_SECONDS it checks the ticket
+# spool and, when there is something to replay, stores the spooled tickets
+# in batches of SPOOL_REPLAY_BATCH_SIZE. While the database is still
+# unreachable the attempt fails and is retried on the next round.
+
+import asyncio
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.spool import ticket_spool
+from app.services import TicketService
+
+
+_replayer: Optional[asyncio.Task] = None
+
+
+async def replay_ticket_spool() -> int:
+    """Replay all spooled tickets; returns the number stored"""
+    async with AsyncSessionLocal() as db:
+        service = TicketService(db)
+        
+        async def replay(records: List[dict]) -> List[dict]:
+            rejected = await service.replay_spooled_tickets(records)
+            await db.commit()
+            return rejected
+        
+        try:
+            replayed = await ticket_spool.drain(replay, settings.spool_replay_batch_size)
+        except Exception:
+            await db.rollback()
+            raise
+    
+    if replayed:
+        print(f"[Spool] Replayed {replayed} spooled tickets")
+    return replayed
+
+
+async def _run_replayer():
+    last_error = None
+    while True:
+        if ticket_spool.depth:
+            try:
+                await replay_ticket_spool()
+                last_error = None
+            except Exception as e:
+                # Report each new error once, not on every retry
+                if str(e) != last_error:
+                    print(f"[Spool] Replay failed, retrying every {settings.spool_replay_interval_seconds}s: {e}")
+                last_error = str(e)
+        await asyncio.sleep(settings.spool_replay_interval_seconds)
+
+
+async def start_spool_replayer():
+    """
+    Queue tickets spooled by the previous run and start the replayer task.
+    """
+    global _replayer
+    await ticket_spool.recover()
+    _replayer = asyncio.create_task(_run_replayer())
+    print(f"[Spool] Replayer started ({ticket_spool.depth} tickets spooled)")
+
+
+async def stop_spool_replayer():
+    """
+    Stop the replayer and seal the active spool segment.
+    """
+    global _replayer
+    if _replayer is not None:
+        _replayer.cancel()
+        try:
+            await _replayer
+        except asyncio.CancelledError:
+            pass
+        _replayer = None
+    await ticket_spool.close()
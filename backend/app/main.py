@@ -6,9 +6,14 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
 
-from app.core import settings, init_db, close_db, start_scheduler, stop_scheduler, get_scheduler_status
+from app.core import (
+    settings, init_db, close_db, start_scheduler, stop_scheduler, get_scheduler_status,
+    ticket_spool, start_spool_replayer, stop_spool_replayer, analytics_cache,
+    ticket_event_relay, start_event_relay, stop_event_relay
+)
 from app.middleware import setup_cors, register_exception_handlers, LoggingMiddleware
 from app.routes import register_routes
+from app.services import backlog_history, dashboard_stream, snapshot_writer, pivot_engine, ticket_mirror
 
 
 @asynccontextmanager
@@ -37,6 +42,16 @@ async def lifespan(app: FastAPI):
     print("Starting scheduler...")
     start_scheduler()
     
+    # Replay tickets spooled while the database was unreachable
+    await start_spool_replayer()
+    
+    # Share ticket events with the other workers (cache invalidation, live dashboards)
+    await start_event_relay()
+    
+    # Load the in-memory ticket dimensions for /analytics/counts (in the background)
+    if settings.ticket_mirror_enabled:
+        ticket_mirror.start()
+    
     print("Application ready!")
     print("=" * 50)
     
@@ -49,6 +64,15 @@ async def lifespan(app: FastAPI):
     # Stop scheduler
     stop_scheduler()
     
+    # Stop spool replayer (spooled tickets are replayed after the next start)
+    await stop_spool_replayer()
+    
+    # Stop relaying ticket events
+    await stop_event_relay()
+    
+    # Stop keeping the ticket mirror current
+    await ticket_mirror.stop()
+    
     # Close database connections
     try:
         await close_db()
@@ -112,7 +136,15 @@ async def health_check():
         "version": settings.app_version,
         "timestamp": datetime.utcnow().isoformat(),
         "database": "connected",
-        "scheduler": get_scheduler_status()
+        "scheduler": get_scheduler_status(),
+        "spool": ticket_spool.status(),
+        "analytics_cache": analytics_cache.stats(),
+        "backlog_history": backlog_history.stats(),
+        "event_relay": ticket_event_relay.status(),
+        "dashboard_stream": dashboard_stream.status(),
+        "analytics_snapshot": snapshot_writer.status(),
+        "pivot_engine": pivot_engine.status(),
+        "ticket_mirror": ticket_mirror.status()
     }
 
 
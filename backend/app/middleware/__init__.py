@@ -1,6 +1,7 @@
 # Middleware Package
 from app.middleware.auth_middleware import (
     get_current_user,
+    get_stream_user,
     get_current_user_optional,
     get_admin_user,
     get_token,
@@ -21,6 +22,7 @@ from app.middleware.cors_middleware import setup_cors
 
 __all__ = [
     "get_current_user",
+    "get_stream_user",
     "get_current_user_optional",
     "get_admin_user",
     "get_token",
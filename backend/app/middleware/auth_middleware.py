@@ -5,12 +5,12 @@
 
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal, is_database_unavailable
 from app.schemas import CurrentUser
 from app.repositories import UserRepository
 
@@ -18,6 +18,11 @@ from app.repositories import UserRepository
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
+# (database id, is_admin) of the users looked up so far, by Azure id (per
+# process), so a verified token still identifies its user while the
+# database is unreachable and POST /tickets can spool the ticket
+_known_users: Dict[str, Tuple[int, bool]] = {}
+
 
 async def get_token(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -66,22 +71,56 @@ async def get_current_user(
     
     # Verify token with Microsoft Graph
     user_data = await verify_azure_token(token)
+    return await _build_current_user(user_data, db)
+
+
+async def _build_current_user(user_data: dict, db: AsyncSession) -> CurrentUser:
+    """
+    CurrentUser from the verified Graph profile and the user's database id
+    and admin flag. If the database is unreachable, the id and flag of the
+    last lookup are used; a user not looked up before gets a 503.
+    """
     azure_id = user_data.get("id", "")
-    
-    # Get user from database to get correct id and is_admin status
-    user_repo = UserRepository(db)
-    db_user = await user_repo.get_by_azure_id(azure_id)
+    try:
+        db_user = await UserRepository(db).get_by_azure_id(azure_id)
+        user_id, is_admin = (db_user.id, db_user.is_admin) if db_user else (0, False)
+        if db_user:
+            _known_users[azure_id] = (user_id, is_admin)
+    except Exception as e:
+        if not is_database_unavailable(e):
+            raise
+        if azure_id not in _known_users:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database unavailable - please try again later"
+            )
+        print(f"[Auth] Database unreachable, using the last known id of {azure_id}: {e}")
+        user_id, is_admin = _known_users[azure_id]
     
     # Return user info - merge Azure data with DB data
     return CurrentUser(
-        id=db_user.id if db_user else 0,
+        id=user_id,
         azure_id=azure_id,
         email=user_data.get("mail") or user_data.get("userPrincipalName", ""),
         name=user_data.get("displayName", ""),
-        is_admin=db_user.is_admin if db_user else False
+        is_admin=is_admin
     )
 
 
+async def get_stream_user(
+    token: Optional[str] = Depends(get_token)
+) -> CurrentUser:
+    """
+    get_current_user for long-lived streaming responses: the user is looked
+    up in a session closed right away, so no pooled connection is held
+    while the response streams. Like every endpoint, it only reads the
+    Authorization header (no tokens in URLs), so browsers have to use a
+    fetch-based SSE client rather than EventSource
+    """
+    async with AsyncSessionLocal() as db:
+        return await get_current_user(token, db)
+
+
 async def get_current_user_optional(
     token: Optional[str] = Depends(get_token),
     db: AsyncSession = Depends(get_db)
@@ -94,19 +133,7 @@ async def get_current_user_optional(
     
     try:
         user_data = await verify_azure_token(token)
-        azure_id = user_data.get("id", "")
-        
-        # Get user from database
-        user_repo = UserRepository(db)
-        db_user = await user_repo.get_by_azure_id(azure_id)
-        
-        return CurrentUser(
-            id=db_user.id if db_user else 0,
-            azure_id=azure_id,
-            email=user_data.get("mail") or user_data.get("userPrincipalName", ""),
-            name=user_data.get("displayName", ""),
-            is_admin=db_user.is_admin if db_user else False
-        )
+        return await _build_current_user(user_data, db)
     except HTTPException:
         return None
 
@@ -138,7 +165,7 @@ class AuthMiddleware:
         if scope["type"] == "http":
             headers = dict(scope.get("headers", []))
             auth_header = headers.get(b"authorization", b"").decode()
-
+            
             # This project authenticates via Azure AD access tokens verified against
             # Microsoft Graph in the dependency layer (get_current_user). Keep this
             # middleware as a safe no-op to avoid introducing a second auth mechanism.
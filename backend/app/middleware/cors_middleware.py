@@ -33,6 +33,7 @@ def setup_cors(app):
         expose_headers=[
             "X-Request-ID",
             "X-Response-Time",
+            "X-Next-Cursor",
             "Content-Disposition"
         ],
         max_age=600  # Cache preflight requests for 10 minutes
@@ -8,6 +8,24 @@ from app.models.models import (
     EmailSource,
     AdminAuditLog,
     SystemSetting,
+    SearchTerm,
+    TicketDailyRollup,
+    AnalyticsCacheEntry,
+    TicketTombstone,
+    TICKET_NUMBER_SEQUENCE,
+    TICKET_NUMBER_DDL,
+    sync_ticket_number,
+    TICKET_ROLLUP_DDL,
+    TicketResolutionSketch,
+    RESOLUTION_SKETCH_DDL,
+    RESOLUTION_SKETCH_ACCURACY,
+    RESOLUTION_SKETCH_GAMMA,
+    RESOLUTION_SKETCH_BUCKET,
+    TICKET_CHANGES_DDL,
+    TICKET_CHANGES_RESET_SETTING,
+    MARK_TICKET_CHANGES_RESET,
+    OPEN_TICKET_CONDITION,
+    SLA_MISSED_CONDITION,
     TicketStatus,
     TicketPriority,
     TicketCategory,
@@ -23,6 +41,24 @@ __all__ = [
     "EmailSource",
     "AdminAuditLog",
     "SystemSetting",
+    "SearchTerm",
+    "TicketDailyRollup",
+    "AnalyticsCacheEntry",
+    "TicketTombstone",
+    "TICKET_NUMBER_SEQUENCE",
+    "TICKET_NUMBER_DDL",
+    "sync_ticket_number",
+    "TICKET_ROLLUP_DDL",
+    "TicketResolutionSketch",
+    "RESOLUTION_SKETCH_DDL",
+    "RESOLUTION_SKETCH_ACCURACY",
+    "RESOLUTION_SKETCH_GAMMA",
+    "RESOLUTION_SKETCH_BUCKET",
+    "TICKET_CHANGES_DDL",
+    "TICKET_CHANGES_RESET_SETTING",
+    "MARK_TICKET_CHANGES_RESET",
+    "OPEN_TICKET_CONDITION",
+    "SLA_MISSED_CONDITION",
     "TicketStatus",
     "TicketPriority",
     "TicketCategory",
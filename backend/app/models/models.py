@@ -2,15 +2,17 @@
 # MODELS - SQLAlchemy Database Models
 # ============================================
 
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional, List
 from sqlalchemy import (
-    String, Integer, Text, Boolean, DateTime, 
-    ForeignKey, Enum as SQLEnum, JSON, Index
+    String, SmallInteger, Integer, BigInteger, Float, Text, Boolean, Date, DateTime, 
+    ForeignKey, Enum as SQLEnum, JSON, Index, Computed, DDL, event, text
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 import enum
+import math
 
 from app.core.database import Base
 
@@ -97,6 +99,9 @@ class User(Base):
     __table_args__ = (
         Index("idx_user_email", "email"),
         Index("idx_user_azure_id", "azure_id"),
+        # Fuzzy lookup (pg_trgm)
+        Index("idx_user_name_trgm", "name", postgresql_using="gist", postgresql_ops={"name": "gist_trgm_ops"}),
+        Index("idx_user_email_trgm", "email", postgresql_using="gist", postgresql_ops={"email": "gist_trgm_ops"}),
     )
     
     def __repr__(self):
@@ -107,6 +112,15 @@ class User(Base):
 # Ticket Model
 # ============================================
 
+# Tickets still to be resolved, as a literal condition (stored enum names) so
+# queries that repeat it can use the partial index idx_ticket_open_sla_due
+OPEN_TICKET_CONDITION = "status NOT IN ('RESOLVED', 'CLOSED')"
+
+# Tickets that missed (or will miss) their SLA due date: not resolved by it.
+# Literal for the same reason, for the partial index idx_ticket_sla_missed.
+SLA_MISSED_CONDITION = "resolved_at IS NULL OR resolved_at > sla_due_date"
+
+
 class Ticket(Base):
     __tablename__ = "tickets"
     
@@ -133,6 +147,9 @@ class Ticket(Base):
     source_email_from: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     source_email_subject: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     
+    # Idempotency key of a ticket created while the database was unreachable (replayed from the spool)
+    spool_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    
     # LLM Classification Metadata
     llm_confidence: Mapped[Optional[float]] = mapped_column(nullable=True)
     llm_raw_response: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
@@ -150,6 +167,18 @@ class Ticket(Base):
     )
     resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
+    # Full-text search document, maintained by PostgreSQL (title/ticket_id weighted above description).
+    # Deferred so regular ticket queries never transfer it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(ticket_id, '') || ' ' || coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        deferred=True
+    )
+    
     # Relationships
     created_by_user: Mapped["User"] = relationship(
         "User", back_populates="created_tickets", foreign_keys=[created_by]
@@ -173,12 +202,62 @@ class Ticket(Base):
         Index("idx_ticket_category", "category"),
         Index("idx_ticket_created_at", "created_at"),
         Index("idx_ticket_assigned_to", "assigned_to"),
+        # Keyset pagination: (order column, id) composites
+        Index("idx_ticket_created_at_id", "created_at", "id"),
+        Index("idx_ticket_updated_at_id", "updated_at", "id"),
+        Index("idx_ticket_title_id", "title", "id"),
+        Index("idx_ticket_status_created_at_id", "status", "created_at", "id"),
+        Index("idx_ticket_assigned_created_at_id", "assigned_to", "created_at", "id"),
+        Index("idx_ticket_created_by_created_at_id", "created_by", "created_at", "id"),
+        # Full-text search
+        Index("idx_ticket_search_vector", "search_vector", postgresql_using="gin"),
+        # Ticket id prefix lookup ("T-12" -> T-12, T-120, ...) in any collation
+        Index("idx_ticket_ticket_id_prefix", "ticket_id", postgresql_ops={"ticket_id": "varchar_pattern_ops"}),
+        # Spool replay deduplication; partial, so regular tickets add no index entries
+        Index("idx_ticket_spool_key", "spool_key", unique=True, postgresql_where=text("spool_key IS NOT NULL")),
+        # Recently resolved tickets (resolved today); partial, so open tickets add no index entries
+        Index("idx_ticket_resolved_at", "resolved_at", postgresql_where=text("resolved_at IS NOT NULL")),
+        # SLA breached / at risk: open tickets by due date
+        Index("idx_ticket_open_sla_due", "sla_due_date", postgresql_where=text(OPEN_TICKET_CONDITION)),
+        # SLA breaches over time: tickets not resolved by their due date, by due date
+        Index("idx_ticket_sla_missed", "sla_due_date", postgresql_where=text(SLA_MISSED_CONDITION)),
     )
     
     def __repr__(self):
         return f"<Ticket(id={self.id}, ticket_id={self.ticket_id}, status={self.status})>"
 
 
+# Ticket numbers (the 1 of T-001) come from one sequence on every path that
+# creates tickets (TicketRepository.get_next_ticket_id(s), imports), never
+# from row counts or ids. Kept in step with
+# database/migrations/011_ticket_number_sequence.sql.
+TICKET_NUMBER_SEQUENCE = "ticket_number_seq"
+
+
+def sync_ticket_number(source: str = "tickets") -> str:
+    """
+    SQL moving the ticket number sequence past the numbers of the T-<number>
+    ticket_ids in source (a table with a ticket_id column), which were
+    stored without it (imported ids, databases from before the sequence).
+    It never moves back, so numbers of deleted tickets are not reused.
+    """
+    return f"""
+    SELECT setval('{TICKET_NUMBER_SEQUENCE}', stored.number)
+    FROM (
+        SELECT max(substring(ticket_id FROM '^T-([0-9]{{1,18}})$')::bigint) AS number FROM {source}
+    ) stored, {TICKET_NUMBER_SEQUENCE} sequence
+    WHERE stored.number > CASE WHEN sequence.is_called THEN sequence.last_value ELSE sequence.last_value - 1 END"""
+
+
+TICKET_NUMBER_DDL = [
+    f"CREATE SEQUENCE IF NOT EXISTS {TICKET_NUMBER_SEQUENCE}",
+    sync_ticket_number(),
+]
+
+for _statement in TICKET_NUMBER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement))
+
+
 # ============================================
 # Ticket Log Model
 # ============================================
@@ -205,6 +284,7 @@ class TicketLog(Base):
     __table_args__ = (
         Index("idx_log_ticket_id", "ticket_id"),
         Index("idx_log_created_at", "created_at"),
+        Index("idx_log_ticket_created_at_id", "ticket_id", "created_at", "id"),
     )
     
     def __repr__(self):
@@ -236,6 +316,7 @@ class TicketComment(Base):
     __table_args__ = (
         Index("idx_comment_ticket_id", "ticket_id"),
         Index("idx_comment_created_at", "created_at"),
+        Index("idx_comment_ticket_created_at_id", "ticket_id", "created_at", "id"),
     )
     
     def __repr__(self):
@@ -268,6 +349,7 @@ class Attachment(Base):
     
     __table_args__ = (
         Index("idx_attachment_ticket_id", "ticket_id"),
+        Index("idx_attachment_ticket_created_at_id", "ticket_id", "created_at", "id"),
     )
     
     def __repr__(self):
@@ -304,6 +386,9 @@ class EmailSource(Base):
         Index("idx_email_message_id", "message_id"),
         Index("idx_email_received_at", "received_at"),
         Index("idx_email_processed_at", "processed_at"),
+        # Keyset pagination: (order column, id) composites
+        Index("idx_email_category_received_at_id", "detected_category", "received_at", "id"),
+        Index("idx_email_processed_at_id", "processed_at", "id"),
     )
     
     def __repr__(self):
@@ -335,6 +420,7 @@ class AdminAuditLog(Base):
     __table_args__ = (
         Index("idx_audit_admin_id", "admin_id"),
         Index("idx_audit_created_at", "created_at"),
+        Index("idx_audit_created_at_id", "created_at", "id"),
     )
     
     def __repr__(self):
@@ -360,3 +446,347 @@ class SystemSetting(Base):
     
     def __repr__(self):
         return f"<SystemSetting(key={self.key}, value={self.value[:50]})>"
+
+
+# ============================================
+# Search Term Model
+# ============================================
+
+class SearchTerm(Base):
+    """Distinct words of ticket titles, used to correct misspelled search input"""
+    __tablename__ = "search_terms"
+    
+    term: Mapped[str] = mapped_column(String(100), primary_key=True)
+    ndoc: Mapped[int] = mapped_column(Integer, nullable=False)  # Number of tickets containing the term
+    
+    __table_args__ = (
+        Index("idx_search_term_trgm", "term", postgresql_using="gist", postgresql_ops={"term": "gist_trgm_ops"}),
+    )
+    
+    def __repr__(self):
+        return f"<SearchTerm(term={self.term}, ndoc={self.ndoc})>"
+
+
+
+# ============================================
+# Ticket Daily Rollup Model
+# ============================================
+
+class TicketDailyRollup(Base):
+    """
+    Ticket counts per creation day (UTC), status, priority, category and
+    assignee, maintained by triggers on tickets (TICKET_ROLLUP_DDL) so
+    analytics read a few rows per day instead of scanning tickets.
+    """
+    __tablename__ = "ticket_daily_rollup"
+    
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[TicketStatus] = mapped_column(SQLEnum(TicketStatus), nullable=False)
+    priority: Mapped[TicketPriority] = mapped_column(SQLEnum(TicketPriority), nullable=False)
+    category: Mapped[TicketCategory] = mapped_column(SQLEnum(TicketCategory), nullable=False)
+    assigned_to: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ticket_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    resolved_count: Mapped[int] = mapped_column(Integer, nullable=False)  # Tickets with a resolution_time
+    resolution_minutes: Mapped[int] = mapped_column(BigInteger, nullable=False)  # Sum of their resolution_time
+    
+    __table_args__ = (
+        # The upsert target of the triggers; unassigned tickets (NULL) share one row per group
+        Index(
+            "idx_ticket_rollup_group", "day", "status", "priority", "category", "assigned_to",
+            unique=True, postgresql_nulls_not_distinct=True
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<TicketDailyRollup(day={self.day}, status={self.status}, ticket_count={self.ticket_count})>"
+
+
+# Statement-level triggers keep ticket_daily_rollup in step with tickets: each
+# INSERT / UPDATE / DELETE statement folds its transition table (every row it
+# changed) into +1 / -1 deltas per group and applies them with one upsert, so
+# bulk writes cost one rollup statement, not one per row. Groups are upserted
+# in key order so concurrent writers lock rollup rows in the same order.
+# Kept in step with database/migrations/006_ticket_daily_rollup.sql.
+_ROLLUP_DELTA = """
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               {sign} AS tickets,
+               {sign} * (resolution_time IS NOT NULL)::int AS resolved,
+               {sign} * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM {rows}"""
+
+_ROLLUP_FUNCTION = """
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM ({deltas}
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$"""
+
+TICKET_ROLLUP_DDL = [
+    _ROLLUP_FUNCTION.format(
+        name="ticket_rollup_insert",
+        deltas=_ROLLUP_DELTA.format(sign=1, rows="new_rows")
+    ),
+    _ROLLUP_FUNCTION.format(
+        name="ticket_rollup_update",
+        deltas=_ROLLUP_DELTA.format(sign=1, rows="new_rows") + "\n        UNION ALL"
+               + _ROLLUP_DELTA.format(sign=-1, rows="old_rows")
+    ),
+    _ROLLUP_FUNCTION.format(
+        name="ticket_rollup_delete",
+        deltas=_ROLLUP_DELTA.format(sign=-1, rows="old_rows")
+    ),
+    """
+CREATE OR REPLACE FUNCTION ticket_rollup_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_daily_rollup;
+    RETURN NULL;
+END;
+$$""",
+    """
+CREATE OR REPLACE TRIGGER tickets_rollup_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_insert()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_rollup_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_update()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_rollup_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_delete()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_rollup_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_truncate()""",
+]
+
+# After the whole metadata (the triggers need both tables); CREATE OR REPLACE
+# makes this safe on every create_all
+for _statement in TICKET_ROLLUP_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement))
+
+
+# ============================================
+# Resolution Time Sketch Model
+# ============================================
+
+# Relative error of the resolution time percentiles. Changing it requires
+# rebuilding ticket_resolution_sketch (migration 008 or reconcile()).
+RESOLUTION_SKETCH_ACCURACY = 0.01
+RESOLUTION_SKETCH_GAMMA = (1 + RESOLUTION_SKETCH_ACCURACY) / (1 - RESOLUTION_SKETCH_ACCURACY)
+
+# DDSketch bucket of a ticket: 0 for resolution_time 0, else 1 + ceil(log_gamma(minutes)),
+# so bucket b > 0 holds (gamma^(b-2), gamma^(b-1)] minutes
+RESOLUTION_SKETCH_BUCKET = (
+    "CASE WHEN resolution_time > 0 "
+    f"THEN 1 + ceil(ln(resolution_time::float8) / {math.log(RESOLUTION_SKETCH_GAMMA)!r})::int "
+    "ELSE 0 END"
+)
+
+
+class TicketResolutionSketch(Base):
+    """
+    DDSketch of resolution times per resolution day (UTC), category and
+    priority: one row per non-empty bucket with its ticket count. Sketches
+    merge by adding counts, so percentiles over any range of days, categories
+    or priorities come from summing rows instead of sorting tickets.
+    Maintained by triggers on tickets (RESOLUTION_SKETCH_DDL).
+    """
+    __tablename__ = "ticket_resolution_sketch"
+    
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category: Mapped[TicketCategory] = mapped_column(SQLEnum(TicketCategory), primary_key=True)
+    priority: Mapped[TicketPriority] = mapped_column(SQLEnum(TicketPriority), primary_key=True)
+    bucket: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    ticket_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<TicketResolutionSketch(day={self.day}, bucket={self.bucket}, ticket_count={self.ticket_count})>"
+
+
+# Same statement-level pattern as the rollup: tickets with a resolution time
+# enter the sketch of their resolution day, and a statement's net change is
+# applied with one upsert. Updates that change no resolution, category or
+# priority net out to nothing. Kept in step with
+# database/migrations/008_ticket_resolution_sketch.sql.
+_SKETCH_DELTA = """
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               {bucket} AS bucket,
+               {sign} AS tickets
+        FROM {rows}
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL"""
+
+_SKETCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM ({deltas}
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$"""
+
+RESOLUTION_SKETCH_DDL = [
+    _SKETCH_FUNCTION.format(
+        name="ticket_sketch_insert",
+        deltas=_SKETCH_DELTA.format(bucket=RESOLUTION_SKETCH_BUCKET, sign=1, rows="new_rows")
+    ),
+    _SKETCH_FUNCTION.format(
+        name="ticket_sketch_update",
+        deltas=_SKETCH_DELTA.format(bucket=RESOLUTION_SKETCH_BUCKET, sign=1, rows="new_rows") + "\n        UNION ALL"
+               + _SKETCH_DELTA.format(bucket=RESOLUTION_SKETCH_BUCKET, sign=-1, rows="old_rows")
+    ),
+    _SKETCH_FUNCTION.format(
+        name="ticket_sketch_delete",
+        deltas=_SKETCH_DELTA.format(bucket=RESOLUTION_SKETCH_BUCKET, sign=-1, rows="old_rows")
+    ),
+    """
+CREATE OR REPLACE FUNCTION ticket_sketch_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_resolution_sketch;
+    RETURN NULL;
+END;
+$$""",
+    """
+CREATE OR REPLACE TRIGGER tickets_sketch_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_insert()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_sketch_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_update()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_sketch_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_delete()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_sketch_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_truncate()""",
+]
+
+for _statement in RESOLUTION_SKETCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement))
+
+
+# ============================================
+# Analytics Cache Model
+# ============================================
+
+class AnalyticsCacheEntry(Base):
+    """
+    Cached analytics responses shared by all workers (ANALYTICS_CACHE_BACKEND=postgres).
+    UNLOGGED: not WAL-logged or replicated, and emptied after a crash.
+    """
+    __tablename__ = "analytics_cache"
+    
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)  # Endpoint:parameters
+    value: Mapped[dict] = mapped_column(JSON, nullable=False)
+    fresh_until: Mapped[float] = mapped_column(Float, nullable=False)  # Unix time
+    stale_until: Mapped[float] = mapped_column(Float, nullable=False)
+    
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+    
+    def __repr__(self):
+        return f"<AnalyticsCacheEntry(key={self.key})>"
+
+
+# ============================================
+# Ticket Tombstone Model
+# ============================================
+
+class TicketTombstone(Base):
+    """
+    Deleted tickets, so clients syncing through /tickets/changes learn of
+    deletes. Written by a trigger on tickets (TICKET_CHANGES_DDL) and pruned
+    after TICKET_TOMBSTONE_RETENTION_DAYS.
+    """
+    __tablename__ = "ticket_tombstones"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)  # Id of the deleted ticket
+    ticket_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    
+    __table_args__ = (
+        # Deletes after a changes cursor, and pruning, are range scans
+        Index("idx_ticket_tombstone_deleted_at_id", "deleted_at", "id"),
+    )
+    
+    def __repr__(self):
+        return f"<TicketTombstone(id={self.id}, ticket_id={self.ticket_id})>"
+
+
+# system_settings key of the last time tickets were written with past
+# updated_at values (imports) or truncated; /tickets/changes cursors from
+# before then are reset, and the clients reload
+TICKET_CHANGES_RESET_SETTING = "ticket_changes_reset_at"
+
+MARK_TICKET_CHANGES_RESET = f"""
+    INSERT INTO system_settings (key, value, value_type, description, updated_at)
+    VALUES ('{TICKET_CHANGES_RESET_SETTING}', now()::text, 'datetime',
+            'Ticket change cursors from before this time must reload', now())
+    ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at"""
+
+# The change feed relies on three triggers: every UPDATE of a ticket moves
+# its updated_at, whichever path wrote it (the trigger of database/schema.sql),
+# deletes leave tombstones, and a TRUNCATE resets the synced clients. Kept in
+# step with database/migrations/010_ticket_changes.sql.
+TICKET_CHANGES_DDL = [
+    """
+CREATE OR REPLACE FUNCTION update_updated_at() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$""",
+    """
+CREATE OR REPLACE TRIGGER tickets_updated_at BEFORE UPDATE ON tickets
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at()""",
+    """
+CREATE OR REPLACE FUNCTION ticket_tombstone_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_tombstones (id, ticket_id, deleted_at)
+    SELECT id, ticket_id, now() FROM old_rows
+    ORDER BY id
+    ON CONFLICT (id) DO UPDATE SET ticket_id = excluded.ticket_id, deleted_at = excluded.deleted_at;
+    RETURN NULL;
+END;
+$$""",
+    f"""
+CREATE OR REPLACE FUNCTION ticket_changes_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_tombstones;
+{MARK_TICKET_CHANGES_RESET};
+    RETURN NULL;
+END;
+$$""",
+    """
+CREATE OR REPLACE TRIGGER tickets_tombstone_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_tombstone_delete()""",
+    """
+CREATE OR REPLACE TRIGGER tickets_changes_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_changes_truncate()""",
+]
+
+for _statement in TICKET_CHANGES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement))
@@ -1,5 +1,10 @@
 # Repositories Package
 from app.repositories.base_repository import BaseRepository
+from app.repositories.pagination import (
+    InvalidCursorError,
+    encode_cursor,
+    decode_cursor
+)
 from app.repositories.user_repository import UserRepository
 from app.repositories.ticket_repository import (
     TicketRepository,
@@ -8,13 +13,28 @@ from app.repositories.ticket_repository import (
     AttachmentRepository
 )
 from app.repositories.email_repository import EmailRepository
+from app.repositories.search_term_repository import SearchTermRepository
+from app.repositories.import_repository import ImportRepository
+from app.repositories.rollup_repository import TicketRollupRepository
+from app.repositories.sketch_repository import ResolutionSketchRepository
+from app.repositories.snapshot_repository import SnapshotRepository, SnapshotTable, SNAPSHOT_TABLES
 
 __all__ = [
     "BaseRepository",
+    "InvalidCursorError",
+    "encode_cursor",
+    "decode_cursor",
     "UserRepository",
     "TicketRepository",
     "TicketLogRepository",
     "TicketCommentRepository",
     "AttachmentRepository",
-    "EmailRepository"
+    "EmailRepository",
+    "SearchTermRepository",
+    "ImportRepository",
+    "TicketRollupRepository",
+    "ResolutionSketchRepository",
+    "SnapshotRepository",
+    "SnapshotTable",
+    "SNAPSHOT_TABLES"
 ]
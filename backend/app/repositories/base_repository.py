@@ -4,7 +4,7 @@
 
 from typing import TypeVar, Generic, Type, Optional, List, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, insert, update, delete, func
 from sqlalchemy.orm import selectinload
 
 from app.core.database import Base
@@ -48,25 +48,77 @@ class BaseRepository(Generic[ModelType]):
         return result.scalar_one()
     
     async def create(self, obj_in: dict) -> ModelType:
-        """Create a new record"""
-        db_obj = self.model(**obj_in)
-        self.db.add(db_obj)
-        await self.db.flush()
-        await self.db.refresh(db_obj)
-        return db_obj
+        """Create a new record (one INSERT ... RETURNING round trip)"""
+        result = await self.db.execute(
+            insert(self.model).values(**obj_in).returning(self.model)
+        )
+        return result.scalar_one()
+    
+    async def create_many(self, objs_in: List[dict]) -> List[ModelType]:
+        """
+        Create several records with multi-row INSERT ... VALUES ... RETURNING.
+        Records are returned in the order of objs_in.
+        """
+        if not objs_in:
+            return []
+        # render_nulls keeps rows with and without None values in one batch
+        result = await self.db.scalars(
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True),
+            objs_in
+        )
+        return list(result.all())
     
     async def update(self, id: int, obj_in: dict) -> Optional[ModelType]:
-        """Update a record by ID"""
+        """Update a record by ID (one UPDATE ... RETURNING round trip)"""
         # Remove None values to avoid overwriting with nulls
         update_data = {k: v for k, v in obj_in.items() if v is not None}
         if not update_data:
             return await self.get_by_id(id)
         
-        await self.db.execute(
-            update(self.model).where(self.model.id == id).values(**update_data)
+        result = await self.db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**update_data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
         )
-        await self.db.flush()
-        return await self.get_by_id(id)
+        return result.scalar_one_or_none()
+    
+    async def update_by_ids(self, ids: List[int], values: dict) -> List[ModelType]:
+        """
+        Set the same values on several records in one UPDATE ... WHERE id IN
+        ... RETURNING. Values may be SQL expressions evaluated per row.
+        Returns the updated records (ids that do not exist are skipped).
+        """
+        if not ids or not values:
+            return []
+        result = await self.db.execute(
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+    
+    async def update_many(self, objs_in: List[dict]) -> int:
+        """
+        Update several records by primary key in one executemany.
+        Each dict holds "id" plus the values for that record; None values
+        are skipped as in update(). Every id must exist (the ORM raises
+        StaleDataError otherwise). Returns the number of records updated.
+        """
+        rows = [
+            {k: v for k, v in obj_in.items() if v is not None}
+            for obj_in in objs_in
+        ]
+        rows = [row for row in rows if len(row) > 1]
+        if not rows:
+            return 0
+        await self.db.execute(update(self.model), rows)
+        return len(rows)
     
     async def delete(self, id: int) -> bool:
         """Delete a record by ID"""
@@ -2,12 +2,13 @@
 # EMAIL REPOSITORY - Database Operations for Emails
 # ============================================
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from datetime import datetime
 
 from app.repositories.base_repository import BaseRepository
+from app.repositories.pagination import apply_keyset, build_page
 from app.models import EmailSource
 
 
@@ -46,17 +47,26 @@ class EmailRepository(BaseRepository[EmailSource]):
         self,
         skip: int = 0,
         limit: int = 50,
-        sap_only: bool = False
-    ) -> List[EmailSource]:
-        """Get processed emails"""
+        sap_only: bool = False,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[EmailSource], Optional[str]]:
+        """Get processed emails, most recently processed first. Returns (emails, next_cursor)"""
         query = select(EmailSource).where(EmailSource.processed_at.isnot(None))
         
         if sap_only:
             query = query.where(EmailSource.is_sap_related == True)
         
-        query = query.order_by(desc(EmailSource.processed_at)).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        query = apply_keyset(query, EmailSource.processed_at, EmailSource.id, True, cursor, "processed_at")
+        if not cursor:
+            query = query.offset(skip)
+        
+        result = await self.db.execute(query.limit(limit + 1))
+        return build_page(
+            result.scalars().all(),
+            limit,
+            "processed_at",
+            key=lambda e: (e.processed_at, e.id)
+        )
     
     async def mark_processed(
         self,
@@ -123,14 +133,19 @@ class EmailRepository(BaseRepository[EmailSource]):
         self,
         category: str,
         skip: int = 0,
-        limit: int = 50
-    ) -> List[EmailSource]:
-        """Get emails by detected category"""
-        result = await self.db.execute(
-            select(EmailSource)
-            .where(EmailSource.detected_category == category)
-            .order_by(desc(EmailSource.received_at))
-            .offset(skip)
-            .limit(limit)
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[EmailSource], Optional[str]]:
+        """Get emails by detected category, newest first. Returns (emails, next_cursor)"""
+        query = select(EmailSource).where(EmailSource.detected_category == category)
+        query = apply_keyset(query, EmailSource.received_at, EmailSource.id, True, cursor, "received_at")
+        if not cursor:
+            query = query.offset(skip)
+        
+        result = await self.db.execute(query.limit(limit + 1))
+        return build_page(
+            result.scalars().all(),
+            limit,
+            "received_at",
+            key=lambda e: (e.received_at, e.id)
         )
-        return list(result.scalars().all())
@@ -0,0 +1,74 @@
+# ============================================
+# FUZZY - Trigram (pg_trgm) Matching Helpers
+# ============================================
+# Typo-tolerant lookups for short values (user names, emails, search terms).
+# Columns searched this way carry a GiST gist_trgm_ops index, which answers
+# both the match operators (ILIKE, %, <%) and nearest-neighbour ordering
+# (<->, <<->), so the top-k closest rows are read straight from the index
+# without ranking every candidate. Long text (ticket titles) is matched
+# through the search_terms lexicon instead, see search_term_repository.
+
+from typing import Any, List, Sequence
+
+from sqlalchemy import or_, literal, text, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column: Any, query: str) -> Any:
+    """Case-insensitive substring match (trigram indexed for 3+ characters)"""
+    return column.ilike(f"%{escape_like(query)}%", escape="\\")
+
+
+def word_match(query: str, column: Any) -> Any:
+    """query is similar to some word sequence of column (pg_trgm <% operator)"""
+    return literal(query).op("<%", is_comparison=True)(column)
+
+
+def word_distance(query: str, column: Any) -> Any:
+    """1 - word_similarity(query, column); ORDER BY this for nearest matches"""
+    return literal(query).op("<<->", return_type=Float)(column)
+
+
+def fuzzy_match(column: Any, query: str) -> Any:
+    """Substring or typo-tolerant match of query against column"""
+    return or_(contains(column, query), word_match(query, column))
+
+
+def nearest(query_stmt: Any, column: Any, query: str, limit: int) -> Any:
+    """Restrict a select to the limit rows whose column is closest to query"""
+    return (
+        query_stmt
+        .where(word_match(query, column))
+        .order_by(word_distance(query, column))
+        .limit(limit)
+    )
+
+
+def merge_nearest(rows: Sequence[Any], limit: int) -> List[Any]:
+    """
+    Merge rows of several nearest() selects (UNION ALL), keeping each id once
+    with its best distance. Rows must have id and distance columns.
+    """
+    best = {}
+    for row in rows:
+        if row.id not in best or row.distance < best[row.id].distance:
+            best[row.id] = row
+    return sorted(best.values(), key=lambda row: (row.distance, row.id))[:limit]
+
+
+async def set_similarity_threshold(db: AsyncSession) -> None:
+    """Apply settings.search_similarity_threshold to % and <% for the current transaction"""
+    await db.execute(
+        text(
+            "SELECT set_config('pg_trgm.similarity_threshold', :threshold, true), "
+            "set_config('pg_trgm.word_similarity_threshold', :threshold, true)"
+        ),
+        {"threshold": str(settings.search_similarity_threshold)}
+    )
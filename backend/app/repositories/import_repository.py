@@ -0,0 +1,147 @@
+# ============================================
+# IMPORT REPOSITORY - Bulk Loading via COPY
+# ============================================
+# Validated rows are copied into a temporary staging table with binary COPY
+# (one round trip per chunk) and merged into the real table with a single
+# INSERT ... SELECT. Staging tables are created per transaction (ON COMMIT
+# DROP), so each chunk can be committed on its own.
+
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+
+from app.models import TICKET_NUMBER_SEQUENCE, sync_ticket_number
+from app.repositories.ticket_repository import ticket_id_sql
+
+
+# Columns filled from import rows, in COPY order (line = source line number)
+TICKET_IMPORT_COLUMNS = (
+    "line", "ticket_id", "title", "description", "status", "priority", "category",
+    "created_by", "assigned_to", "sla_due_date", "resolution_time",
+    "created_at", "updated_at", "resolved_at",
+)
+LOG_IMPORT_COLUMNS = (
+    "line", "ticket_ref", "user_id", "log_type", "action", "old_value", "new_value", "created_at",
+)
+COMMENT_IMPORT_COLUMNS = (
+    "line", "ticket_ref", "author_id", "content", "is_internal", "is_edited", "created_at",
+)
+
+
+class ImportRepository:
+    """Repository for COPY-based bulk imports of tickets, logs and comments"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def import_tickets(self, rows: Sequence[tuple]) -> List[Tuple[int, Optional[str]]]:
+        """
+        Insert tickets (tuples in TICKET_IMPORT_COLUMNS order). Tickets
+        without a ticket_id get the next ticket number (T-001), like tickets
+        created through the API; numbers are only taken for rows that are
+        inserted. Tickets whose ticket_id already exists (or comes again
+        later in the file) are skipped; returns their (line, ticket_id).
+        """
+        await self._stage(
+            "CREATE TEMP TABLE import_tickets (line integer NOT NULL, LIKE tickets INCLUDING DEFAULTS) ON COMMIT DROP",
+            "import_tickets", TICKET_IMPORT_COLUMNS, rows, resolved="ticket_id"
+        )
+        # Numbers taken below must not collide with the imported T-<number> ids
+        await self.db.execute(text(sync_ticket_number("import_tickets")))
+        columns = ", ".join(TICKET_IMPORT_COLUMNS[2:])
+        result = await self.db.execute(text(f"""
+            WITH accepted AS MATERIALIZED (
+                SELECT s.*, CASE WHEN s.ticket_id IS NULL THEN nextval('{TICKET_NUMBER_SEQUENCE}') END AS number
+                FROM (
+                    SELECT *, row_number() OVER (PARTITION BY ticket_id ORDER BY line) AS occurrence
+                    FROM import_tickets
+                ) s
+                WHERE s.ticket_id IS NULL
+                   OR (s.occurrence = 1 AND NOT EXISTS (SELECT 1 FROM tickets t WHERE t.ticket_id = s.ticket_id))
+            ), numbered AS (
+                SELECT line, COALESCE(ticket_id, {ticket_id_sql("number")}) AS ticket_id, {columns}
+                FROM accepted
+            ), inserted AS (
+                -- ON CONFLICT only catches tickets created concurrently
+                INSERT INTO tickets (ticket_id, {columns})
+                SELECT ticket_id, {columns} FROM numbered ORDER BY line
+                ON CONFLICT (ticket_id) DO NOTHING
+                RETURNING ticket_id
+            )
+            SELECT s.line, s.ticket_id
+            FROM import_tickets s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM numbered n JOIN inserted i ON i.ticket_id = n.ticket_id WHERE n.line = s.line
+            )
+            ORDER BY s.line
+        """))
+        return [tuple(row) for row in result.all()]
+    
+    async def import_logs(self, rows: Sequence[tuple]) -> List[Tuple[int, str]]:
+        """
+        Insert ticket logs (tuples in LOG_IMPORT_COLUMNS order, ticket_ref is
+        the ticket's ticket_id). Returns (line, ticket_ref) of rows whose
+        ticket does not exist; those are skipped.
+        """
+        await self._stage(
+            "CREATE TEMP TABLE import_ticket_logs "
+            "(line integer NOT NULL, ticket_ref varchar(50), LIKE ticket_logs INCLUDING DEFAULTS) ON COMMIT DROP",
+            "import_ticket_logs", LOG_IMPORT_COLUMNS, rows, resolved="ticket_id"
+        )
+        return await self._merge_by_ticket_ref(
+            "import_ticket_logs", "ticket_logs", LOG_IMPORT_COLUMNS[2:]
+        )
+    
+    async def import_comments(self, rows: Sequence[tuple]) -> List[Tuple[int, str]]:
+        """
+        Insert ticket comments (tuples in COMMENT_IMPORT_COLUMNS order).
+        Returns (line, ticket_ref) of rows whose ticket does not exist.
+        """
+        await self._stage(
+            "CREATE TEMP TABLE import_ticket_comments "
+            "(line integer NOT NULL, ticket_ref varchar(50), LIKE ticket_comments INCLUDING DEFAULTS) ON COMMIT DROP",
+            "import_ticket_comments", COMMENT_IMPORT_COLUMNS, rows, resolved="ticket_id"
+        )
+        return await self._merge_by_ticket_ref(
+            "import_ticket_comments", "ticket_comments", COMMENT_IMPORT_COLUMNS[2:]
+        )
+    
+    async def _stage(
+        self,
+        create_sql: str,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[tuple],
+        resolved: Optional[str] = None
+    ) -> None:
+        """
+        Create a staging table and fill it with binary COPY. resolved names a
+        NOT NULL column copied from the target that is only filled in by the
+        merge, so it is made nullable here. The copied id column is dropped:
+        its default would take a target id for every staged row.
+        """
+        await self.db.execute(text(create_sql))
+        await self.db.execute(text(f"ALTER TABLE {table} DROP COLUMN id"))
+        if resolved:
+            await self.db.execute(text(f"ALTER TABLE {table} ALTER COLUMN {resolved} DROP NOT NULL"))
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table, records=rows, columns=list(columns))
+    
+    async def _merge_by_ticket_ref(self, staging: str, target: str, columns: Sequence[str]) -> List[Tuple[int, str]]:
+        """INSERT ... SELECT staged rows, resolving ticket_ref to tickets.id"""
+        column_list = ", ".join(columns)
+        staged_list = ", ".join(f"s.{column}" for column in columns)
+        result = await self.db.execute(text(f"""
+            WITH resolved AS (
+                SELECT s.line, s.ticket_ref, t.id AS ticket_id, {staged_list}
+                FROM {staging} s LEFT JOIN tickets t ON t.ticket_id = s.ticket_ref
+            ), inserted AS (
+                INSERT INTO {target} (ticket_id, {column_list})
+                SELECT ticket_id, {column_list} FROM resolved
+                WHERE ticket_id IS NOT NULL
+                ORDER BY line
+            )
+            SELECT line, ticket_ref FROM resolved WHERE ticket_id IS NULL ORDER BY line
+        """))
+        return [tuple(row) for row in result.all()]
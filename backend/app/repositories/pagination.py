@@ -0,0 +1,164 @@
+# ============================================
+# PAGINATION - Keyset (Cursor) Pagination Helpers
+# ============================================
+# Cursors are opaque, URL-safe tokens encoding the (order column, id) of the
+# last row on a page. The next page is fetched with a row comparison
+# (order_value, id) < (cursor_value, cursor_id), which a composite index on
+# (order column, id) answers with a range scan - page 1 and page 5000 cost
+# the same, unlike OFFSET which has to walk every skipped row.
+
+import base64
+import heapq
+import json
+from datetime import datetime, date
+from typing import Any, Optional, Tuple, List, Sequence, Callable, AsyncIterator
+
+from sqlalchemy import tuple_, desc
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or does not match the query"""
+    pass
+
+
+def _encode_value(value: Any) -> Any:
+    """Make an order column value JSON serializable"""
+    if isinstance(value, (list, tuple)):  # Composite sort keys
+        return [_encode_value(v) for v in value]
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if hasattr(value, "value"):  # Enum members
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Reverse of _encode_value"""
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+    return value
+
+
+def encode_cursor(order_by: str, value: Any, id: int) -> str:
+    """Build an opaque cursor for the row (value, id) ordered by order_by"""
+    payload = json.dumps(
+        {"o": order_by, "v": _encode_value(value), "i": id},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> Tuple[Any, int]:
+    """Decode a cursor into (order_value, id), checking it belongs to order_by"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_order_by = payload["o"]
+        value = _decode_value(payload["v"])
+        row_id = int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if cursor_order_by != order_by:
+        raise InvalidCursorError(
+            f"Cursor was issued for order_by={cursor_order_by}, not {order_by}"
+        )
+    return value, row_id
+
+
+def keyset_order(order_column: Any, id_column: Any, order_desc: bool) -> List[Any]:
+    """ORDER BY clause for keyset pagination (id breaks ties deterministically)"""
+    if order_desc:
+        return [desc(order_column), desc(id_column)]
+    return [order_column, id_column]
+
+
+def apply_keyset(
+    query: Any,
+    order_column: Any,
+    id_column: Any,
+    order_desc: bool,
+    cursor: Optional[str],
+    order_by: str
+) -> Any:
+    """Restrict a query to rows after the cursor and apply the keyset ordering"""
+    if cursor:
+        value, row_id = decode_cursor(cursor, order_by)
+        if order_desc:
+            query = query.where(tuple_(order_column, id_column) < tuple_(value, row_id))
+        else:
+            query = query.where(tuple_(order_column, id_column) > tuple_(value, row_id))
+    return query.order_by(*keyset_order(order_column, id_column, order_desc))
+
+
+def build_page(
+    rows: Sequence[Any],
+    limit: int,
+    order_by: Optional[str],
+    key: Callable[[Any], Tuple[Any, int]]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a result fetched with limit + 1 rows to the page size and build the
+    cursor of the next page. key(row) must return (order_value, id).
+    Pass order_by=None for orderings that cannot be resumed with a cursor.
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    if order_by is None:
+        return rows, None
+
+    value, row_id = key(rows[-1])
+    return rows, encode_cursor(order_by, value, row_id)
+
+
+class _Descending:
+    """Sort key wrapper that inverts ordering, for descending heap merges"""
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: "_Descending") -> bool:
+        return self.key == other.key
+
+
+async def merge_sorted(
+    streams: Sequence[AsyncIterator[Any]],
+    key: Callable[[Any], Any],
+    reverse: bool = False
+) -> AsyncIterator[Any]:
+    """
+    k-way merge of async iterators that are each already sorted by key.
+    Holds one pending item per stream, so memory does not depend on how
+    many items the streams produce.
+    """
+    heap = []
+    for index, stream in enumerate(streams):
+        item = await anext(stream, None)
+        if item is not None:
+            sort_key = _Descending(key(item)) if reverse else key(item)
+            heap.append((sort_key, index, item))
+    heapq.heapify(heap)
+
+    while heap:
+        _, index, item = heap[0]
+        yield item
+        following = await anext(streams[index], None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            sort_key = _Descending(key(following)) if reverse else key(following)
+            heapq.heapreplace(heap, (sort_key, index, following))
@@ -0,0 +1,164 @@
+# ============================================
+# ROLLUP REPOSITORY - Pre-aggregated Ticket Counts
+# ============================================
+# ticket_daily_rollup holds ticket counts per creation day, status,
+# priority, category and assignee, kept current by triggers on tickets (see
+# TICKET_ROLLUP_DDL in models.py). Analytics read it instead of scanning
+# tickets, so their cost depends on the number of days and groups, not on
+# the number of tickets. reconcile() rebuilds it from tickets as a safety net.
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text, tuple_, literal_column
+
+from app.repositories.base_repository import BaseRepository
+from app.models import TicketDailyRollup
+from app.repositories.ticket_repository import TIMESERIES_GROUP_COLUMNS
+
+
+class TicketRollupRepository(BaseRepository[TicketDailyRollup]):
+    """Repository for the ticket daily rollup"""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(TicketDailyRollup, db)
+    
+    async def get_summary(self) -> Dict[str, Any]:
+        """
+        Ticket counts by status, priority and category, the total and the
+        average resolution time (hours), in one query:
+        GROUP BY GROUPING SETS ((status), (priority), (category), ()).
+        """
+        tickets = func.sum(TicketDailyRollup.ticket_count)
+        result = await self.db.execute(
+            select(
+                TicketDailyRollup.status,
+                TicketDailyRollup.priority,
+                TicketDailyRollup.category,
+                tickets.label("count"),
+                func.sum(TicketDailyRollup.resolved_count).label("resolved"),
+                func.sum(TicketDailyRollup.resolution_minutes).label("minutes")
+            )
+            .group_by(func.grouping_sets(
+                TicketDailyRollup.status, TicketDailyRollup.priority, TicketDailyRollup.category, tuple_()
+            ))
+        )
+        summary = {"status": {}, "priority": {}, "category": {}, "total": 0, "avg_resolution_time": None}
+        for row in result.all():
+            # The grouped columns are NOT NULL, so the one that is set names the grouping set
+            if row.status is not None:
+                group = summary["status"], row.status.value
+            elif row.priority is not None:
+                group = summary["priority"], row.priority.value
+            elif row.category is not None:
+                group = summary["category"], row.category.value
+            else:
+                summary["total"] = int(row.count or 0)
+                if row.resolved:
+                    summary["avg_resolution_time"] = float(row.minutes) / row.resolved / 60
+                continue
+            # Groups whose tickets were all deleted or moved stay in the rollup with a zero count
+            if row.count:
+                counts, key = group
+                counts[key] = int(row.count)
+        return summary
+    
+    async def get_category_counts(self) -> Dict[str, int]:
+        """Get count of tickets by category"""
+        tickets = func.sum(TicketDailyRollup.ticket_count)
+        result = await self.db.execute(
+            select(TicketDailyRollup.category, tickets)
+            .group_by(TicketDailyRollup.category)
+            .having(tickets > 0)
+        )
+        return {category.value: int(count) for category, count in result.all()}
+    
+    async def get_daily_ticket_counts(self, days: int = 30) -> List[dict]:
+        """Ticket counts per creation day (UTC) for the last N days"""
+        start_date: date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+        tickets = func.sum(TicketDailyRollup.ticket_count)
+        result = await self.db.execute(
+            select(TicketDailyRollup.day, tickets)
+            .where(TicketDailyRollup.day >= start_date)
+            .group_by(TicketDailyRollup.day)
+            .having(tickets > 0)
+            .order_by(TicketDailyRollup.day)
+        )
+        return [{"date": str(day), "count": int(count)} for day, count in result.all()]
+    
+    async def get_created_counts(
+        self,
+        start: Optional[date],
+        end: date,
+        per_day: bool = True,
+        group_by: Optional[str] = None
+    ) -> List[Tuple[Any, Any, int]]:
+        """
+        Tickets created on the days in [start, end), per day (or for the
+        whole range) and group_by column. Returns (day, group value, count)
+        rows like TicketRepository.get_event_counts.
+        """
+        rollup = TicketDailyRollup
+        conditions = [rollup.day < end]
+        if start is not None:
+            conditions.append(rollup.day >= start)
+        key = getattr(rollup, TIMESERIES_GROUP_COLUMNS[group_by]) if group_by else None
+        groups = [c for c in (rollup.day if per_day else None, key) if c is not None]
+        tickets = func.sum(rollup.ticket_count)
+        result = await self.db.execute(
+            select(
+                rollup.day if per_day else literal_column("NULL"),
+                key if key is not None else literal_column("NULL"),
+                tickets
+            )
+            .where(*conditions)
+            .group_by(*groups)
+            .having(tickets != 0)
+        )
+        return [(day, value, int(count)) for day, value, count in result.all()]
+    
+    async def reconcile(self) -> Dict[str, int]:
+        """
+        Rebuild the rollup from tickets: correct the groups that differ,
+        add missing ones and delete the groups without tickets. Ticket
+        writes wait on the table lock until the transaction ends, so
+        nothing changes between the scan and the correction. Returns the
+        number of groups fixed and removed.
+        """
+        await self.db.execute(text("LOCK TABLE ticket_daily_rollup IN EXCLUSIVE MODE"))
+        result = await self.db.execute(
+            text("""
+                WITH actual AS (
+                    SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+                           count(*) AS ticket_count,
+                           count(resolution_time) AS resolved_count,
+                           coalesce(sum(resolution_time), 0) AS resolution_minutes
+                    FROM tickets
+                    GROUP BY 1, 2, 3, 4, 5
+                ),
+                removed AS (
+                    DELETE FROM ticket_daily_rollup r
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM actual a
+                        WHERE a.day = r.day AND a.status = r.status AND a.priority = r.priority
+                          AND a.category = r.category AND a.assigned_to IS NOT DISTINCT FROM r.assigned_to
+                    )
+                    RETURNING 1
+                ),
+                fixed AS (
+                    INSERT INTO ticket_daily_rollup AS r
+                        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+                    SELECT * FROM actual
+                    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+                        ticket_count = excluded.ticket_count,
+                        resolved_count = excluded.resolved_count,
+                        resolution_minutes = excluded.resolution_minutes
+                    WHERE (r.ticket_count, r.resolved_count, r.resolution_minutes)
+                        IS DISTINCT FROM (excluded.ticket_count, excluded.resolved_count, excluded.resolution_minutes)
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM fixed) AS fixed, (SELECT count(*) FROM removed) AS removed
+            """)
+        )
+        row = result.one()
+        return {"fixed": row.fixed, "removed": row.removed}
@@ -0,0 +1,64 @@
+# ============================================
+# SEARCH TERM REPOSITORY - Search Lexicon Operations
+# ============================================
+# Ticket titles are too long and too similar to each other for trigram
+# nearest-neighbour search to stay fast at millions of rows. Instead each
+# misspelled input word is corrected against this small table of distinct
+# title words, and tickets are then found through the full-text GIN index.
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, text
+
+from app.repositories.base_repository import BaseRepository
+from app.repositories.fuzzy import set_similarity_threshold
+from app.models import SearchTerm
+
+
+class SearchTermRepository(BaseRepository[SearchTerm]):
+    """Repository for the search term lexicon"""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(SearchTerm, db)
+    
+    async def refresh(self) -> int:
+        """
+        Rebuild the lexicon from the words of all ticket titles.
+        Numbers are skipped; ticket ids are matched by prefix instead.
+        Returns the number of terms.
+        """
+        await self.db.execute(delete(SearchTerm))
+        result = await self.db.execute(
+            text("""
+                INSERT INTO search_terms (term, ndoc)
+                SELECT word, ndoc
+                FROM ts_stat('SELECT to_tsvector(''simple'', title) FROM tickets')
+                WHERE length(word) BETWEEN 3 AND 100 AND word !~ '^[0-9]+$'
+            """)
+        )
+        return result.rowcount
+    
+    async def correct(self, words: List[str]) -> List[Optional[str]]:
+        """
+        Closest known term for each word (None when nothing is similar enough),
+        preferring more frequent terms on ties. One round trip for all words.
+        """
+        if not words:
+            return []
+        await set_similarity_threshold(self.db)
+        
+        result = await self.db.execute(
+            text("""
+                SELECT t.term
+                FROM unnest(CAST(:words AS text[])) WITH ORDINALITY AS w(word, position)
+                LEFT JOIN LATERAL (
+                    SELECT term FROM search_terms
+                    WHERE w.word % term
+                    ORDER BY w.word <-> term, ndoc DESC
+                    LIMIT 1
+                ) t ON true
+                ORDER BY w.position
+            """),
+            {"words": words}
+        )
+        return [row[0] for row in result.all()]
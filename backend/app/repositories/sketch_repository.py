@@ -0,0 +1,167 @@
+# ============================================
+# SKETCH REPOSITORY - Resolution Time Percentiles
+# ============================================
+# ticket_resolution_sketch holds a DDSketch of resolution times per
+# resolution day (UTC), category and priority: the number of tickets in each
+# logarithmic bucket, kept current by triggers on tickets (see
+# RESOLUTION_SKETCH_DDL in models.py). Merging sketches is adding bucket
+# counts, so percentiles over any window are read from a few rows per day
+# instead of sorting tickets. Estimates are within RESOLUTION_SKETCH_ACCURACY
+# (relative) of the exact percentile.
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text, tuple_, literal_column
+
+from app.repositories.base_repository import BaseRepository
+from app.models import TicketResolutionSketch, RESOLUTION_SKETCH_BUCKET, RESOLUTION_SKETCH_GAMMA
+
+
+# Reported percentiles: name -> quantile
+RESOLUTION_PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def bucket_minutes(bucket: int) -> float:
+    """Estimate for the resolution times in a bucket: the midpoint (in relative terms) of its range"""
+    if bucket <= 0:
+        return 0.0
+    return 2 * RESOLUTION_SKETCH_GAMMA ** (bucket - 1) / (RESOLUTION_SKETCH_GAMMA + 1)
+
+
+class ResolutionSketchRepository(BaseRepository[TicketResolutionSketch]):
+    """Repository for the resolution time sketches"""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(TicketResolutionSketch, db)
+    
+    async def get_percentiles(self, since: date) -> Dict[str, Any]:
+        """
+        Resolution time percentiles (hours) of the tickets resolved since a
+        day: overall, per category and per priority, in one query. The
+        sketches of the window are merged with GROUPING SETS, and each
+        percentile is the first bucket whose running count reaches its share
+        of the tickets (the rank percentile_disc uses).
+        """
+        sketch = TicketResolutionSketch
+        merged = (
+            select(
+                sketch.category,
+                sketch.priority,
+                sketch.bucket,
+                func.grouping(sketch.category, sketch.priority).label("grouped"),
+                func.sum(sketch.ticket_count).label("tickets")
+            )
+            .where(sketch.day >= since)
+            .group_by(func.grouping_sets(
+                tuple_(sketch.category, sketch.bucket), tuple_(sketch.priority, sketch.bucket), sketch.bucket
+            ))
+            .having(func.sum(sketch.ticket_count) > 0)
+            .subquery()
+        )
+        group = (merged.c.grouped, merged.c.category, merged.c.priority)
+        ranked = select(
+            *group,
+            merged.c.bucket,
+            func.sum(merged.c.tickets).over(partition_by=group, order_by=merged.c.bucket).label("running"),
+            func.sum(merged.c.tickets).over(partition_by=group).label("total")
+        ).subquery()
+        
+        group = (ranked.c.grouped, ranked.c.category, ranked.c.priority)
+        result = await self.db.execute(
+            select(
+                *group,
+                ranked.c.total,
+                *(
+                    func.min(ranked.c.bucket).filter(ranked.c.running >= quantile * ranked.c.total).label(name)
+                    for name, quantile in RESOLUTION_PERCENTILES.items()
+                )
+            )
+            .group_by(*group, ranked.c.total)
+        )
+        
+        percentiles = {"overall": None, "category": {}, "priority": {}}
+        for row in result.all():
+            values = {"count": int(row.total)}
+            for name in RESOLUTION_PERCENTILES:
+                values[name] = round(bucket_minutes(getattr(row, name)) / 60, 4)
+            # grouping() bits: category (2), priority (1); a set bit means not grouped by it
+            if row.grouped == 0b01:
+                percentiles["category"][row.category.value] = values
+            elif row.grouped == 0b10:
+                percentiles["priority"][row.priority.value] = values
+            else:
+                percentiles["overall"] = values
+        return percentiles
+    
+    async def get_resolved_counts(
+        self,
+        start: Optional[date],
+        end: date,
+        per_day: bool = True,
+        group_by: Optional[str] = None
+    ) -> List[Tuple[Any, Any, int]]:
+        """
+        Tickets resolved on the days in [start, end), per day (or for the
+        whole range) and category or priority: the sketch sizes. Returns
+        (day, group value, count) rows like TicketRepository.get_event_counts.
+        """
+        sketch = TicketResolutionSketch
+        conditions = [sketch.day < end]
+        if start is not None:
+            conditions.append(sketch.day >= start)
+        key = getattr(sketch, group_by) if group_by else None
+        groups = [c for c in (sketch.day if per_day else None, key) if c is not None]
+        tickets = func.sum(sketch.ticket_count)
+        result = await self.db.execute(
+            select(
+                sketch.day if per_day else literal_column("NULL"),
+                key if key is not None else literal_column("NULL"),
+                tickets
+            )
+            .where(*conditions)
+            .group_by(*groups)
+            .having(tickets != 0)
+        )
+        return [(day, value, int(count)) for day, value, count in result.all()]
+    
+    async def reconcile(self) -> Dict[str, int]:
+        """
+        Rebuild the sketches from tickets, like TicketRollupRepository.reconcile:
+        correct the buckets that differ, add missing ones and delete empty
+        ones, with ticket writes blocked until the transaction ends. Returns
+        the number of buckets fixed and removed.
+        """
+        await self.db.execute(text("LOCK TABLE ticket_resolution_sketch IN EXCLUSIVE MODE"))
+        result = await self.db.execute(
+            text(f"""
+                WITH actual AS (
+                    SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+                           {RESOLUTION_SKETCH_BUCKET} AS bucket,
+                           count(*) AS ticket_count
+                    FROM tickets
+                    WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+                    GROUP BY 1, 2, 3, 4
+                ),
+                removed AS (
+                    DELETE FROM ticket_resolution_sketch s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM actual a
+                        WHERE a.day = s.day AND a.category = s.category
+                          AND a.priority = s.priority AND a.bucket = s.bucket
+                    )
+                    RETURNING 1
+                ),
+                fixed AS (
+                    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+                    SELECT * FROM actual
+                    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+                        ticket_count = excluded.ticket_count
+                    WHERE s.ticket_count <> excluded.ticket_count
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM fixed) AS fixed, (SELECT count(*) FROM removed) AS removed
+            """)
+        )
+        row = result.one()
+        return {"fixed": row.fixed, "removed": row.removed}
@@ -0,0 +1,128 @@
+# ============================================
+# SNAPSHOT REPOSITORY - Month Partitions for Columnar Snapshots
+# ============================================
+# Reads for the Parquet snapshots (services/snapshot_service.py): which
+# months (UTC) of a table have rows changed since the previous snapshot, and
+# all rows of one month, read from a server-side cursor in batches.
+
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select, func, or_, cast, Date
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Ticket, TicketLog, EmailSource, TicketTombstone
+
+
+class SnapshotTable(NamedTuple):
+    """A table written to snapshots"""
+    name: str
+    columns: Tuple[Any, ...]
+    month_column: Any  # Partition column (month of this timestamp)
+    id_column: Any
+    # Timestamps set by every write of a row: rows at or after the previous
+    # horizon (or with a higher id) changed since that snapshot
+    change_columns: Tuple[Any, ...]
+    ticket_column: Optional[Any] = None  # Rows of deleted tickets are removed by rewriting their month
+    # String columns with few distinct values, dictionary-encoded like the enum columns
+    dictionary_columns: Tuple[Any, ...] = ()
+
+
+SNAPSHOT_TABLES = {
+    table.name: table for table in (
+        SnapshotTable(
+            name="tickets",
+            columns=(
+                Ticket.id, Ticket.ticket_id, Ticket.title, Ticket.status, Ticket.priority, Ticket.category,
+                Ticket.created_by, Ticket.assigned_to, Ticket.llm_confidence, Ticket.sla_due_date,
+                Ticket.resolution_time, Ticket.created_at, Ticket.updated_at, Ticket.resolved_at,
+            ),
+            month_column=Ticket.created_at,
+            id_column=Ticket.id,
+            change_columns=(Ticket.updated_at,),
+            ticket_column=Ticket.id
+        ),
+        SnapshotTable(
+            name="ticket_logs",
+            columns=(
+                TicketLog.id, TicketLog.ticket_id, TicketLog.user_id, TicketLog.log_type, TicketLog.action,
+                TicketLog.old_value, TicketLog.new_value, TicketLog.created_at,
+            ),
+            month_column=TicketLog.created_at,
+            id_column=TicketLog.id,
+            change_columns=(TicketLog.created_at,),
+            ticket_column=TicketLog.ticket_id
+        ),
+        SnapshotTable(
+            name="email_sources",
+            columns=(
+                EmailSource.id, EmailSource.from_address, EmailSource.subject, EmailSource.received_at,
+                EmailSource.processed_at, EmailSource.is_sap_related, EmailSource.detected_category,
+                EmailSource.ticket_created_id, EmailSource.created_at,
+            ),
+            month_column=EmailSource.received_at,
+            id_column=EmailSource.id,
+            change_columns=(EmailSource.created_at,),  # Classified once, when the email is stored
+            dictionary_columns=(EmailSource.detected_category,)
+        ),
+    )
+}
+
+
+def _month(column: Any) -> Any:
+    """First day of the UTC month of a timestamp column"""
+    return cast(func.date_trunc("month", func.timezone("UTC", column)), Date)
+
+
+class SnapshotRepository:
+    """Repository for the reads of columnar snapshots"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_months(
+        self,
+        table: SnapshotTable,
+        since: Optional[datetime] = None,
+        last_id: int = 0
+    ) -> List[date]:
+        """Months with rows changed at or after since or with an id above last_id (all months without since)"""
+        query = select(_month(table.month_column)).distinct()
+        if since is not None:
+            query = query.where(or_(
+                table.id_column > last_id,
+                *(column >= since for column in table.change_columns)
+            ))
+        result = await self.db.execute(query)
+        return sorted(result.scalars().all())
+    
+    async def get_max_id(self, table: SnapshotTable) -> int:
+        result = await self.db.execute(select(func.coalesce(func.max(table.id_column), 0)))
+        return result.scalar_one()
+    
+    async def get_deleted_ticket_ids(self, since: datetime) -> List[int]:
+        """Ids of the tickets deleted at or after since"""
+        result = await self.db.execute(
+            select(TicketTombstone.id).where(TicketTombstone.deleted_at >= since)
+        )
+        return list(result.scalars().all())
+    
+    async def stream_month(
+        self,
+        table: SnapshotTable,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000
+    ) -> AsyncIterator[list]:
+        """The rows (table.columns) with month_column in [start, end), by id, in batches"""
+        query = (
+            select(*table.columns)
+            .where(table.month_column >= start, table.month_column < end)
+            .order_by(table.id_column)
+        )
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
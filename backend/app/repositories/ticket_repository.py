@@ -2,14 +2,90 @@
 # TICKET REPOSITORY - Database Operations for Tickets
 # ============================================
 
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any, AsyncIterator, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, func, and_, or_, case, desc, text, literal_column, union_all, tuple_, cast, extract, Integer, BigInteger, Date
+from sqlalchemy.orm import selectinload, joinedload, aliased
 from datetime import datetime, timedelta
+import json
+import re
 
+from app.core.config import settings
 from app.repositories.base_repository import BaseRepository
-from app.models import Ticket, TicketLog, TicketComment, Attachment, TicketStatus, TicketPriority, TicketCategory
+from app.repositories.pagination import (
+    apply_keyset,
+    build_page,
+    keyset_order,
+    decode_cursor,
+    merge_sorted,
+    InvalidCursorError
+)
+from app.models import (
+    Ticket, TicketLog, TicketComment, Attachment, User, TicketTombstone, SystemSetting,
+    TicketStatus, TicketPriority, TicketCategory, LogType, TICKET_NUMBER_SEQUENCE,
+    OPEN_TICKET_CONDITION, SLA_MISSED_CONDITION, TICKET_CHANGES_RESET_SETTING, MARK_TICKET_CHANGES_RESET
+)
+
+
+# Time series group_by values -> ticket column (also the rollup and sketch column names)
+TIMESERIES_GROUP_COLUMNS = {"category": "category", "priority": "priority", "assignee": "assigned_to"}
+
+# Order columns that can be resumed with a cursor (non-null; id and the
+# unique ticket_id are indexed on their own, the others by composite
+# (column, id) indexes)
+TICKET_KEYSET_COLUMNS = ("created_at", "updated_at", "id", "ticket_id", "title")
+
+# Text search configuration of tickets.search_vector (must match the column definition)
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+# ts_headline options for result snippets; the description is HTML-escaped
+# before highlighting, so only the <mark> tags are markup
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+
+# Age buckets of open tickets: (label, upper bound in days); the last is open-ended
+OPEN_AGE_BUCKETS = (("< 1 day", 1), ("1-3 days", 3), ("3-7 days", 7), ("7-30 days", 30), ("> 30 days", None))
+
+# Search input that is a (partial) ticket id, e.g. "T-12"
+TICKET_ID_PATTERN = re.compile(r"^[A-Za-z]+-[0-9]+$")
+
+# Zero padding of generated ticket numbers (T-001)
+TICKET_ID_DIGITS = 3
+
+# Timeline sources in tie-break order: items with equal created_at are
+# ordered log < comment < attachment (then by id)
+TIMELINE_SOURCES = ("log", "comment", "attachment")
+TIMELINE_BATCH = 100
+
+
+def ticket_id_prefixes(value: str) -> List[str]:
+    """
+    Ticket id prefixes a partial id (matching TICKET_ID_PATTERN) stands for:
+    "t-12" -> ["T-012", "T-12"]. Input that already has leading zeros is
+    taken as typed.
+    """
+    letters, digits = value.upper().split("-", 1)
+    if digits.startswith("0"):
+        return [f"{letters}-{digits}"]
+    return [
+        f"{letters}-{digits.zfill(width)}"
+        for width in range(max(len(digits), TICKET_ID_DIGITS), len(digits) - 1, -1)
+    ]
+
+
+def format_ticket_id(number: int) -> str:
+    """Ticket id of a ticket number: 1 -> T-001, 1234 -> T-1234"""
+    return f"T-{number:0{TICKET_ID_DIGITS}d}"
+
+
+def ticket_id_sql(number: str) -> str:
+    """format_ticket_id in SQL; number appears twice, so it must not be volatile (no nextval)"""
+    return f"'T-' || lpad(({number})::text, greatest({TICKET_ID_DIGITS}, length(({number})::text)), '0')"
+
+
+def search_query(search: str):
+    """tsquery for user search input (quoted phrases, OR and -exclusion supported)"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, search)
 
 
 class TicketRepository(BaseRepository[Ticket]):
@@ -45,27 +121,160 @@ class TicketRepository(BaseRepository[Ticket]):
         )
         return result.scalar_one_or_none()
     
-    async def get_paginated(
+    async def get_with_users(self, id: int) -> Optional[Ticket]:
+        """Get ticket with only its creator and assignee (one query)"""
+        result = await self.db.execute(
+            select(Ticket)
+            .options(
+                joinedload(Ticket.created_by_user),
+                joinedload(Ticket.assigned_to_user),
+            )
+            .where(Ticket.id == id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_many_with_users(self, ids: List[int]) -> Dict[int, Ticket]:
+        """Get several tickets with their creator and assignee (one query), keyed by ID"""
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(Ticket)
+            .options(
+                joinedload(Ticket.created_by_user),
+                joinedload(Ticket.assigned_to_user),
+            )
+            .where(Ticket.id.in_(ids))
+        )
+        return {ticket.id: ticket for ticket in result.scalars().all()}
+    
+    @staticmethod
+    def minutes_since_created(moment: datetime) -> Any:
+        """SQL expression: whole minutes from each row's created_at to moment (resolution_time)"""
+        return cast(func.floor(extract("epoch", moment - Ticket.created_at) / 60), Integer)
+    
+    async def get_section_counts(self, id: int) -> Dict[str, int]:
+        """Number of logs, comments and attachments of a ticket (one query)"""
+        def count(model):
+            return (
+                select(func.count())
+                .select_from(model)
+                .where(model.ticket_id == id)
+                .scalar_subquery()
+            )
+        
+        result = await self.db.execute(
+            select(
+                count(TicketLog).label("logs"),
+                count(TicketComment).label("comments"),
+                count(Attachment).label("attachments")
+            )
+        )
+        return dict(result.one()._mapping)
+    
+    async def get_timeline(
+        self,
+        id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        order_desc: bool = True
+    ) -> Tuple[List[Tuple[str, Any]], Optional[str]]:
+        """
+        One page of a ticket's logs, comments and attachments merged by
+        created_at. Each source is streamed in (ticket_id, created_at, id)
+        index order and the three streams are k-way merged, so at most one
+        fetch batch per source is held in memory. No source can contribute
+        more than limit + 1 rows to a page, which also keeps the planner on
+        the index scan. Returns ([(kind, row)], next_cursor)
+        """
+        order_by = "timeline_desc" if order_desc else "timeline_asc"
+        after = decode_cursor(cursor, order_by) if cursor else None
+        if after and not (
+            isinstance(after[0], list)
+            and len(after[0]) == 2
+            and isinstance(after[0][0], datetime)
+            and after[0][1] in range(len(TIMELINE_SOURCES))
+        ):
+            raise InvalidCursorError("Invalid pagination cursor")
+        batch = min(limit + 1, TIMELINE_BATCH)
+        
+        results = []
+        merged = None
+        try:
+            for rank, kind in enumerate(TIMELINE_SOURCES):
+                query = self._timeline_query(id, rank, after, order_desc).limit(limit + 1)
+                results.append(await self.db.stream(query.execution_options(yield_per=batch)))
+            
+            async def tagged(rank, result):
+                async for row in result.scalars():
+                    yield rank, row
+            
+            merged = merge_sorted(
+                [tagged(rank, result) for rank, result in enumerate(results)],
+                key=lambda item: (item[1].created_at, item[0], item[1].id),
+                reverse=order_desc
+            )
+            items = []
+            async for item in merged:
+                items.append(item)
+                if len(items) > limit:
+                    break
+        finally:
+            if merged is not None:
+                await merged.aclose()
+            for result in results:
+                await result.close()
+        
+        page, next_cursor = build_page(
+            items,
+            limit,
+            order_by,
+            key=lambda item: ([item[1].created_at, item[0]], item[1].id)
+        )
+        return [(TIMELINE_SOURCES[rank], row) for rank, row in page], next_cursor
+    
+    def _timeline_query(
+        self,
+        id: int,
+        rank: int,
+        after: Optional[Tuple[Any, int]],
+        order_desc: bool
+    ) -> Any:
+        """Index-ordered select of one timeline source, resumed after a cursor"""
+        model = (TicketLog, TicketComment, Attachment)[rank]
+        query = select(model).where(model.ticket_id == id)
+        if model is TicketLog:
+            query = query.options(joinedload(TicketLog.user))
+        elif model is TicketComment:
+            query = query.options(joinedload(TicketComment.author))
+        
+        if after:
+            (created_at, after_rank), after_id = after
+            if rank == after_rank:
+                position = tuple_(model.created_at, model.id)
+                bound = tuple_(created_at, after_id)
+                query = query.where(position < bound if order_desc else position > bound)
+            elif (rank < after_rank) == order_desc:
+                # Sorts after the cursor row even at the same created_at
+                query = query.where(
+                    model.created_at <= created_at if order_desc else model.created_at >= created_at
+                )
+            else:
+                query = query.where(
+                    model.created_at < created_at if order_desc else model.created_at > created_at
+                )
+        
+        return query.order_by(*keyset_order(model.created_at, model.id, order_desc))
+    
+    def _build_filters(
         self,
-        skip: int = 0,
-        limit: int = 20,
         status: Optional[TicketStatus] = None,
         priority: Optional[TicketPriority] = None,
         category: Optional[TicketCategory] = None,
         assigned_to: Optional[int] = None,
         created_by: Optional[int] = None,
-        search: Optional[str] = None,
-        order_by: str = "created_at",
-        order_desc: bool = True
-    ) -> Tuple[List[Ticket], int]:
-        """Get paginated tickets with filters"""
-        query = select(Ticket).options(
-            selectinload(Ticket.created_by_user),
-            selectinload(Ticket.assigned_to_user),
-        )
-        count_query = select(func.count()).select_from(Ticket)
-        
-        # Apply filters
+        search: Optional[str] = None
+    ) -> list:
+        """Build the WHERE conditions shared by listing and counting queries"""
         filters = []
         if status:
             filters.append(Ticket.status == status)
@@ -78,45 +287,276 @@ class TicketRepository(BaseRepository[Ticket]):
         if created_by:
             filters.append(Ticket.created_by == created_by)
         if search:
-            search_term = f"%{search.lower()}%"
-            filters.append(
-                or_(
-                    func.lower(Ticket.title).like(search_term),
-                    func.lower(Ticket.description).like(search_term),
-                    func.lower(Ticket.ticket_id).like(search_term)
-                )
-            )
+            text_match = Ticket.search_vector.op("@@")(search_query(search))
+            if TICKET_ID_PATTERN.match(search.strip()):
+                # Partial ticket ids ("T-12" -> T-12, T-120, ...)
+                text_match = or_(text_match, self._ticket_id_prefix(search.strip()))
+            filters.append(text_match)
+        return filters
+    
+    def _ticket_id_prefix(self, prefix: str):
+        """
+        ticket_id starts with prefix, case-insensitive and ignoring zero
+        padding (idx_ticket_ticket_id_prefix). prefix must match
+        TICKET_ID_PATTERN, so it holds no LIKE wildcards.
+        """
+        return or_(*[Ticket.ticket_id.like(f"{p}%") for p in ticket_id_prefixes(prefix)])
+    
+    def _order_column(self, order_by: str, search: Optional[str]) -> Any:
+        """Sort expression for order_by (relevance ranks full-text matches)"""
+        if order_by == "relevance" and search:
+            return func.ts_rank(Ticket.search_vector, search_query(search))
+        return getattr(Ticket, order_by, Ticket.created_at)
+    
+    async def get_paginated(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        status: Optional[TicketStatus] = None,
+        priority: Optional[TicketPriority] = None,
+        category: Optional[TicketCategory] = None,
+        assigned_to: Optional[int] = None,
+        created_by: Optional[int] = None,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Tuple[List[Ticket], Optional[int], Optional[str]]:
+        """
+        Get paginated tickets with filters.
+        With a cursor, the page starts after the cursor row and skip is ignored.
+        With include_total, the exact total is returned in the same round trip
+        through a count(*) OVER () window column; otherwise total is None.
+        Returns (tickets, total, next_cursor).
+        """
+        if cursor and order_by not in TICKET_KEYSET_COLUMNS:
+            raise InvalidCursorError(f"Cursor pagination is not supported for order_by={order_by}")
         
+        filters = self._build_filters(status, priority, category, assigned_to, created_by, search)
+        
+        # The window only sees rows past the cursor, so cursor pages count separately
+        use_window = include_total and not cursor
+        columns = [Ticket]
+        if use_window:
+            columns.append(func.count().over().label("total_count"))
+        query = select(*columns).options(
+            selectinload(Ticket.created_by_user),
+            selectinload(Ticket.assigned_to_user),
+        )
         if filters:
             query = query.where(and_(*filters))
-            count_query = count_query.where(and_(*filters))
         
-        # Get total count
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
+        # Apply ordering - id breaks ties so pages never overlap
+        order_column = self._order_column(order_by, search)
+        query = apply_keyset(query, order_column, Ticket.id, order_desc, cursor, order_by)
         
-        # Apply ordering
-        order_column = getattr(Ticket, order_by, Ticket.created_at)
-        if order_desc:
-            query = query.order_by(desc(order_column))
-        else:
-            query = query.order_by(order_column)
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Apply pagination (one extra row tells us whether a next page exists)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit + 1)
         
         result = await self.db.execute(query)
-        tickets = list(result.scalars().all())
+        rows = result.all()
+        
+        total = None
+        if include_total:
+            if use_window and rows:
+                total = rows[0].total_count
+            elif use_window and not skip:
+                total = 0
+            else:
+                # Cursor page, or an offset past the last row
+                total = await self.count_filtered(filters)
+        
+        tickets, next_cursor = build_page(
+            [row[0] for row in rows],
+            limit,
+            order_by if order_by in TICKET_KEYSET_COLUMNS else None,
+            key=lambda t: (getattr(t, order_by), t.id)
+        )
+        
+        return tickets, total, next_cursor
+    
+    async def stream_export_rows(
+        self,
+        status: Optional[TicketStatus] = None,
+        priority: Optional[TicketPriority] = None,
+        category: Optional[TicketCategory] = None,
+        assigned_to: Optional[int] = None,
+        created_by: Optional[int] = None,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        batch_size: int = 2000
+    ) -> AsyncIterator[list]:
+        """
+        All tickets matching the get_paginated filters, in the same order, as
+        batches of plain rows read from a server-side cursor. Rows hold the
+        columns of export_service.EXPORT_COLUMNS, in that order; no ORM
+        objects are built, so memory stays at one batch however many rows
+        match.
+        """
+        creator = aliased(User)
+        assignee = aliased(User)
+        query = (
+            select(
+                Ticket.ticket_id,
+                Ticket.title,
+                Ticket.description,
+                Ticket.status,
+                Ticket.priority,
+                Ticket.category,
+                creator.name.label("created_by_name"),
+                assignee.name.label("assigned_to_name"),
+                Ticket.created_at,
+                Ticket.updated_at,
+                Ticket.resolved_at,
+                Ticket.resolution_time,
+                Ticket.sla_due_date,
+            )
+            .join(creator, creator.id == Ticket.created_by)
+            .outerjoin(assignee, assignee.id == Ticket.assigned_to)
+        )
+        filters = self._build_filters(status, priority, category, assigned_to, created_by, search)
+        if filters:
+            query = query.where(and_(*filters))
+        query = query.order_by(*keyset_order(self._order_column(order_by, search), Ticket.id, order_desc))
+        
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
+    
+    async def suggest_by_ticket_id(self, prefix: str, limit: int = 5) -> list:
+        """
+        Autocomplete: tickets whose ticket_id starts with prefix (see
+        ticket_id_prefixes), in id order. Each padding variant is read in
+        order from the prefix index.
+        Returns rows of (id, ticket_id, title, status).
+        """
+        branches = [
+            select(Ticket.id, Ticket.ticket_id, Ticket.title, Ticket.status)
+            .where(Ticket.ticket_id.like(f"{p}%"))
+            .order_by(Ticket.ticket_id)
+            .limit(limit)
+            for p in ticket_id_prefixes(prefix)
+        ]
+        result = await self.db.execute(union_all(*branches))
+        return sorted(result.all(), key=lambda row: row.ticket_id)[:limit]
+    
+    async def suggest_by_title(self, word_variants: List[List[str]], limit: int = 5) -> list:
+        """
+        Autocomplete: newest tickets whose title contains every word, each word
+        given as one or more alphanumeric spellings. Words match as prefixes, so
+        the word being typed can be incomplete.
+        Returns rows of (id, ticket_id, title, status).
+        """
+        # :*A = prefix match restricted to weight A (ticket id and title)
+        clauses = [
+            "(" + " | ".join(f"{variant}:*A" for variant in variants) + ")"
+            for variants in word_variants
+        ]
+        tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(clauses))
+        result = await self.db.execute(
+            select(Ticket.id, Ticket.ticket_id, Ticket.title, Ticket.status)
+            .where(Ticket.search_vector.op("@@")(tsquery))
+            .order_by(desc(Ticket.created_at), desc(Ticket.id))
+            .limit(limit)
+        )
+        return list(result.all())
+    
+    async def get_search_headlines(self, ids: List[int], search: str) -> Dict[int, str]:
+        """
+        Highlighted description snippets for a page of search results.
+        ts_headline re-parses the whole document, so it only runs for the given ids.
+        """
+        if not ids:
+            return {}
+        escaped = func.replace(
+            func.replace(func.replace(Ticket.description, "&", "&amp;"), "<", "&lt;"), ">", "&gt;"
+        )
+        result = await self.db.execute(
+            select(
+                Ticket.id,
+                func.ts_headline(SEARCH_CONFIG, escaped, search_query(search), HEADLINE_OPTIONS)
+            ).where(Ticket.id.in_(ids))
+        )
+        return {row[0]: row[1] for row in result.all()}
+    
+    async def count_filtered(self, filters: list) -> int:
+        """Exact count of tickets matching the given conditions"""
+        count_query = select(func.count()).select_from(Ticket)
+        if filters:
+            count_query = count_query.where(and_(*filters))
+        result = await self.db.execute(count_query)
+        return result.scalar_one()
+    
+    async def estimate_count(
+        self,
+        status: Optional[TicketStatus] = None,
+        priority: Optional[TicketPriority] = None,
+        category: Optional[TicketCategory] = None,
+        assigned_to: Optional[int] = None,
+        created_by: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """
+        Estimate the number of matching tickets from planner statistics.
+        Unfiltered counts read pg_class.reltuples; filtered counts use the
+        planner's row estimate (EXPLAIN, nothing is executed). Estimates below
+        settings.count_estimate_threshold mean a selective filter, for which
+        an exact index-backed count is cheap, so those are counted exactly.
+        Returns (count, is_estimate).
+        """
+        filters = self._build_filters(status, priority, category, assigned_to, created_by, search)
         
-        return tickets, total
+        if not filters:
+            result = await self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'tickets'::regclass")
+            )
+            estimate = result.scalar_one_or_none()
+        else:
+            probe = select(Ticket.id).where(and_(*filters))
+            compiled = probe.compile(
+                dialect=self.db.bind.dialect,
+                compile_kwargs={"literal_binds": True}
+            )
+            result = await self.db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+        
+        # reltuples is -1 (or 0) until the table has been vacuumed/analyzed
+        if estimate is None or estimate < settings.count_estimate_threshold:
+            return await self.count_filtered(filters), False
+        return int(estimate), True
     
     async def get_next_ticket_id(self) -> str:
-        """Generate the next ticket ID (T-001 format)"""
+        """Take the next ticket ID (T-001 format) from the ticket number sequence"""
+        return (await self.get_next_ticket_ids(1))[0]
+    
+    async def get_next_ticket_ids(self, count: int) -> List[str]:
+        """Take the next count ticket IDs (T-001 format) in one query"""
+        if count <= 0:
+            return []
         result = await self.db.execute(
-            select(func.count()).select_from(Ticket)
+            text(f"SELECT nextval('{TICKET_NUMBER_SEQUENCE}') FROM generate_series(1, :count)"),
+            {"count": count}
         )
-        count = result.scalar_one()
-        return f"T-{str(count + 1).zfill(3)}"
+        return [format_ticket_id(number) for number in result.scalars()]
+    
+    async def get_spooled_keys(self, keys: List[str]) -> Set[str]:
+        """Spool idempotency keys (of keys) that already have a ticket"""
+        if not keys:
+            return set()
+        result = await self.db.execute(
+            select(Ticket.spool_key).where(Ticket.spool_key.in_(keys))
+        )
+        return set(result.scalars().all())
     
     async def get_by_status(self, status: TicketStatus) -> List[Ticket]:
         """Get all tickets by status"""
@@ -131,41 +571,147 @@ class TicketRepository(BaseRepository[Ticket]):
         self,
         user_id: int,
         skip: int = 0,
-        limit: int = 20
-    ) -> Tuple[List[Ticket], int]:
-        """Get tickets assigned to or created by a user"""
-        query = select(Ticket).options(
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Tuple[List[Ticket], Optional[int], Optional[str]]:
+        """
+        Get tickets assigned to or created by a user, newest first.
+        Returns (tickets, total, next_cursor); total is None unless include_total.
+        """
+        user_filter = or_(
+            Ticket.assigned_to == user_id,
+            Ticket.created_by == user_id
+        )
+        
+        use_window = include_total and not cursor
+        columns = [Ticket]
+        if use_window:
+            columns.append(func.count().over().label("total_count"))
+        query = select(*columns).options(
             selectinload(Ticket.created_by_user),
             selectinload(Ticket.assigned_to_user),
-        ).where(
-            or_(
-                Ticket.assigned_to == user_id,
-                Ticket.created_by == user_id
-            )
-        ).order_by(desc(Ticket.created_at))
+        ).where(user_filter)
+        query = apply_keyset(query, Ticket.created_at, Ticket.id, True, cursor, "created_at")
+        if not cursor:
+            query = query.offset(skip)
         
-        count_query = select(func.count()).select_from(Ticket).where(
-            or_(
-                Ticket.assigned_to == user_id,
-                Ticket.created_by == user_id
-            )
-        )
+        result = await self.db.execute(query.limit(limit + 1))
+        rows = result.all()
         
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
+        total = None
+        if include_total:
+            if use_window and rows:
+                total = rows[0].total_count
+            elif use_window and not skip:
+                total = 0
+            else:
+                total = await self.count_filtered([user_filter])
         
-        result = await self.db.execute(query.offset(skip).limit(limit))
-        tickets = list(result.scalars().all())
+        tickets, next_cursor = build_page(
+            [row[0] for row in rows],
+            limit,
+            "created_at",
+            key=lambda t: (t.created_at, t.id)
+        )
         
-        return tickets, total
+        return tickets, total, next_cursor
+    
+    async def get_summaries(self, ids: List[int]) -> List[Any]:
+        """The TicketSummary columns of several tickets (missing ones are left out)"""
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(
+                Ticket.id,
+                Ticket.ticket_id,
+                Ticket.title,
+                Ticket.status,
+                Ticket.priority,
+                Ticket.category,
+                Ticket.assigned_to,
+                Ticket.sla_due_date,
+                Ticket.resolved_at,
+                Ticket.updated_at
+            )
+            .where(Ticket.id.in_(ids))
+            .order_by(Ticket.id)
+        )
+        return list(result.all())
+    
+    async def get_change_horizon(self) -> datetime:
+        """
+        The time before which every ticket change is committed: now, or the
+        start of the oldest other open transaction. updated_at is the start
+        of the writing transaction, so a change still uncommitted here gets
+        an updated_at (and a deleted_at) at or after the horizon.
+        """
+        result = await self.db.execute(text("""
+            SELECT least(now(), min(xact_start))
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND backend_type = 'client backend'
+              AND pid <> pg_backend_pid()
+        """))
+        return result.scalar_one()
+    
+    async def get_changed(
+        self,
+        after: Optional[Tuple[datetime, int]],
+        before: datetime,
+        limit: int
+    ) -> List[Ticket]:
+        """
+        Tickets by (updated_at, id) after `after` (all without it) and
+        updated before `before`, with creator and assignee; an index range
+        scan on idx_ticket_updated_at_id
+        """
+        query = select(Ticket).options(
+            selectinload(Ticket.created_by_user),
+            selectinload(Ticket.assigned_to_user),
+        ).where(Ticket.updated_at < before)
+        if after:
+            query = query.where(tuple_(Ticket.updated_at, Ticket.id) > tuple_(*after))
+        result = await self.db.execute(
+            query.order_by(Ticket.updated_at, Ticket.id).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_deleted_ids(self, after: Tuple[datetime, int], until: Tuple[datetime, int]) -> List[int]:
+        """Ids of the tickets deleted after `after` up to `until`, by (deleted_at, id)"""
+        position = tuple_(TicketTombstone.deleted_at, TicketTombstone.id)
+        result = await self.db.execute(
+            select(TicketTombstone.id)
+            .where(position > tuple_(*after), position <= tuple_(*until))
+            .order_by(TicketTombstone.deleted_at, TicketTombstone.id)
+        )
+        return list(result.scalars().all())
+    
+    async def get_changes_reset_at(self) -> Optional[datetime]:
+        """When tickets were last imported or truncated (change cursors from before are reset)"""
+        result = await self.db.execute(
+            select(SystemSetting.updated_at).where(SystemSetting.key == TICKET_CHANGES_RESET_SETTING)
+        )
+        return result.scalar_one_or_none()
+    
+    async def mark_changes_reset(self) -> None:
+        """Reset the change cursors issued before now (tickets written with past updated_at values)"""
+        await self.db.execute(text(MARK_TICKET_CHANGES_RESET))
+    
+    async def prune_tombstones(self, before: datetime) -> int:
+        """Forget the tickets deleted before `before`; returns how many"""
+        result = await self.db.execute(
+            delete(TicketTombstone).where(TicketTombstone.deleted_at < before)
+        )
+        return result.rowcount
     
     async def get_recent_tickets(self, limit: int = 10) -> List[Ticket]:
-        """Get most recent tickets"""
+        """Get most recent tickets (with creator and assignee, one query)"""
         result = await self.db.execute(
             select(Ticket)
             .options(
-                selectinload(Ticket.created_by_user),
-                selectinload(Ticket.assigned_to_user),
+                joinedload(Ticket.created_by_user),
+                joinedload(Ticket.assigned_to_user),
             )
             .order_by(desc(Ticket.created_at))
             .limit(limit)
@@ -184,6 +730,246 @@ class TicketRepository(BaseRepository[Ticket]):
             update_data["resolved_at"] = resolved_at
         return await self.update(ticket_id, update_data)
     
+    async def get_sla_metrics(self, since: datetime, today: datetime) -> Dict[str, int]:
+        """
+        SLA counts in one statement, each part an index range scan:
+        tickets resolved since `since` with an SLA due date and how many of
+        them were resolved by it, tickets resolved since `today`
+        (idx_ticket_resolved_at), and open tickets past their due date or
+        due within SLA_AT_RISK_HOURS (idx_ticket_open_sla_due).
+        """
+        now = func.now()
+        
+        def open_tickets_due(*conditions):
+            return (
+                select(func.count())
+                .select_from(Ticket)
+                .where(text(OPEN_TICKET_CONDITION), *conditions)
+                .scalar_subquery()
+            )
+        
+        resolved_with_sla = and_(Ticket.resolved_at >= since, Ticket.sla_due_date.is_not(None))
+        result = await self.db.execute(
+            select(
+                func.count().filter(resolved_with_sla).label("resolved"),
+                func.count().filter(resolved_with_sla, Ticket.resolved_at <= Ticket.sla_due_date).label("met"),
+                func.count().filter(Ticket.resolved_at >= today).label("resolved_today"),
+                open_tickets_due(Ticket.sla_due_date < now).label("breached"),
+                open_tickets_due(
+                    Ticket.sla_due_date >= now,
+                    Ticket.sla_due_date < now + timedelta(hours=settings.sla_at_risk_hours)
+                ).label("at_risk")
+            )
+            .where(Ticket.resolved_at >= min(since, today))
+        )
+        return dict(result.one()._mapping)
+    
+    async def get_user_summary(self, user_id: int) -> Dict[str, Any]:
+        """
+        Breakdown of the tickets assigned to or created by a user, in one
+        query: counts by status, priority, category and (open tickets only)
+        age bucket, the total, and resolution time stats (hours) of the
+        resolved ones, via GROUP BY GROUPING SETS.
+        """
+        age = func.now() - Ticket.created_at
+        tickets = (
+            select(
+                Ticket.status,
+                Ticket.priority,
+                Ticket.category,
+                Ticket.resolution_time,
+                case((
+                    text(OPEN_TICKET_CONDITION),
+                    case(
+                        *((age < timedelta(days=days), label) for label, days in OPEN_AGE_BUCKETS[:-1]),
+                        else_=OPEN_AGE_BUCKETS[-1][0]
+                    )
+                )).label("age_bucket")
+            )
+            .where(or_(Ticket.assigned_to == user_id, Ticket.created_by == user_id))
+            .subquery()
+        )
+        groupings = (tickets.c.status, tickets.c.priority, tickets.c.category, tickets.c.age_bucket)
+        
+        result = await self.db.execute(
+            select(
+                *groupings,
+                func.grouping(*groupings).label("grouping"),
+                func.count().label("count"),
+                func.count(tickets.c.resolution_time).label("resolved"),
+                func.avg(tickets.c.resolution_time).label("avg_minutes"),
+                func.percentile_cont(0.5).within_group(tickets.c.resolution_time).label("median_minutes"),
+                func.max(tickets.c.resolution_time).label("max_minutes")
+            )
+            .group_by(func.grouping_sets(*groupings, tuple_()))
+        )
+        
+        summary = {"status": {}, "priority": {}, "category": {}, "age": {label: 0 for label, _ in OPEN_AGE_BUCKETS}}
+        summary.update(total=0, resolved=0, avg_resolution_time=None, median_resolution_time=None, max_resolution_time=None)
+        # grouping() has one bit per grouped column (status first), set when the column is not grouped
+        for row in result.all():
+            if row.grouping == 0b0111:
+                summary["status"][row.status.value] = row.count
+            elif row.grouping == 0b1011:
+                summary["priority"][row.priority.value] = row.count
+            elif row.grouping == 0b1101:
+                summary["category"][row.category.value] = row.count
+            elif row.grouping == 0b1110:
+                # The NULL bucket holds the resolved and closed tickets
+                if row.age_bucket is not None:
+                    summary["age"][row.age_bucket] = row.count
+            else:
+                summary["total"] = row.count
+                summary["resolved"] = row.resolved
+                for stat in ("avg", "median", "max"):
+                    minutes = getattr(row, f"{stat}_minutes")
+                    summary[f"{stat}_resolution_time"] = round(float(minutes) / 60, 2) if minutes is not None else None
+        return summary
+    
+    async def get_event_counts(
+        self,
+        event: str,
+        start: Optional[datetime],
+        end: datetime,
+        unit: Optional[str] = None,
+        group_by: Optional[str] = None
+    ) -> List[Tuple[Any, Any, int]]:
+        """
+        Ticket events in [start, end) per UTC hour or day (unit, or None for
+        the whole range) and group_by column: "created" by created_at,
+        "resolved" by resolved_at, "breaches" by sla_due_date for tickets not
+        resolved by it (past due dates only). Each is a range scan of an
+        index on that column. Returns (period, group value, count) rows.
+        """
+        column = {"created": Ticket.created_at, "resolved": Ticket.resolved_at, "breaches": Ticket.sla_due_date}[event]
+        conditions = [column < end]
+        if start is not None:
+            conditions.append(column >= start)
+        if event == "resolved":
+            conditions.append(Ticket.resolution_time.is_not(None))
+        elif event == "breaches":
+            # Parenthesized: text() is not grouped inside AND
+            conditions += [text(f"({SLA_MISSED_CONDITION})"), column < func.now()]
+        
+        utc = func.timezone("UTC", column)
+        period = {"hour": func.date_trunc("hour", utc), "day": cast(utc, Date), None: None}[unit]
+        key = getattr(Ticket, TIMESERIES_GROUP_COLUMNS[group_by]) if group_by else None
+        groups = [c for c in (period, key) if c is not None]
+        result = await self.db.execute(
+            select(
+                period if period is not None else literal_column("NULL"),
+                key if key is not None else literal_column("NULL"),
+                func.count()
+            )
+            .where(*conditions)
+            .group_by(*groups)
+        )
+        return [tuple(row) for row in result.all()]
+    
+    async def get_openings(self, after_id: int, limit: int) -> List[Tuple[int, TicketCategory, TicketPriority, Any, Any]]:
+        """
+        The next limit tickets by id after after_id, for replaying the
+        backlog: (id, category, priority, UTC day created, UTC day closed)
+        rows. The day closed is only set for closed tickets without
+        STATUS_CHANGE logs (e.g. imported ones, at resolved_at or else
+        updated_at); the logs of the others say when they closed.
+        """
+        status_logged = select(TicketLog.id).where(
+            TicketLog.ticket_id == Ticket.id,
+            TicketLog.log_type == LogType.STATUS_CHANGE
+        ).exists()
+        closed_at = func.coalesce(Ticket.resolved_at, Ticket.updated_at)
+        result = await self.db.execute(
+            select(
+                Ticket.id,
+                Ticket.category,
+                Ticket.priority,
+                cast(func.timezone("UTC", Ticket.created_at), Date),
+                case(
+                    (
+                        and_(Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]), ~status_logged),
+                        cast(func.timezone("UTC", closed_at), Date)
+                    ),
+                    else_=None
+                )
+            )
+            .where(Ticket.id > after_id)
+            .order_by(Ticket.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
+    
+    async def get_dimensions(
+        self,
+        after_id: int = 0,
+        limit: int = 50000,
+        ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, TicketStatus, TicketPriority, TicketCategory, Optional[int], int, Optional[int]]]:
+        """
+        The dimension columns of the next limit tickets by id after after_id
+        (or of the tickets in ids; missing ones are left out), for the
+        in-memory ticket mirror: (id, status, priority, category,
+        assigned_to, created_at, resolved_at), with the timestamps in
+        microseconds since the epoch.
+        """
+        def epoch_us(column):
+            return cast(func.floor(extract("epoch", column) * 1000000), BigInteger)
+        
+        query = select(
+            Ticket.id,
+            Ticket.status,
+            Ticket.priority,
+            Ticket.category,
+            Ticket.assigned_to,
+            epoch_us(Ticket.created_at),
+            epoch_us(Ticket.resolved_at)
+        )
+        if ids is not None:
+            query = query.where(Ticket.id.in_(ids))
+        else:
+            query = query.where(Ticket.id > after_id).limit(limit)
+        result = await self.db.execute(query.order_by(Ticket.id))
+        return [tuple(row) for row in result.all()]
+    
+    async def get_dimension_counts(
+        self,
+        status: Optional[List[TicketStatus]] = None,
+        priority: Optional[List[TicketPriority]] = None,
+        category: Optional[List[TicketCategory]] = None,
+        assigned_to: Optional[List[int]] = None,
+        assigned: Optional[bool] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        resolved_after: Optional[datetime] = None,
+        resolved_before: Optional[datetime] = None
+    ) -> List[Tuple[TicketStatus, TicketPriority, TicketCategory, int]]:
+        """Count the tickets matching every given filter per (status, priority, category)"""
+        filters = []
+        if status:
+            filters.append(Ticket.status.in_(status))
+        if priority:
+            filters.append(Ticket.priority.in_(priority))
+        if category:
+            filters.append(Ticket.category.in_(category))
+        if assigned_to:
+            filters.append(Ticket.assigned_to.in_(assigned_to))
+        if assigned is not None:
+            filters.append(Ticket.assigned_to.isnot(None) if assigned else Ticket.assigned_to.is_(None))
+        if created_after:
+            filters.append(Ticket.created_at >= created_after)
+        if created_before:
+            filters.append(Ticket.created_at < created_before)
+        if resolved_after:
+            filters.append(Ticket.resolved_at >= resolved_after)
+        if resolved_before:
+            filters.append(Ticket.resolved_at < resolved_before)
+        result = await self.db.execute(
+            select(Ticket.status, Ticket.priority, Ticket.category, func.count())
+            .where(*filters)
+            .group_by(Ticket.status, Ticket.priority, Ticket.category)
+        )
+        return [tuple(row) for row in result.all()]
+    
     async def get_status_counts(self) -> dict:
         """Get count of tickets by status"""
         result = await self.db.execute(
@@ -238,15 +1024,44 @@ class TicketLogRepository(BaseRepository[TicketLog]):
     def __init__(self, db: AsyncSession):
         super().__init__(TicketLog, db)
     
-    async def get_ticket_logs(self, ticket_id: int) -> List[TicketLog]:
-        """Get all logs for a ticket"""
-        result = await self.db.execute(
+    async def get_ticket_logs(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[TicketLog], Optional[str]]:
+        """Get one page of a ticket's logs, newest first. Returns (logs, next_cursor)"""
+        query = apply_keyset(
             select(TicketLog)
-            .options(selectinload(TicketLog.user))
-            .where(TicketLog.ticket_id == ticket_id)
-            .order_by(desc(TicketLog.created_at))
+            .options(joinedload(TicketLog.user))
+            .where(TicketLog.ticket_id == ticket_id),
+            TicketLog.created_at, TicketLog.id, True, cursor, "created_at"
         )
-        return list(result.scalars().all())
+        result = await self.db.execute(query.limit(limit + 1))
+        return build_page(
+            result.scalars().all(),
+            limit,
+            "created_at",
+            key=lambda log: (log.created_at, log.id)
+        )
+    
+    async def get_status_changes(self, after_id: int, limit: int) -> List[Tuple[int, int, Any, Optional[str]]]:
+        """
+        The next limit STATUS_CHANGE logs by id after after_id, for replaying
+        the backlog: (id, ticket id, UTC day, new status label) rows.
+        """
+        result = await self.db.execute(
+            select(
+                TicketLog.id,
+                TicketLog.ticket_id,
+                cast(func.timezone("UTC", TicketLog.created_at), Date),
+                TicketLog.new_value
+            )
+            .where(TicketLog.id > after_id, TicketLog.log_type == LogType.STATUS_CHANGE)
+            .order_by(TicketLog.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
 
 
 class TicketCommentRepository(BaseRepository[TicketComment]):
@@ -258,19 +1073,26 @@ class TicketCommentRepository(BaseRepository[TicketComment]):
     async def get_ticket_comments(
         self,
         ticket_id: int,
-        include_internal: bool = False
-    ) -> List[TicketComment]:
-        """Get all comments for a ticket"""
+        include_internal: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[TicketComment], Optional[str]]:
+        """Get one page of a ticket's comments, oldest first. Returns (comments, next_cursor)"""
         query = select(TicketComment).options(
-            selectinload(TicketComment.author)
+            joinedload(TicketComment.author)
         ).where(TicketComment.ticket_id == ticket_id)
         
         if not include_internal:
             query = query.where(TicketComment.is_internal == False)
         
-        query = query.order_by(TicketComment.created_at)
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        query = apply_keyset(query, TicketComment.created_at, TicketComment.id, False, cursor, "created_at")
+        result = await self.db.execute(query.limit(limit + 1))
+        return build_page(
+            result.scalars().all(),
+            limit,
+            "created_at",
+            key=lambda comment: (comment.created_at, comment.id)
+        )
 
 
 class AttachmentRepository(BaseRepository[Attachment]):
@@ -279,11 +1101,21 @@ class AttachmentRepository(BaseRepository[Attachment]):
     def __init__(self, db: AsyncSession):
         super().__init__(Attachment, db)
     
-    async def get_ticket_attachments(self, ticket_id: int) -> List[Attachment]:
-        """Get all attachments for a ticket"""
-        result = await self.db.execute(
-            select(Attachment)
-            .where(Attachment.ticket_id == ticket_id)
-            .order_by(Attachment.created_at)
+    async def get_ticket_attachments(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Attachment], Optional[str]]:
+        """Get one page of a ticket's attachments, oldest first. Returns (attachments, next_cursor)"""
+        query = apply_keyset(
+            select(Attachment).where(Attachment.ticket_id == ticket_id),
+            Attachment.created_at, Attachment.id, False, cursor, "created_at"
+        )
+        result = await self.db.execute(query.limit(limit + 1))
+        return build_page(
+            result.scalars().all(),
+            limit,
+            "created_at",
+            key=lambda attachment: (attachment.created_at, attachment.id)
         )
-        return list(result.scalars().all())
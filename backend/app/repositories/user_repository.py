@@ -2,12 +2,19 @@
 # USER REPOSITORY - Database Operations for Users
 # ============================================
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_, union_all
 from datetime import datetime
 
 from app.repositories.base_repository import BaseRepository
+from app.repositories.fuzzy import (
+    fuzzy_match,
+    word_distance,
+    nearest,
+    merge_nearest,
+    set_similarity_threshold
+)
 from app.models import User
 
 
@@ -31,6 +38,21 @@ class UserRepository(BaseRepository[User]):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_ids(self, ids: Iterable[Optional[int]]) -> Dict[int, User]:
+        """Get several users in one query, keyed by ID (None IDs are skipped)"""
+        ids = {id for id in ids if id is not None}
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(User).where(User.id.in_(ids))
+        )
+        return {user.id: user for user in result.scalars().all()}
+    
+    async def get_ids_by_email(self) -> Dict[str, int]:
+        """Map of lower-cased email to user ID for all users (bulk imports)"""
+        result = await self.db.execute(select(User.email, User.id))
+        return {email.lower(): id for email, id in result.all()}
+    
     async def get_admins(self) -> List[User]:
         """Get all admin users"""
         result = await self.db.execute(
@@ -110,17 +132,38 @@ class UserRepository(BaseRepository[User]):
         skip: int = 0,
         limit: int = 20
     ) -> List[User]:
-        """Search users by name or email"""
-        search_term = f"%{query.lower()}%"
+        """
+        Search users by name or email.
+        Matches substrings and misspellings (pg_trgm), closest matches first.
+        """
+        await set_similarity_threshold(self.db)
+        distance = func.least(word_distance(query, User.name), word_distance(query, User.email))
         result = await self.db.execute(
             select(User)
-            .where(
-                (func.lower(User.name).like(search_term)) |
-                (func.lower(User.email).like(search_term))
-            )
+            .where(or_(fuzzy_match(User.name, query), fuzzy_match(User.email, query)))
             .where(User.is_active == True)
-            .order_by(User.name)
+            .order_by(distance, User.name, User.id)
             .offset(skip)
             .limit(limit)
         )
         return list(result.scalars().all())
+    
+    async def suggest(self, query: str, limit: int = 5) -> list:
+        """
+        Autocomplete: the limit active users whose name or email is closest to
+        query. Each column is read in distance order from its trigram index.
+        Returns rows of (id, name, email, avatar_url, distance).
+        """
+        await set_similarity_threshold(self.db)
+        branches = [
+            nearest(
+                select(
+                    User.id, User.name, User.email, User.avatar_url,
+                    word_distance(query, column).label("distance")
+                ).where(User.is_active == True),
+                column, query, limit
+            )
+            for column in (User.name, User.email)
+        ]
+        result = await self.db.execute(union_all(*branches))
+        return merge_nearest(result.all(), limit)
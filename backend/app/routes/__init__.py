@@ -6,6 +6,8 @@ from app.routes.user_routes import router as user_router
 from app.routes.admin_routes import router as admin_router
 from app.routes.analytics_routes import router as analytics_router
 from app.routes.email_routes import router as email_router
+from app.routes.search_routes import router as search_router
+from app.routes.stream_routes import router as stream_router
 
 
 def register_routes(app):
@@ -18,6 +20,8 @@ def register_routes(app):
     api_router.include_router(admin_router)
     api_router.include_router(analytics_router)
     api_router.include_router(email_router)
+    api_router.include_router(search_router)
+    api_router.include_router(stream_router)
     
     app.include_router(api_router)
 
@@ -29,5 +33,7 @@ __all__ = [
     "user_router",
     "admin_router",
     "analytics_router",
-    "email_router"
+    "email_router",
+    "search_router",
+    "stream_router"
 ]
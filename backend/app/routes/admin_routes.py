@@ -2,8 +2,8 @@
 # ADMIN ROUTES - Admin Endpoints
 # ============================================
 
-from typing import List
-from fastapi import APIRouter, Depends, Query, Request
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Path, Query, Request, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -15,7 +15,9 @@ from app.schemas import (
     AdminActionRequest,
     AdminAuditLogResponse,
     CurrentUser,
-    MessageResponse
+    MessageResponse,
+    ImportJobResponse,
+    SnapshotManifestResponse
 )
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -91,16 +93,22 @@ async def get_admin_stats(
 
 @router.get("/audit-logs", response_model=List[AdminAuditLogResponse])
 async def get_audit_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; overrides skip"),
     current_user: CurrentUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get admin audit logs.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
     controller = AdminController(db)
-    return await controller.get_audit_logs(current_user, skip, limit)
+    logs, next_cursor = await controller.get_audit_logs(current_user, skip, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
 
 
 @router.post("/users/{user_id}/deactivate", response_model=MessageResponse)
@@ -131,3 +139,73 @@ async def reactivate_user(
     ip_address = request.client.host if request.client else None
     controller = AdminController(db)
     return await controller.reactivate_user(current_user, user_id, ip_address)
+
+
+@router.post("/import/{kind}", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_import(
+    kind: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$", description="Defaults to the file extension"),
+    current_user: CurrentUser = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import tickets, ticket logs or comments from a CSV or JSON Lines file.
+    kind is tickets, logs or comments. The import runs in the background;
+    poll GET /admin/import/{job_id} for progress and failed rows.
+    """
+    controller = AdminController(db)
+    return await controller.start_import(current_user, kind, file, format)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the progress of an import (rows read, imported and failed).
+    """
+    controller = AdminController(db)
+    return await controller.get_import_job(current_user, job_id)
+
+
+@router.get("/snapshots", response_model=SnapshotManifestResponse)
+async def get_snapshot(
+    current_user: CurrentUser = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the Parquet files of the latest analytics snapshot (tickets, ticket
+    logs, email classifications), one per table and month.
+    """
+    controller = AdminController(db)
+    return await controller.get_snapshot(current_user)
+
+
+@router.post("/snapshots", response_model=SnapshotManifestResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_snapshot(
+    full: bool = Query(False, description="Rewrite every month, not only the changed ones"),
+    current_user: CurrentUser = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Write the analytics snapshot now, in the background.
+    """
+    controller = AdminController(db)
+    return await controller.start_snapshot(current_user, full)
+
+
+@router.get("/snapshots/{table}/{month}")
+async def download_snapshot(
+    table: str,
+    month: str = Path(..., pattern=r"^\d{4}-\d{2}$", description="YYYY-MM"),
+    current_user: CurrentUser = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Download one month of a snapshot table as a Parquet file.
+    """
+    controller = AdminController(db)
+    return await controller.download_snapshot(current_user, table, month)
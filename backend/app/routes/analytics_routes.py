@@ -2,6 +2,8 @@
 # ANALYTICS ROUTES - Analytics Endpoints
 # ============================================
 
+from datetime import date, datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,6 +13,13 @@ from app.middleware import get_current_user
 from app.schemas import (
     AnalyticsResponse,
     DashboardStats,
+    TimeSeriesResponse,
+    PivotResponse,
+    TicketCountFilters,
+    TicketCountsResponse,
+    TicketStatusEnum,
+    TicketPriorityEnum,
+    TicketCategoryEnum,
     CurrentUser
 )
 
@@ -64,3 +73,101 @@ async def get_category_summary(
     """
     controller = AnalyticsController(db)
     return await controller.get_category_summary()
+
+
+@router.get("/timeseries", response_model=TimeSeriesResponse)
+async def get_timeseries(
+    metric: str = Query(..., pattern="^(created|resolved|backlog|breaches)$"),
+    granularity: str = Query("day", pattern="^(hour|day|week|month)$"),
+    group_by: Optional[str] = Query(None, pattern="^(category|priority|assignee)$"),
+    start: Optional[datetime] = Query(None, description="Defaults to 48 hours, 30 days, 26 weeks or 12 months before end"),
+    end: Optional[datetime] = Query(None, description="Defaults to now"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get tickets created, resolved, SLA breaches or the backlog per hour, day,
+    week or month (UTC), optionally per category, priority or assignee.
+    Columnar: one timestamps array (bucket starts) and one array of values
+    per group, with zeros for empty buckets.
+    """
+    controller = AnalyticsController(db)
+    return await controller.get_timeseries(metric, granularity, group_by, start, end)
+
+
+@router.get("/backlog-history", response_model=TimeSeriesResponse)
+async def get_backlog_history(
+    group_by: Optional[str] = Query(None, pattern="^(category|priority)$"),
+    start: Optional[date] = Query(None, description="Defaults to 89 days before end"),
+    end: Optional[date] = Query(None, description="Defaults to today (UTC)"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the number of open tickets (not Resolved or Closed) at the end of each
+    UTC day, optionally per category or priority, replayed from ticket
+    creation and the status change logs. Same columnar shape as /timeseries.
+    """
+    controller = AnalyticsController(db)
+    return await controller.get_backlog_history(group_by, start, end)
+
+
+@router.get("/counts", response_model=TicketCountsResponse)
+async def get_ticket_counts(
+    status: List[TicketStatusEnum] = Query([]),
+    priority: List[TicketPriorityEnum] = Query([]),
+    category: List[TicketCategoryEnum] = Query([]),
+    assigned_to: List[int] = Query([]),
+    assigned: Optional[bool] = Query(None, description="true: has an assignee, false: unassigned"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    resolved_after: Optional[datetime] = None,
+    resolved_before: Optional[datetime] = None,
+    engine: str = Query("memory", pattern="^(memory|sql)$", description="sql to compare with a PostgreSQL count"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Count the tickets matching the filters, in total and per status,
+    priority and category. Repeat a list filter to match any of its values
+    (status=Open&status=In Progress). Counted in memory by the ticket
+    mirror (engine=memory, the default) or by PostgreSQL (engine=sql, also
+    used until the mirror is loaded).
+    """
+    filters = TicketCountFilters(
+        status=status,
+        priority=priority,
+        category=category,
+        assigned_to=assigned_to,
+        assigned=assigned,
+        created_after=created_after,
+        created_before=created_before,
+        resolved_after=resolved_after,
+        resolved_before=resolved_before
+    )
+    controller = AnalyticsController(db)
+    return await controller.get_ticket_counts(filters, engine)
+
+
+@router.get("/pivot", response_model=PivotResponse)
+async def get_pivot(
+    rows: str = Query(..., pattern="^(status|priority|category|assignee|creator|day|week|month)$"),
+    cols: Optional[str] = Query(None, pattern="^(status|priority|category|assignee|creator|day|week|month)$"),
+    measure: str = Query(
+        "count",
+        pattern="^(count|open|resolved|avg_resolution_hours|median_resolution_hours|p90_resolution_hours)$"
+    ),
+    start: Optional[date] = Query(None, description="First creation day (UTC); defaults to all"),
+    end: Optional[date] = Query(None, description="Last creation day (UTC); defaults to all"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a measure of the tickets per rows value and cols value (e.g.
+    category x week), computed from the latest analytics snapshot rather
+    than the live tickets (see snapshot_taken_at). Rows and cols are keyed
+    by label, user id or day; values[i][j] is the cell of row_keys[i] and
+    col_keys[j].
+    """
+    controller = AnalyticsController(db)
+    return await controller.get_pivot(rows, cols, measure, start, end)
@@ -3,7 +3,8 @@
 # ============================================
 # Uses Microsoft Graph API with SSO token - no IMAP/password needed
 
-from fastapi import APIRouter, Depends, Query, Header
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -94,13 +95,21 @@ async def reprocess_email(
 @router.get("/by-category/{category}")
 async def get_emails_by_category(
     category: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; overrides skip"),
     current_user: CurrentUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get emails by detected SAP category (admin only).
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
     controller = EmailController(db)
-    return await controller.get_emails_by_category(current_user, category, skip, limit)
+    emails, next_cursor = await controller.get_emails_by_category(
+        current_user, category, skip, limit, cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return emails
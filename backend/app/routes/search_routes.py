@@ -0,0 +1,28 @@
+# ============================================
+# SEARCH ROUTES - Search Endpoints
+# ============================================
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.controllers import SearchController
+from app.middleware import get_current_user
+from app.schemas import SearchSuggestResponse, CurrentUser
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/suggest", response_model=SearchSuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(5, ge=1, le=20),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Autocomplete: closest tickets (by ticket id or title) and users (by name
+    or email) for a partial, possibly misspelled query.
+    """
+    controller = SearchController(db)
+    return await controller.suggest(q, limit)
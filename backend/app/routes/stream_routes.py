@@ -0,0 +1,33 @@
+# ============================================
+# STREAM ROUTES - Server-Sent Event Endpoints
+# ============================================
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
+
+from app.controllers import StreamController
+from app.middleware import get_stream_user
+from app.schemas import CurrentUser
+
+router = APIRouter(prefix="/stream", tags=["Stream"])
+
+
+@router.get("/dashboard")
+async def stream_dashboard(
+    last_event_id: Optional[str] = Header(None, description="id of the last event received, sent when reconnecting"),
+    current_user: CurrentUser = Depends(get_stream_user)
+):
+    """
+    Live dashboard updates (Server-Sent Events), instead of polling. The
+    stream starts with a `snapshot` event (all dashboard counters) and then
+    sends a `delta` event after ticket writes: the created or updated
+    tickets, the deleted ticket ids and the counters that changed. A client
+    reconnecting with Last-Event-ID gets the deltas it missed, or a new
+    snapshot if they are no longer available (reload ticket lists then).
+    Comment lines are sent every STREAM_HEARTBEAT_SECONDS when idle.
+    The token is only accepted in the Authorization header, which the
+    browser's EventSource cannot send: use a fetch-based SSE client, which
+    must reconnect and send Last-Event-ID itself.
+    """
+    controller = StreamController()
+    return await controller.stream_dashboard(last_event_id)
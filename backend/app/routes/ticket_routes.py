@@ -3,22 +3,28 @@
 # ============================================
 
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.controllers import TicketController
-from app.middleware import get_current_user
+from app.middleware import get_current_user, get_stream_user
 from app.schemas import (
     TicketCreate,
     TicketUpdate,
+    TicketBulkUpdate,
+    TicketBulkResponse,
     TicketResponse,
     TicketDetailResponse,
     TicketListResponse,
-    TicketLogResponse,
+    TicketChangesResponse,
+    TicketLogPage,
     TicketCommentCreate,
     TicketCommentUpdate,
     TicketCommentResponse,
+    TicketCommentPage,
+    AttachmentPage,
+    TicketTimelinePage,
     CurrentUser,
     MessageResponse
 )
@@ -29,14 +35,18 @@ router = APIRouter(prefix="/tickets", tags=["Tickets"])
 @router.post("", response_model=TicketResponse)
 async def create_ticket(
     ticket_data: TicketCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=64),
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new ticket.
+    If the database is unreachable the ticket is spooled and stored once it
+    is back; the response then has id 0 and a PENDING-... ticket_id. Send an
+    Idempotency-Key header to make retries of a spooled ticket safe.
     """
     controller = TicketController(db)
-    return await controller.create_ticket(ticket_data, current_user)
+    return await controller.create_ticket(ticket_data, current_user, idempotency_key)
 
 
 @router.get("", response_model=TicketListResponse)
@@ -48,14 +58,21 @@ async def get_tickets(
     category: Optional[str] = None,
     assigned_to: Optional[int] = None,
     created_by: Optional[int] = None,
-    search: Optional[str] = None,
-    order_by: str = "created_at",
+    search: Optional[str] = Query(None, description='Full-text search, e.g. goods receipt -invoice or "posting period"'),
+    order_by: str = Query("created_at", description="Column to sort by, or relevance when searching"),
     order_desc: bool = True,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    include_total: bool = Query(False, description="Also return total/pages"),
+    count_mode: str = Query("exact", pattern="^(exact|estimated)$"),
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get paginated list of tickets with filters.
+    Use skip/limit for page numbers, or cursor/limit (keyset pagination) for
+    constant-time deep pages and infinite scroll.
+    total is only computed with include_total=true; count_mode=estimated
+    returns a planner estimate for large result sets instead of counting.
     """
     controller = TicketController(db)
     return await controller.get_tickets(
@@ -68,7 +85,10 @@ async def get_tickets(
         created_by=created_by,
         search=search,
         order_by=order_by,
-        order_desc=order_desc
+        order_desc=order_desc,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode
     )
 
 
@@ -89,6 +109,8 @@ async def get_recent_tickets(
 async def get_my_tickets(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    include_total: bool = Query(False, description="Also return total/pages"),
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -96,12 +118,66 @@ async def get_my_tickets(
     Get tickets assigned to or created by current user.
     """
     controller = TicketController(db)
-    return await controller.get_my_tickets(current_user, skip, limit)
+    return await controller.get_my_tickets(current_user, skip, limit, cursor, include_total)
+
+
+@router.get("/changes", response_model=TicketChangesResponse)
+async def get_ticket_changes(
+    since: Optional[str] = Query(None, description="next_cursor of the previous call; omit to load all tickets"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get tickets created, updated or deleted since a cursor, to keep a local
+    copy of the ticket list current without reloading it.
+    Start without since and follow next_cursor (at once while has_more);
+    later calls return only the changes. With reset=true the cursor is too
+    old: reload by starting again without since.
+    """
+    controller = TicketController(db)
+    return await controller.get_changes(since, limit)
+
+
+@router.get("/export")
+async def export_tickets(
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    category: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+    created_by: Optional[int] = None,
+    search: Optional[str] = Query(None, description="Full-text search, same syntax as the ticket list"),
+    order_by: str = Query("created_at", description="Column to sort by, or relevance when searching"),
+    order_desc: bool = True,
+    current_user: CurrentUser = Depends(get_stream_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Download every ticket matching the ticket list filters as CSV or XLSX.
+    Rows are streamed from a server-side cursor, so any number of tickets
+    can be exported with constant memory. The export reads through a
+    session of its own; the user is looked up without holding a connection
+    while the file streams.
+    """
+    controller = TicketController(db)
+    return await controller.export_tickets(
+        format=format,
+        status=status,
+        priority=priority,
+        category=category,
+        assigned_to=assigned_to,
+        created_by=created_by,
+        search=search,
+        order_by=order_by,
+        order_desc=order_desc
+    )
 
 
 @router.get("/by-ticket-id/{ticket_id}", response_model=TicketDetailResponse)
 async def get_ticket_by_ticket_id(
     ticket_id: str,
+    section_limit: int = Query(20, ge=1, le=100, description="Logs, comments and attachments to include"),
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -109,20 +185,22 @@ async def get_ticket_by_ticket_id(
     Get ticket by ticket_id (e.g., T-001).
     """
     controller = TicketController(db)
-    return await controller.get_ticket_by_ticket_id(ticket_id)
+    return await controller.get_ticket_by_ticket_id(ticket_id, section_limit)
 
 
 @router.get("/{ticket_id}", response_model=TicketDetailResponse)
 async def get_ticket(
     ticket_id: int,
+    section_limit: int = Query(20, ge=1, le=100, description="Logs, comments and attachments to include"),
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get ticket by ID with full details.
+    Get ticket by ID with the first section_limit logs, comments and
+    attachments, the total of each section, and cursors for the rest.
     """
     controller = TicketController(db)
-    return await controller.get_ticket(ticket_id)
+    return await controller.get_ticket(ticket_id, section_limit)
 
 
 @router.patch("/{ticket_id}", response_model=TicketResponse)
@@ -139,6 +217,21 @@ async def update_ticket(
     return await controller.update_ticket(ticket_id, update_data, current_user)
 
 
+@router.post("/bulk", response_model=TicketBulkResponse)
+async def bulk_update_tickets(
+    update_data: TicketBulkUpdate,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Set the same status, priority and/or assignee on up to 500 tickets in
+    one transaction. Returns a result per ticket; unknown IDs are reported
+    as failed without affecting the others.
+    """
+    controller = TicketController(db)
+    return await controller.bulk_update(update_data, current_user)
+
+
 @router.delete("/{ticket_id}", response_model=MessageResponse)
 async def delete_ticket(
     ticket_id: int,
@@ -156,23 +249,62 @@ async def delete_ticket(
 # Ticket Logs
 # ============================================
 
-@router.get("/{ticket_id}/logs", response_model=List[TicketLogResponse])
+@router.get("/{ticket_id}/logs", response_model=TicketLogPage)
 async def get_ticket_logs(
     ticket_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get logs for a ticket, newest first, one cursor page at a time.
+    """
+    controller = TicketController(db)
+    return await controller.get_ticket_logs(ticket_id, limit, cursor)
+
+
+# ============================================
+# Ticket Timeline
+# ============================================
+
+@router.get("/{ticket_id}/timeline", response_model=TicketTimelinePage)
+async def get_ticket_timeline(
+    ticket_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    order_desc: bool = True,
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get logs for a ticket.
+    Get a ticket's logs, comments and attachments as one time-ordered
+    sequence (newest first unless order_desc=false), one cursor page at a time.
     """
     controller = TicketController(db)
-    return await controller.get_ticket_logs(ticket_id)
+    return await controller.get_ticket_timeline(ticket_id, limit, cursor, order_desc)
 
 
 # ============================================
 # Ticket Comments
 # ============================================
 
+@router.get("/{ticket_id}/comments", response_model=TicketCommentPage)
+async def get_ticket_comments(
+    ticket_id: int,
+    include_internal: bool = True,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get comments for a ticket, oldest first, one cursor page at a time.
+    """
+    controller = TicketController(db)
+    return await controller.get_ticket_comments(ticket_id, include_internal, limit, cursor)
+
+
 @router.post("/{ticket_id}/comments", response_model=TicketCommentResponse)
 async def add_comment(
     ticket_id: int,
@@ -212,3 +344,22 @@ async def delete_comment(
     """
     controller = TicketController(db)
     return await controller.delete_comment(comment_id, current_user)
+
+
+# ============================================
+# Ticket Attachments
+# ============================================
+
+@router.get("/{ticket_id}/attachments", response_model=AttachmentPage)
+async def get_ticket_attachments(
+    ticket_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get attachments of a ticket, oldest first, one cursor page at a time.
+    """
+    controller = TicketController(db)
+    return await controller.get_ticket_attachments(ticket_id, limit, cursor)
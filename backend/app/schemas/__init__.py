@@ -17,25 +17,36 @@ from app.schemas.schemas import (
     TicketBase,
     TicketCreate,
     TicketUpdate,
+    TicketBulkUpdate,
+    TicketBulkResult,
+    TicketBulkResponse,
     TicketResponse,
     TicketDetailResponse,
     TicketListResponse,
+    TicketChangesResponse,
+    TicketSuggestion,
+    SearchSuggestResponse,
     
     # Ticket Log
     TicketLogBase,
     TicketLogCreate,
     TicketLogResponse,
+    TicketLogPage,
     
     # Ticket Comment
     TicketCommentBase,
     TicketCommentCreate,
     TicketCommentUpdate,
     TicketCommentResponse,
+    TicketCommentPage,
     
     # Attachment
     AttachmentBase,
     AttachmentCreate,
     AttachmentResponse,
+    AttachmentPage,
+    TimelineItem,
+    TicketTimelinePage,
     
     # Email
     EmailSourceBase,
@@ -50,15 +61,30 @@ from app.schemas.schemas import (
     AdminUserResponse,
     AdminActionRequest,
     AdminAuditLogResponse,
+    ImportRowError,
+    ImportJobResponse,
+    SnapshotPartition,
+    SnapshotTableInfo,
+    SnapshotManifestResponse,
     
     # Analytics
     TicketStats,
     CategoryStats,
     PriorityStats,
     TrendDataPoint,
+    ResolutionPercentiles,
+    TimeSeriesResponse,
+    PivotResponse,
+    TicketCountFilters,
+    TicketCountsResponse,
     AnalyticsResponse,
+    DashboardCounters,
     DashboardStats,
     
+    # Dashboard stream
+    TicketSummary,
+    DashboardDelta,
+    
     # LLM
     EmailAnalysisResult,
     
@@ -81,19 +107,30 @@ __all__ = [
     "TicketBase",
     "TicketCreate",
     "TicketUpdate",
+    "TicketBulkUpdate",
+    "TicketBulkResult",
+    "TicketBulkResponse",
     "TicketResponse",
     "TicketDetailResponse",
     "TicketListResponse",
+    "TicketChangesResponse",
+    "TicketSuggestion",
+    "SearchSuggestResponse",
     "TicketLogBase",
     "TicketLogCreate",
     "TicketLogResponse",
+    "TicketLogPage",
     "TicketCommentBase",
     "TicketCommentCreate",
     "TicketCommentUpdate",
     "TicketCommentResponse",
+    "TicketCommentPage",
     "AttachmentBase",
     "AttachmentCreate",
     "AttachmentResponse",
+    "AttachmentPage",
+    "TimelineItem",
+    "TicketTimelinePage",
     "EmailSourceBase",
     "EmailSourceCreate",
     "EmailSourceResponse",
@@ -102,12 +139,25 @@ __all__ = [
     "AdminUserResponse",
     "AdminActionRequest",
     "AdminAuditLogResponse",
+    "ImportRowError",
+    "ImportJobResponse",
+    "SnapshotPartition",
+    "SnapshotTableInfo",
+    "SnapshotManifestResponse",
     "TicketStats",
     "CategoryStats",
     "PriorityStats",
     "TrendDataPoint",
+    "ResolutionPercentiles",
+    "TimeSeriesResponse",
+    "PivotResponse",
+    "TicketCountFilters",
+    "TicketCountsResponse",
     "AnalyticsResponse",
+    "DashboardCounters",
     "DashboardStats",
+    "TicketSummary",
+    "DashboardDelta",
     "EmailAnalysisResult",
     "MessageResponse",
     "ErrorResponse",
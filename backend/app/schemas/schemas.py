@@ -3,7 +3,7 @@
 # ============================================
 
 from datetime import datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict, Union
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from enum import Enum
 
@@ -227,21 +227,121 @@ class TicketResponse(TicketBase):
 
 
 class TicketDetailResponse(TicketResponse):
-    """Full ticket details including logs and comments"""
+    """
+    Ticket details with the first page of logs, comments and attachments.
+    *_total counts the whole section; *_next_cursor continues it on
+    /tickets/{id}/logs, /comments or /attachments.
+    """
     logs: List[TicketLogResponse] = []
     comments: List[TicketCommentResponse] = []
     attachments: List[AttachmentResponse] = []
+    logs_total: int = 0
+    comments_total: int = 0
+    attachments_total: int = 0
+    logs_next_cursor: Optional[str] = None
+    comments_next_cursor: Optional[str] = None
+    attachments_next_cursor: Optional[str] = None
+
+
+class TicketLogPage(BaseModel):
+    """One cursor page of a ticket's logs, newest first"""
+    items: List[TicketLogResponse]
+    next_cursor: Optional[str] = None
+
+
+class TicketCommentPage(BaseModel):
+    """One cursor page of a ticket's comments, oldest first"""
+    items: List[TicketCommentResponse]
+    next_cursor: Optional[str] = None
+
+
+class AttachmentPage(BaseModel):
+    """One cursor page of a ticket's attachments, oldest first"""
+    items: List[AttachmentResponse]
+    next_cursor: Optional[str] = None
+
+
+class TimelineItem(BaseModel):
+    """One entry of a ticket's merged activity; exactly one payload field is set"""
+    kind: str  # log, comment or attachment
+    created_at: datetime
+    log: Optional[TicketLogResponse] = None
+    comment: Optional[TicketCommentResponse] = None
+    attachment: Optional[AttachmentResponse] = None
+
+
+class TicketTimelinePage(BaseModel):
+    """One cursor page of a ticket's logs, comments and attachments in time order"""
+    items: List[TimelineItem]
+    next_cursor: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
 
 
+class TicketBulkUpdate(BaseModel):
+    """Same status, priority and/or assignee for several tickets"""
+    ticket_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: Optional[TicketStatusEnum] = None
+    priority: Optional[TicketPriorityEnum] = None
+    assigned_to: Optional[int] = None
+
+
+class TicketBulkResult(BaseModel):
+    """Outcome of a bulk update for one ticket"""
+    id: int
+    success: bool
+    changed: List[str] = []  # Fields whose value changed (empty if already up to date)
+    error: Optional[str] = None
+    ticket: Optional[TicketResponse] = None
+
+
+class TicketBulkResponse(BaseModel):
+    """Per-ticket results of a bulk update, in request order"""
+    updated: int  # Tickets with at least one changed field
+    failed: int
+    results: List[TicketBulkResult]
+
+
 class TicketListResponse(BaseModel):
     """Paginated ticket list"""
     items: List[TicketResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # Only computed when include_total=true
+    total_is_estimate: bool = False  # True when total comes from planner statistics
+    page: Optional[int] = None  # None when paginating with a cursor
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
+    highlights: Optional[Dict[int, str]] = None  # Ticket id -> description snippet with <mark> tags (search only)
+
+
+class TicketChangesResponse(BaseModel):
+    """
+    Tickets created, updated or deleted since a /tickets/changes cursor.
+    Upsert tickets by id, remove deleted, then ask again with next_cursor
+    (at once while has_more). reset: the cursor is too old, drop the local
+    copy and start over without since.
+    """
+    tickets: List[TicketResponse] = []
+    deleted: List[int] = []  # Ids of deleted tickets
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    reset: bool = False
+
+
+class TicketSuggestion(BaseModel):
+    """Autocomplete entry for a ticket"""
+    id: int
+    ticket_id: str
+    title: str
+    status: TicketStatusEnum
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SearchSuggestResponse(BaseModel):
+    """Closest tickets and users for an autocomplete query"""
+    tickets: List[TicketSuggestion]
+    users: List[UserBrief]
 
 
 # ============================================
@@ -327,6 +427,52 @@ class AdminAuditLogResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ImportRowError(BaseModel):
+    """A source row that was not imported"""
+    line: int
+    error: str
+
+
+class ImportJobResponse(BaseModel):
+    """Progress and outcome of a bulk import"""
+    id: str
+    kind: str  # tickets, logs or comments
+    format: str  # csv or jsonl
+    status: str = "running"  # running, completed or failed
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    errors: List[ImportRowError] = []  # First rows that failed, by line number
+    error: Optional[str] = None  # Why the import stopped (status=failed)
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    rows_per_second: Optional[float] = None
+
+
+class SnapshotPartition(BaseModel):
+    """One month of a table in the analytics snapshot"""
+    month: str  # YYYY-MM
+    rows: int
+    bytes: int
+    written_at: datetime
+    path: str  # Download path of the Parquet file
+
+
+class SnapshotTableInfo(BaseModel):
+    name: str
+    rows: int
+    partitions: List[SnapshotPartition] = []
+
+
+class SnapshotManifestResponse(BaseModel):
+    """The Parquet files of the latest analytics snapshot"""
+    taken_at: Optional[datetime] = None  # Rows changed before this are in the snapshot
+    full_at: Optional[datetime] = None  # When every month was last rewritten
+    running: bool = False
+    last_run_ms: Optional[float] = None
+    tables: List[SnapshotTableInfo] = []
+
+
 # ============================================
 # Analytics Schemas
 # ============================================
@@ -357,25 +503,119 @@ class TrendDataPoint(BaseModel):
     count: int
 
 
+class ResolutionPercentiles(BaseModel):
+    count: int  # Tickets resolved in the period
+    p50: Optional[float] = None  # in hours, within RESOLUTION_SKETCH_ACCURACY
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
+
 class AnalyticsResponse(BaseModel):
     ticket_stats: TicketStats
     category_breakdown: List[CategoryStats]
     priority_breakdown: List[PriorityStats]
     daily_trends: List[TrendDataPoint]
     avg_resolution_time: Optional[float] = None  # in hours
-    sla_compliance_rate: Optional[float] = None
+    sla_compliance_rate: Optional[float] = None  # % of tickets resolved in the period by their SLA due date
+    sla_breached: int = 0  # Open tickets past their SLA due date
+    sla_at_risk: int = 0  # Open tickets due within SLA_AT_RISK_HOURS
+    # Resolution time percentiles of the tickets resolved in the period
+    resolution_percentiles: Optional[ResolutionPercentiles] = None
+    resolution_percentiles_by_category: Dict[str, ResolutionPercentiles] = {}
+    resolution_percentiles_by_priority: Dict[str, ResolutionPercentiles] = {}
+
+
+class TimeSeriesResponse(BaseModel):
+    """Columnar time series: one timestamp array, one value array per group"""
+    metric: str
+    granularity: str
+    group_by: Optional[str] = None
+    timestamps: List[str]  # Bucket starts, UTC ISO 8601
+    series: Dict[str, List[int]]  # Group (or "total") -> one value per timestamp
+
+
+class PivotResponse(BaseModel):
+    """Columnar pivot over the analytics snapshot: values[row][col]"""
+    rows: str
+    cols: Optional[str] = None
+    measure: str
+    row_keys: List[Optional[str]]  # None: no value (e.g. unassigned)
+    col_keys: List[Optional[str]]  # ["total"] without cols
+    values: List[List[Optional[Union[int, float]]]]  # One list per row key, one value per col key
+    snapshot_taken_at: datetime  # Ticket changes after this are not in the result
+    cached: bool = False
+    query_ms: float
+
+
+class TicketCountFilters(BaseModel):
+    """Filters of /analytics/counts; list filters match any of their values, all filters must match"""
+    status: List[TicketStatusEnum] = []
+    priority: List[TicketPriorityEnum] = []
+    category: List[TicketCategoryEnum] = []
+    assigned_to: List[int] = []
+    assigned: Optional[bool] = None  # True: has an assignee, False: unassigned
+    created_after: Optional[datetime] = None  # created_after <= created_at < created_before
+    created_before: Optional[datetime] = None
+    resolved_after: Optional[datetime] = None  # Unresolved tickets never match the resolved range
+    resolved_before: Optional[datetime] = None
+
+
+class TicketCountsResponse(BaseModel):
+    """Tickets matching the filters, in total and per status, priority and category"""
+    total: int
+    by_status: Dict[str, int]  # Every label, including zeros
+    by_priority: Dict[str, int]
+    by_category: Dict[str, int]
+    engine: str  # memory (the in-process ticket mirror) or sql
+    query_ms: float
 
 
-class DashboardStats(BaseModel):
+class DashboardCounters(BaseModel):
     total_tickets: int
     open_tickets: int
     resolved_today: int
     avg_response_time: Optional[float] = None  # in hours
+    sla_breached: int = 0  # Open tickets past their SLA due date
+    sla_at_risk: int = 0  # Open tickets due within SLA_AT_RISK_HOURS
     tickets_by_status: dict
     tickets_by_priority: dict
+
+
+class DashboardStats(DashboardCounters):
     recent_tickets: List[TicketResponse]
 
 
+# ============================================
+# Dashboard Stream Schemas
+# ============================================
+
+class TicketSummary(BaseModel):
+    """The ticket fields the dashboard shows, for live updates"""
+    id: int
+    ticket_id: str
+    title: str
+    status: TicketStatusEnum
+    priority: TicketPriorityEnum
+    category: TicketCategoryEnum
+    assigned_to: Optional[int] = None
+    sla_due_date: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardDelta(BaseModel):
+    """
+    A live dashboard update: the tickets created or updated, the ids of
+    the tickets deleted, and the DashboardCounters fields that changed
+    (for tickets_by_status / tickets_by_priority only the changed keys)
+    """
+    tickets: List[TicketSummary] = []
+    deleted: List[int] = []
+    counters: Dict[str, Any] = {}
+
+
 # ============================================
 # LLM Parsing Schemas
 # ============================================
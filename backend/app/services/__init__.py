@@ -4,9 +4,17 @@ from app.services.user_service import UserService
 from app.services.ticket_service import TicketService
 from app.services.admin_service import AdminService
 from app.services.analytics_service import AnalyticsService
+from app.services.backlog_history import BacklogHistory, backlog_history
+from app.services.dashboard_stream import DashboardStream, dashboard_stream
+from app.services.ticket_mirror import TicketMirror, ticket_mirror
 from app.services.email_service import EmailService, MockEmailService
 from app.services.llm_service import LLMService, MockLLMService
 from app.services.email_processor import EmailProcessor
+from app.services.search_service import SearchService
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+from app.services.snapshot_service import SnapshotWriter, snapshot_writer
+from app.services.pivot_engine import PivotEngine, PivotUnavailableError, pivot_engine
 
 __all__ = [
     "AuthService",
@@ -14,9 +22,23 @@ __all__ = [
     "TicketService",
     "AdminService",
     "AnalyticsService",
+    "BacklogHistory",
+    "backlog_history",
+    "DashboardStream",
+    "dashboard_stream",
+    "TicketMirror",
+    "ticket_mirror",
     "EmailService",
     "MockEmailService",
     "LLMService",
     "MockLLMService",
-    "EmailProcessor"
+    "EmailProcessor",
+    "SearchService",
+    "ExportService",
+    "ImportService",
+    "SnapshotWriter",
+    "snapshot_writer",
+    "PivotEngine",
+    "PivotUnavailableError",
+    "pivot_engine"
 ]
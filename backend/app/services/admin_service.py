@@ -2,11 +2,12 @@
 # ADMIN SERVICE - Admin Management Operations
 # ============================================
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.repositories import UserRepository
+from app.repositories.pagination import apply_keyset, build_page
 from app.models import User, AdminAuditLog
 from app.schemas import (
     UserResponse,
@@ -120,24 +121,35 @@ class AdminService:
     async def get_audit_logs(
         self,
         skip: int = 0,
-        limit: int = 50
-    ) -> List[AdminAuditLogResponse]:
-        """Get admin audit logs"""
-        from sqlalchemy import select, desc
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[AdminAuditLogResponse], Optional[str]]:
+        """Get admin audit logs, newest first. Returns (logs, next_cursor)"""
+        from sqlalchemy import select
         from sqlalchemy.orm import selectinload
         
-        result = await self.db.execute(
-            select(AdminAuditLog)
-            .options(
+        query = apply_keyset(
+            select(AdminAuditLog).options(
                 selectinload(AdminAuditLog.admin),
                 selectinload(AdminAuditLog.target_user)
-            )
-            .order_by(desc(AdminAuditLog.created_at))
-            .offset(skip)
-            .limit(limit)
+            ),
+            AdminAuditLog.created_at,
+            AdminAuditLog.id,
+            True,
+            cursor,
+            "created_at"
+        )
+        if not cursor:
+            query = query.offset(skip)
+        
+        result = await self.db.execute(query.limit(limit + 1))
+        logs, next_cursor = build_page(
+            result.scalars().all(),
+            limit,
+            "created_at",
+            key=lambda log: (log.created_at, log.id)
         )
-        logs = list(result.scalars().all())
-        return [AdminAuditLogResponse.model_validate(log) for log in logs]
+        return [AdminAuditLogResponse.model_validate(log) for log in logs], next_cursor
     
     async def _create_audit_log(
         self,
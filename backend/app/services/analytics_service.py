@@ -2,22 +2,114 @@
 # ANALYTICS SERVICE - Dashboard & Analytics
 # ============================================
 
-from typing import Optional, List
+import asyncio
+import enum
+import time
+from typing import Optional, List, Dict, Tuple, Callable, Awaitable, Any
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 
-from app.repositories import TicketRepository, UserRepository
+from app.core.cache import analytics_cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.events import ticket_events
+from app.models import TicketStatus, TicketPriority, TicketCategory
+from app.repositories import TicketRepository, UserRepository, TicketRollupRepository, ResolutionSketchRepository
+from app.services.backlog_history import backlog_history
+from app.services.pivot_engine import pivot_engine
+from app.services.ticket_mirror import ticket_mirror
 from app.schemas import (
     TicketStats,
     CategoryStats,
     PriorityStats,
     TrendDataPoint,
+    ResolutionPercentiles,
+    TimeSeriesResponse,
+    PivotResponse,
+    TicketCountFilters,
+    TicketCountsResponse,
     AnalyticsResponse,
+    DashboardCounters,
     DashboardStats,
     TicketResponse
 )
 
 
+# ============================================
+# Time Series Buckets
+# ============================================
+
+TIMESERIES_METRICS = ("created", "resolved", "backlog", "breaches")
+
+# Granularity -> (numpy datetime unit, buckets step in that unit, default range)
+TIMESERIES_GRANULARITIES = {
+    "hour": ("h", 1, timedelta(hours=48)),
+    "day": ("D", 1, timedelta(days=30)),
+    "week": ("D", 7, timedelta(weeks=26)),
+    "month": ("M", 1, timedelta(days=365)),
+}
+
+
+def _utc_naive(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _bucket_edges(granularity: str, start: datetime, end: datetime) -> np.ndarray:
+    """Boundaries (datetime64[s]) of the buckets covering [start, end): n buckets, n + 1 edges"""
+    unit, step, _ = TIMESERIES_GRANULARITIES[granularity]
+    first = np.datetime64(start, unit)
+    last = np.datetime64(end - timedelta(microseconds=1), unit)
+    if granularity == "week":
+        # Weeks start on Monday; day 0 (1970-01-01) was a Thursday
+        first -= (first.astype(np.int64) + 3) % 7
+    starts = np.arange(first, last + 1, step)
+    return np.append(starts, starts[-1] + step).astype("datetime64[s]")
+
+
+def _group_label(value: Any, group_by: Optional[str]) -> str:
+    if value is None:
+        return "unassigned" if group_by else "total"
+    return value.value if isinstance(value, enum.Enum) else str(value)
+
+
+def _to_series(
+    edges: np.ndarray,
+    rows: List[Tuple[Any, Any, int]],
+    group_by: Optional[str],
+    opening: Optional[List[Tuple[Any, Any, int]]] = None
+) -> Dict[str, List[int]]:
+    """
+    Bin (period, group value, count) rows into the buckets between edges,
+    one zero-filled array per group. With opening rows (counts before the
+    first bucket, possibly none) the arrays are running totals from the
+    opening count.
+    """
+    cumulative = opening is not None
+    opening = opening or []
+    labels = [_group_label(value, group_by) for _, value, _ in rows + opening]
+    if not group_by:
+        labels.append("total")
+    names, group_index = np.unique(np.array(labels, dtype=str), return_inverse=True)
+    counts = np.array([count for _, _, count in rows + opening], dtype=np.int64)
+    matrix = np.zeros((len(names), len(edges) - 1), dtype=np.int64)
+    
+    if rows:
+        periods = np.array([period for period, _, _ in rows], dtype="datetime64[s]")
+        bucket = np.searchsorted(edges, periods, side="right") - 1
+        inside = (bucket >= 0) & (bucket < len(edges) - 1)
+        np.add.at(matrix, (group_index[:len(rows)][inside], bucket[inside]), counts[:len(rows)][inside])
+    
+    if cumulative:
+        matrix = np.cumsum(matrix, axis=1)
+        matrix += np.bincount(
+            group_index[len(rows):len(rows) + len(opening)],
+            weights=counts[len(rows):],
+            minlength=len(names)
+        ).astype(np.int64)[:, None]
+    return dict(zip(names.tolist(), matrix.tolist()))
+
+
 class AnalyticsService:
     """Service for analytics and dashboard operations"""
     
@@ -25,46 +117,224 @@ class AnalyticsService:
         self.db = db
         self.ticket_repo = TicketRepository(db)
         self.user_repo = UserRepository(db)
+        self.rollup_repo = TicketRollupRepository(db)
     
-    async def get_dashboard_stats(self) -> DashboardStats:
-        """Get dashboard statistics"""
-        # Get ticket counts by status
-        status_counts = await self.ticket_repo.get_status_counts()
-        priority_counts = await self.ticket_repo.get_priority_counts()
-        
-        # Calculate totals
-        total_tickets = sum(status_counts.values())
-        open_tickets = status_counts.get("Open", 0) + status_counts.get("In Progress", 0)
+    async def _concurrently(self, *reads: Callable[[AsyncSession], Awaitable[Any]]) -> List[Any]:
+        """
+        Run independent reads at the same time. A session runs one
+        statement at a time, so each read after the first gets its own
+        pooled connection; the first uses the request session.
+        """
+        async def on_own_session(read):
+            async with AsyncSessionLocal() as db:
+                return await read(db)
         
-        # Get recent tickets
-        recent_tickets = await self.ticket_repo.get_recent_tickets(limit=5)
-        
-        # Get average resolution time
-        avg_resolution_time = await self.ticket_repo.get_average_resolution_time()
-        
-        # Calculate resolved today
-        # This is a simplified version - in production, you'd filter by date
-        resolved_today = status_counts.get("Resolved", 0) // 30  # Approximation
+        return await asyncio.gather(
+            reads[0](self.db),
+            *(on_own_session(read) for read in reads[1:])
+        )
+    
+    # ============================================
+    # Cached endpoints
+    # ============================================
+    # Results are cached per endpoint and parameters (see app/core/cache.py)
+    # and marked stale whenever a ticket write commits. A recompute runs on
+    # its own session, so it is not tied to the request that triggered it.
+    
+    async def _cached(self, key: str, compute: Callable[["AnalyticsService"], Awaitable[Any]]) -> Any:
+        async def recompute():
+            async with AsyncSessionLocal() as db:
+                result = await compute(AnalyticsService(db))
+            if isinstance(result, list):
+                return [r.model_dump(mode="json") if hasattr(r, "model_dump") else r for r in result]
+            return result.model_dump(mode="json") if hasattr(result, "model_dump") else result
         
+        return await analytics_cache.get(key, recompute)
+    
+    async def get_dashboard_stats(self) -> DashboardStats:
+        """Get dashboard statistics (cached)"""
+        return DashboardStats.model_validate(
+            await self._cached("dashboard", lambda service: service.compute_dashboard_stats())
+        )
+    
+    async def get_full_analytics(self, days: int = 30) -> AnalyticsResponse:
+        """Get comprehensive analytics data (cached per period)"""
+        return AnalyticsResponse.model_validate(
+            await self._cached(f"full:days={days}", lambda service: service.compute_full_analytics(days))
+        )
+    
+    async def get_user_analytics(self, user_id: int) -> dict:
+        """Get analytics for a specific user (cached per user)"""
+        return await self._cached(f"user:{user_id}", lambda service: service.compute_user_analytics(user_id))
+    
+    async def get_category_summary(self) -> List[dict]:
+        """Get summary by category with detailed stats (cached)"""
+        return await self._cached("categories", lambda service: service.compute_category_summary())
+    
+    async def get_timeseries(
+        self,
+        metric: str,
+        granularity: str = "day",
+        group_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> TimeSeriesResponse:
+        """Get a metric as a time series (cached per parameters)"""
+        # Bad ranges are client errors: raise them here, not from a cache recompute
+        self._timeseries_buckets(granularity, start, end)
+        key = "timeseries:" + ":".join(
+            str(value or "") for value in (metric, granularity, group_by, start and start.isoformat(), end and end.isoformat())
+        )
+        return TimeSeriesResponse.model_validate(await self._cached(
+            key, lambda service: service.compute_timeseries(metric, granularity, group_by, start, end)
+        ))
+    
+    async def get_backlog_history(
+        self,
+        group_by: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> TimeSeriesResponse:
+        """
+        Open tickets at the end of each UTC day in [start, end] (default: the
+        90 days up to today), optionally per category or priority, from the
+        replayed status history (not cached: the history only replays the
+        logs added since the previous query). Raises ValueError for an empty
+        range or more than TIMESERIES_MAX_POINTS days.
+        """
+        end = end or datetime.now(timezone.utc).date()
+        start = start or end - timedelta(days=89)
+        if start > end:
+            raise ValueError("start must not be after end")
+        if (end - start).days + 1 > settings.timeseries_max_points:
+            raise ValueError(
+                f"{(end - start).days + 1} days requested; at most {settings.timeseries_max_points} are allowed"
+            )
+        days, series = await backlog_history.series(self.db, start, end, group_by)
+        return TimeSeriesResponse(
+            metric="open",
+            granularity="day",
+            group_by=group_by,
+            timestamps=[f"{day.isoformat()}T00:00:00Z" for day in days],
+            series=series
+        )
+    
+    async def get_pivot(
+        self,
+        rows: str,
+        cols: Optional[str] = None,
+        measure: str = "count",
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> PivotResponse:
+        """
+        A measure per rows x cols over the tickets of the analytics snapshot
+        (DuckDB, no PostgreSQL query; cached per snapshot). Raises
+        ValueError for invalid parameters and PivotUnavailableError without
+        duckdb or a snapshot.
+        """
+        return await pivot_engine.pivot(rows, cols, measure, start, end)
+    
+    async def get_ticket_counts(self, filters: TicketCountFilters, engine: str = "memory") -> TicketCountsResponse:
+        """
+        Tickets matching the filters, in total and per status, priority and
+        category (not cached). engine=memory counts in the ticket mirror,
+        or with SQL while the mirror is not loaded; engine=sql always
+        queries PostgreSQL, for comparison.
+        """
+        started = time.perf_counter()
+        if engine == "memory" and ticket_mirror.loaded:
+            total, by_status, by_priority, by_category = ticket_mirror.count(filters)
+        else:
+            engine = "sql"
+            rows = await self.ticket_repo.get_dimension_counts(
+                status=[TicketStatus(status.value) for status in filters.status],
+                priority=[TicketPriority(priority.value) for priority in filters.priority],
+                category=[TicketCategory(category.value) for category in filters.category],
+                assigned_to=filters.assigned_to,
+                assigned=filters.assigned,
+                created_after=filters.created_after,
+                created_before=filters.created_before,
+                resolved_after=filters.resolved_after,
+                resolved_before=filters.resolved_before
+            )
+            by_status = dict.fromkeys((status.value for status in TicketStatus), 0)
+            by_priority = dict.fromkeys((priority.value for priority in TicketPriority), 0)
+            by_category = dict.fromkeys((category.value for category in TicketCategory), 0)
+            for status, priority, category, count in rows:
+                by_status[status.value] += count
+                by_priority[priority.value] += count
+                by_category[category.value] += count
+            total = sum(by_status.values())
+        return TicketCountsResponse(
+            total=total,
+            by_status=by_status,
+            by_priority=by_priority,
+            by_category=by_category,
+            engine=engine,
+            query_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+    
+    # ============================================
+    # Computations
+    # ============================================
+    
+    async def compute_dashboard_stats(self) -> DashboardStats:
+        """
+        Get dashboard statistics: counts from the rollup table, recent
+        tickets and SLA counts from tickets (three concurrent queries).
+        """
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        recent_tickets, sla, summary = await self._concurrently(
+            lambda db: TicketRepository(db).get_recent_tickets(limit=5),
+            lambda db: TicketRepository(db).get_sla_metrics(since=today, today=today),
+            lambda db: TicketRollupRepository(db).get_summary()
+        )
         return DashboardStats(
-            total_tickets=total_tickets,
-            open_tickets=open_tickets,
-            resolved_today=resolved_today,
-            avg_response_time=avg_resolution_time,
-            tickets_by_status=status_counts,
-            tickets_by_priority=priority_counts,
+            **self._dashboard_counters(sla, summary).model_dump(),
             recent_tickets=[TicketResponse.model_validate(t) for t in recent_tickets]
         )
     
-    async def get_full_analytics(self, days: int = 30) -> AnalyticsResponse:
-        """Get comprehensive analytics data"""
-        # Get counts
-        status_counts = await self.ticket_repo.get_status_counts()
-        priority_counts = await self.ticket_repo.get_priority_counts()
-        category_counts = await self.ticket_repo.get_category_counts()
-        
-        # Calculate totals
-        total_tickets = sum(status_counts.values())
+    async def compute_dashboard_counters(self) -> DashboardCounters:
+        """Dashboard statistics without the recent tickets (two concurrent queries)"""
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        sla, summary = await self._concurrently(
+            lambda db: TicketRepository(db).get_sla_metrics(since=today, today=today),
+            lambda db: TicketRollupRepository(db).get_summary()
+        )
+        return self._dashboard_counters(sla, summary)
+    
+    @staticmethod
+    def _dashboard_counters(sla: Dict[str, int], summary: Dict[str, Any]) -> DashboardCounters:
+        status_counts = summary["status"]
+        return DashboardCounters(
+            total_tickets=summary["total"],
+            open_tickets=status_counts.get("Open", 0) + status_counts.get("In Progress", 0),
+            resolved_today=sla["resolved_today"],
+            avg_response_time=summary["avg_resolution_time"],
+            sla_breached=sla["breached"],
+            sla_at_risk=sla["at_risk"],
+            tickets_by_status=status_counts,
+            tickets_by_priority=summary["priority"]
+        )
+    
+    async def compute_full_analytics(self, days: int = 30) -> AnalyticsResponse:
+        """
+        Get comprehensive analytics data: counts from the rollup table, SLA
+        compliance over the last N days from tickets, resolution time
+        percentiles over the last N days from the sketches (four concurrent queries).
+        """
+        now = datetime.now(timezone.utc)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        since = now - timedelta(days=days)
+        summary, daily_data, sla, percentiles = await self._concurrently(
+            lambda db: TicketRollupRepository(db).get_summary(),
+            lambda db: TicketRollupRepository(db).get_daily_ticket_counts(days),
+            lambda db: TicketRepository(db).get_sla_metrics(since=since, today=today),
+            lambda db: ResolutionSketchRepository(db).get_percentiles(since=since.date())
+        )
+        status_counts = summary["status"]
+        total_tickets = summary["total"]
         
         # Build ticket stats
         ticket_stats = TicketStats(
@@ -78,7 +348,7 @@ class AnalyticsService:
         
         # Build category breakdown
         category_breakdown = []
-        for category, count in category_counts.items():
+        for category, count in summary["category"].items():
             percentage = (count / total_tickets * 100) if total_tickets > 0 else 0
             category_breakdown.append(CategoryStats(
                 category=category,
@@ -88,7 +358,7 @@ class AnalyticsService:
         
         # Build priority breakdown
         priority_breakdown = []
-        for priority, count in priority_counts.items():
+        for priority, count in summary["priority"].items():
             percentage = (count / total_tickets * 100) if total_tickets > 0 else 0
             priority_breakdown.append(PriorityStats(
                 priority=priority,
@@ -96,53 +366,48 @@ class AnalyticsService:
                 percentage=round(percentage, 2)
             ))
         
-        # Get daily trends
-        daily_data = await self.ticket_repo.get_daily_ticket_counts(days)
         daily_trends = [TrendDataPoint(date=d["date"], count=d["count"]) for d in daily_data]
         
-        # Get average resolution time
-        avg_resolution_time = await self.ticket_repo.get_average_resolution_time()
-        
-        # Calculate SLA compliance (simplified - tickets resolved within 24 hours)
-        # In production, you'd have actual SLA rules
-        sla_compliance_rate = 85.0  # Placeholder
+        # Share of the tickets resolved in the period that met their SLA due date
+        sla_compliance_rate = round(sla["met"] / sla["resolved"] * 100, 2) if sla["resolved"] else None
         
         return AnalyticsResponse(
             ticket_stats=ticket_stats,
             category_breakdown=category_breakdown,
             priority_breakdown=priority_breakdown,
             daily_trends=daily_trends,
-            avg_resolution_time=avg_resolution_time,
-            sla_compliance_rate=sla_compliance_rate
+            avg_resolution_time=summary["avg_resolution_time"],
+            sla_compliance_rate=sla_compliance_rate,
+            sla_breached=sla["breached"],
+            sla_at_risk=sla["at_risk"],
+            resolution_percentiles=ResolutionPercentiles(**percentiles["overall"]) if percentiles["overall"] else None,
+            resolution_percentiles_by_category={
+                category: ResolutionPercentiles(**values) for category, values in percentiles["category"].items()
+            },
+            resolution_percentiles_by_priority={
+                priority: ResolutionPercentiles(**values) for priority, values in percentiles["priority"].items()
+            }
         )
     
-    async def get_user_analytics(self, user_id: int) -> dict:
-        """Get analytics for a specific user"""
-        tickets, total = await self.ticket_repo.get_user_tickets(user_id, skip=0, limit=1000)
-        
-        status_counts = {}
-        priority_counts = {}
-        category_counts = {}
-        
-        for ticket in tickets:
-            status = ticket.status.value
-            priority = ticket.priority.value
-            category = ticket.category.value
-            
-            status_counts[status] = status_counts.get(status, 0) + 1
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-            category_counts[category] = category_counts.get(category, 0) + 1
+    async def compute_user_analytics(self, user_id: int) -> dict:
+        """Get analytics for a specific user (tickets assigned to or created by them; one query)"""
+        summary = await self.ticket_repo.get_user_summary(user_id)
         
         return {
-            "total_tickets": total,
-            "tickets_by_status": status_counts,
-            "tickets_by_priority": priority_counts,
-            "tickets_by_category": category_counts
+            "total_tickets": summary["total"],
+            "tickets_by_status": summary["status"],
+            "tickets_by_priority": summary["priority"],
+            "tickets_by_category": summary["category"],
+            "open_tickets_by_age": summary["age"],
+            "resolved_tickets": summary["resolved"],
+            "avg_resolution_time": summary["avg_resolution_time"],
+            "median_resolution_time": summary["median_resolution_time"],
+            "max_resolution_time": summary["max_resolution_time"]
         }
     
-    async def get_category_summary(self) -> List[dict]:
+    async def compute_category_summary(self) -> List[dict]:
         """Get summary by category with detailed stats"""
-        category_counts = await self.ticket_repo.get_category_counts()
+        category_counts = await self.rollup_repo.get_category_counts()
         
         results = []
         for category, count in category_counts.items():
@@ -154,6 +419,113 @@ class AnalyticsService:
         
         return sorted(results, key=lambda x: x["count"], reverse=True)
     
+    async def compute_timeseries(
+        self,
+        metric: str,
+        granularity: str = "day",
+        group_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> TimeSeriesResponse:
+        """
+        A metric per UTC hour, day, week or month over [start, end) (default:
+        the granularity's default range up to now), optionally per category,
+        priority or assignee: tickets created or resolved, SLA breaches
+        (tickets not resolved by their due date, at the due date), or the
+        backlog (tickets created and not yet resolved) at the end of each
+        bucket. Counts are binned and gap-filled with NumPy. Raises
+        ValueError for an empty range or more than TIMESERIES_MAX_POINTS buckets.
+        """
+        end, edges = self._timeseries_buckets(granularity, start, end)
+        
+        # Hour buckets read hours up to end; coarser ones whole days
+        first = edges[0].astype(datetime)
+        unit = "hour" if granularity == "hour" else "day"
+        stop = end if unit == "hour" else datetime.combine(
+            (end - timedelta(microseconds=1)).date() + timedelta(days=1), datetime.min.time()
+        )
+        
+        if metric == "backlog":
+            created, resolved, created_before, resolved_before = await self._concurrently(
+                lambda db: self._event_counts(db, "created", first, stop, unit, group_by),
+                lambda db: self._event_counts(db, "resolved", first, stop, unit, group_by),
+                lambda db: self._event_counts(db, "created", None, first, None, group_by),
+                lambda db: self._event_counts(db, "resolved", None, first, None, group_by)
+            )
+            series = _to_series(
+                edges,
+                created + [(period, value, -count) for period, value, count in resolved],
+                group_by,
+                opening=created_before + [(period, value, -count) for period, value, count in resolved_before]
+            )
+        else:
+            rows = await self._event_counts(self.db, metric, first, stop, unit, group_by)
+            series = _to_series(edges, rows, group_by)
+        
+        return TimeSeriesResponse(
+            metric=metric,
+            granularity=granularity,
+            group_by=group_by,
+            timestamps=np.datetime_as_string(edges[:-1], unit="s", timezone="UTC").tolist(),
+            series=series
+        )
+    
+    @staticmethod
+    def _timeseries_buckets(
+        granularity: str,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> Tuple[datetime, np.ndarray]:
+        """
+        (end, bucket edges) of a time series over [start, end), as naive UTC,
+        with compute_timeseries' defaults. Raises ValueError for an empty
+        range or more than TIMESERIES_MAX_POINTS buckets.
+        """
+        end = _utc_naive(end or datetime.now(timezone.utc))
+        start = _utc_naive(start) if start else end - TIMESERIES_GRANULARITIES[granularity][2]
+        if start >= end:
+            raise ValueError("start must be before end")
+        edges = _bucket_edges(granularity, start, end)
+        if len(edges) - 1 > settings.timeseries_max_points:
+            raise ValueError(
+                f"{len(edges) - 1} {granularity} buckets requested; at most {settings.timeseries_max_points} "
+                "are allowed, use a coarser granularity or a shorter range"
+            )
+        return end, edges
+    
+    @staticmethod
+    async def _event_counts(
+        db: AsyncSession,
+        event: str,
+        start: Optional[datetime],
+        end: datetime,
+        unit: Optional[str],
+        group_by: Optional[str]
+    ) -> List[Tuple[Any, Any, int]]:
+        """
+        (period, group value, count) rows of an event in [start, end) (naive
+        UTC). Created tickets, and resolved tickets by category or priority,
+        are read from the daily rollup and sketch tables for whole days; the
+        rest from tickets.
+        """
+        def aware(value: Optional[datetime]) -> Optional[datetime]:
+            return value.replace(tzinfo=timezone.utc) if value else None
+        
+        tickets = TicketRepository(db)
+        if unit == "hour" or event == "breaches" or (event == "resolved" and group_by == "assignee"):
+            return await tickets.get_event_counts(event, aware(start), aware(end), unit, group_by)
+        
+        read_days = (
+            TicketRollupRepository(db).get_created_counts if event == "created"
+            else ResolutionSketchRepository(db).get_resolved_counts
+        )
+        rows = await read_days(start.date() if start else None, end.date(), unit == "day", group_by)
+        midnight = end.replace(hour=0, minute=0, second=0, microsecond=0)
+        if end > midnight:
+            # The part of the last day, for ranges that end within a day
+            rows += await tickets.get_event_counts(event, aware(max(start, midnight) if start else midnight), aware(end), unit, group_by)
+        return rows
+    
     def _get_category_description(self, category: str) -> str:
         """Get description for SAP category"""
         descriptions = {
@@ -172,3 +544,7 @@ class AnalyticsService:
             "OTHER": "Other/Unknown"
         }
         return descriptions.get(category, category)
+
+
+# Any committed ticket write makes every cached analytics result stale
+ticket_events.subscribe(analytics_cache.invalidate)
@@ -0,0 +1,257 @@
+# ============================================
+# BACKLOG HISTORY - Open Tickets per Day, Replayed from Ticket Logs
+# ============================================
+# Tickets only store their current status, so the number of tickets that
+# were open on a past day is replayed from events: a ticket opens on the day
+# it was created, and its STATUS_CHANGE logs close and reopen it. Events are
+# read in id order, in batches, binned per (category, priority, day) with
+# NumPy and turned into open counts with a cumulative sum over the days.
+# The counts are kept in memory (per process) together with the last ticket
+# and log ids replayed, so each query only replays the events since the
+# previous one and then slices the days it asks for.
+
+import asyncio
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.events import ticket_events
+from app.models import TicketCategory, TicketPriority, TicketStatus
+from app.repositories import TicketRepository, TicketLogRepository
+
+
+CATEGORIES = list(TicketCategory)
+PRIORITIES = list(TicketPriority)
+_CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(PRIORITIES)}
+
+# Status labels (TicketLog.new_value) of closed tickets; any other status is open
+CLOSED_STATUS_LABELS = [TicketStatus.RESOLVED.value, TicketStatus.CLOSED.value]
+
+
+def _day_numbers(days) -> np.ndarray:
+    """Days since 1970-01-01 of a sequence of dates"""
+    return np.array(days, dtype="datetime64[D]").astype(np.int64)
+
+
+class BacklogHistory:
+    """
+    Open tickets at the end of each UTC day, per category and priority.
+    Tickets count in the category and priority they had when first
+    replayed. A deleted ticket that was open stops being open on the day
+    it was deleted; its earlier days stay until the history is rebuilt
+    from scratch, which happens when it gets older than
+    BACKLOG_HISTORY_REBUILD_HOURS (this also picks up tickets and logs
+    committed out of id order).
+    """
+    
+    def __init__(self, batch_size: int = 50000):
+        self.batch_size = batch_size
+        self._lock = asyncio.Lock()
+        self._reset()
+        self._replayed_events = 0
+        self._last_refresh_ms: Optional[float] = None
+    
+    def _reset(self) -> None:
+        # Open tickets at the end of each day: one row per category x priority
+        self._counts: Optional[np.ndarray] = None
+        self._first_day = 0
+        # Per ticket id: group (category code * len(PRIORITIES) + priority code, -1 unknown) and open (0/1)
+        self._ticket_group = np.full(0, -1, dtype=np.int16)
+        self._ticket_open = np.zeros(0, dtype=np.int8)
+        self._last_ticket_id = 0
+        self._last_log_id = 0
+        self._built_at: Optional[float] = None
+        self._deleted: List[int] = []
+    
+    def on_ticket_event(self, payload: dict) -> None:
+        """ticket_events handler: deleted tickets are closed on the next refresh"""
+        if payload["type"] == "deleted":
+            self._deleted.extend(payload["ticket_ids"])
+    
+    def stats(self) -> dict:
+        return {
+            "days": 0 if self._counts is None else int(self._counts.shape[1]),
+            "tickets": int((self._ticket_group >= 0).sum()),
+            "last_ticket_id": self._last_ticket_id,
+            "last_log_id": self._last_log_id,
+            "replayed_events": self._replayed_events,
+            "last_refresh_ms": self._last_refresh_ms
+        }
+    
+    async def refresh(self, db: AsyncSession) -> None:
+        """Replay the tickets and status logs added since the last refresh (all of them after a reset)"""
+        async with self._lock:
+            started = time.perf_counter()
+            max_age = settings.backlog_history_rebuild_hours * 3600
+            if self._built_at is not None and time.monotonic() - self._built_at > max_age:
+                print("[BacklogHistory] Rebuilding from the ticket logs")
+                self._reset()
+            if self._built_at is None:
+                self._built_at = time.monotonic()
+            
+            await self._replay_tickets(TicketRepository(db))
+            await self._replay_status_changes(TicketRepository(db), TicketLogRepository(db))
+            today = _day_numbers([datetime.now(timezone.utc).date()])[0]
+            self._extend(today)
+            self._close_deleted(today)
+            self._last_refresh_ms = round((time.perf_counter() - started) * 1000, 2)
+    
+    async def series(
+        self,
+        db: AsyncSession,
+        start: date,
+        end: date,
+        group_by: Optional[str] = None
+    ) -> Tuple[List[date], Dict[str, List[int]]]:
+        """
+        Open tickets at the end of each day in [start, end] after a refresh:
+        (days, {group label: counts}). Groups without open tickets in the
+        range are left out, except "total" without group_by.
+        """
+        await self.refresh(db)
+        days = np.arange(_day_numbers([start])[0], _day_numbers([end])[0] + 1)
+        counts = self._counts.reshape(len(CATEGORIES), len(PRIORITIES), -1)
+        if group_by == "category":
+            counts, labels = counts.sum(axis=1), [category.value for category in CATEGORIES]
+        elif group_by == "priority":
+            counts, labels = counts.sum(axis=0), [priority.value for priority in PRIORITIES]
+        else:
+            counts, labels = counts.sum(axis=(0, 1))[None, :], ["total"]
+        
+        # Nothing was open before the first event; the last day carries forward
+        index = np.minimum(days - self._first_day, counts.shape[1] - 1)
+        values = np.where(index >= 0, counts[:, np.maximum(index, 0)], 0)
+        series = {
+            label: row.tolist()
+            for label, row in zip(labels, values)
+            if not group_by or row.any()
+        }
+        return days.astype("datetime64[D]").tolist(), series
+    
+    # ============================================
+    # Replay
+    # ============================================
+    
+    def _extend(self, first_day: int, last_day: Optional[int] = None) -> None:
+        """Grow the day axis to cover first_day..last_day"""
+        last_day = first_day if last_day is None else last_day
+        if self._counts is None:
+            self._first_day = first_day
+            self._counts = np.zeros((len(CATEGORIES) * len(PRIORITIES), last_day - first_day + 1), dtype=np.int64)
+            return
+        if first_day < self._first_day:
+            before = np.zeros((self._counts.shape[0], self._first_day - first_day), dtype=np.int64)
+            self._counts = np.concatenate((before, self._counts), axis=1)
+            self._first_day = first_day
+        after = last_day - (self._first_day + self._counts.shape[1] - 1)
+        if after > 0:
+            self._counts = np.concatenate((self._counts, np.repeat(self._counts[:, -1:], after, axis=1)), axis=1)
+    
+    def _apply(self, groups: np.ndarray, days: np.ndarray, deltas: np.ndarray) -> None:
+        """Add open count changes on days: a cumulative sum from the earliest day changed"""
+        if not len(deltas):
+            return
+        self._extend(int(days.min()), int(days.max()))
+        first = int(days.min()) - self._first_day
+        changes = np.zeros((self._counts.shape[0], self._counts.shape[1] - first), dtype=np.int64)
+        np.add.at(changes, (groups, days - self._first_day - first), deltas)
+        self._counts[:, first:] += np.cumsum(changes, axis=1)
+        self._replayed_events += len(deltas)
+    
+    def _grow(self, max_ticket_id: int) -> None:
+        if max_ticket_id >= len(self._ticket_group):
+            size = max(max_ticket_id + 1, 2 * len(self._ticket_group))
+            grown = len(self._ticket_group)
+            self._ticket_group = np.concatenate((self._ticket_group, np.full(size - grown, -1, dtype=np.int16)))
+            self._ticket_open = np.concatenate((self._ticket_open, np.zeros(size - grown, dtype=np.int8)))
+    
+    def _close_deleted(self, today: int) -> None:
+        ids = np.array([i for i in self._deleted if i < len(self._ticket_group)], dtype=np.int64)
+        self._deleted = []
+        ids = ids[(self._ticket_group[ids] >= 0) & (self._ticket_open[ids] == 1)]
+        self._apply(
+            self._ticket_group[ids].astype(np.int64),
+            np.full(len(ids), today, dtype=np.int64),
+            -np.ones(len(ids), dtype=np.int64)
+        )
+        self._ticket_group[ids] = -1
+        self._ticket_open[ids] = 0
+    
+    async def _replay_tickets(self, tickets: TicketRepository) -> None:
+        """Open every new ticket on its creation day (and close those closed without status logs)"""
+        while True:
+            rows = await tickets.get_openings(self._last_ticket_id, self.batch_size)
+            if not rows:
+                return
+            ids, categories, priorities, created, closed = zip(*rows)
+            ids = np.array(ids, dtype=np.int64)
+            groups = np.array(
+                [_CATEGORY_CODES[c] * len(PRIORITIES) + _PRIORITY_CODES[p] for c, p in zip(categories, priorities)],
+                dtype=np.int16
+            )
+            is_closed = np.array([day is not None for day in closed])
+            closed_days = _day_numbers([day for day in closed if day is not None])
+            
+            self._grow(int(ids.max()))
+            self._ticket_group[ids] = groups
+            self._ticket_open[ids] = ~is_closed
+            self._apply(
+                np.concatenate((groups, groups[is_closed])),
+                np.concatenate((_day_numbers(created), closed_days)),
+                np.concatenate((np.ones(len(ids), dtype=np.int64), -np.ones(len(closed_days), dtype=np.int64)))
+            )
+            self._last_ticket_id = int(ids[-1])
+            if len(rows) < self.batch_size:
+                return
+    
+    async def _replay_status_changes(self, tickets: TicketRepository, logs: TicketLogRepository) -> None:
+        """
+        Close and reopen tickets from their STATUS_CHANGE logs. Only the new
+        status is used: the change of a ticket's open state from the
+        previous log of the batch (or the state replayed so far) is the
+        event, so repeated or inconsistent logs never count twice.
+        """
+        while True:
+            rows = await logs.get_status_changes(self._last_log_id, self.batch_size)
+            if not rows:
+                return
+            log_ids, ticket_ids, days, labels = zip(*rows)
+            ticket_ids = np.array(ticket_ids, dtype=np.int64)
+            if ticket_ids.max() > self._last_ticket_id:
+                # Logs of tickets created since the tickets were replayed
+                await self._replay_tickets(tickets)
+            
+            order = np.lexsort((np.array(log_ids), ticket_ids))
+            ticket_ids = ticket_ids[order]
+            days = _day_numbers(days)[order]
+            target = (~np.isin(np.array(labels, dtype=object), CLOSED_STATUS_LABELS))[order].astype(np.int8)
+            
+            # A ticket's previous state: its previous log in the batch, or the replayed state
+            first = np.r_[True, ticket_ids[1:] != ticket_ids[:-1]]
+            last = np.r_[ticket_ids[1:] != ticket_ids[:-1], True]
+            previous = np.r_[np.int8(0), target[:-1]]
+            self._grow(int(ticket_ids.max()))
+            previous[first] = self._ticket_open[ticket_ids[first]]
+            self._ticket_open[ticket_ids[last]] = target[last]
+            
+            # Tickets missing from the history (committed out of id order) wait for the next rebuild
+            groups = self._ticket_group[ticket_ids]
+            changed = (target != previous) & (groups >= 0)
+            self._apply(
+                groups[changed].astype(np.int64),
+                days[changed],
+                target[changed].astype(np.int64) - previous[changed]
+            )
+            self._last_log_id = int(log_ids[-1])
+            if len(rows) < self.batch_size:
+                return
+
+
+# Process-wide history, refreshed by /analytics/backlog-history queries
+backlog_history = BacklogHistory()
+ticket_events.subscribe(backlog_history.on_ticket_event)
@@ -0,0 +1,196 @@
+# ============================================
+# DASHBOARD STREAM - Live Dashboard Deltas (Server-Sent Events)
+# ============================================
+# Dashboards keep one /stream/dashboard connection open instead of polling.
+# After ticket writes commit (ticket_events, including the events the relay
+# receives from other workers), the stream loads the changed tickets and the
+# dashboard counters once and sends every connection the same compact delta:
+# the ticket summaries, the deleted ticket ids and the counters that changed.
+# Events within STREAM_COALESCE_MS make one delta. A client reconnecting
+# with Last-Event-ID to the same worker gets the deltas it missed from the
+# last STREAM_BUFFER_EVENTS kept in memory; otherwise it gets a snapshot.
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.event_relay import WORKER_ID
+from app.core.events import ticket_events
+from app.repositories import TicketRepository
+from app.schemas import DashboardDelta, TicketSummary
+from app.services.analytics_service import AnalyticsService
+
+
+# Queued instead of a delta when a connection fell too far behind
+RESYNC = object()
+
+
+def format_event(event: str, data: str, event_id: str) -> str:
+    """One Server-Sent Event"""
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+
+def changed_counters(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """The counters that differ from old (all without old); dict counters by key, gone keys as 0"""
+    if old is None:
+        return new
+    changed = {}
+    for name, value in new.items():
+        if isinstance(value, dict):
+            previous = old.get(name) or {}
+            diff = {key: count for key, count in value.items() if previous.get(key) != count}
+            diff.update({key: 0 for key in previous if key not in value})
+            if diff:
+                changed[name] = diff
+        elif old.get(name) != value:
+            changed[name] = value
+    return changed
+
+
+class DashboardStream:
+    """Fans dashboard deltas out to the open stream connections of this process"""
+    
+    def __init__(self):
+        self._connections: Set[asyncio.Queue] = set()
+        self._buffer: Deque[Tuple[int, str]] = deque(maxlen=settings.stream_buffer_events)
+        # Deltas are numbered from 1; clients that received _resumable_from or a
+        # later one can resume from the buffer
+        self._last_id = 0
+        self._resumable_from = 0
+        self._counters: Optional[Dict[str, Any]] = None
+        self._changed: Set[int] = set()
+        self._deleted: Set[int] = set()
+        self._pending = False  # Events not yet picked up by a delta
+        self._flush: Optional[asyncio.Task] = None
+        self.deltas_sent = 0
+        self.resyncs = 0
+    
+    def _event_id(self, number: int) -> str:
+        return f"{WORKER_ID[:8]}-{number}"
+    
+    def status(self) -> dict:
+        return {
+            "connections": len(self._connections),
+            "deltas_sent": self.deltas_sent,
+            "resyncs": self.resyncs,
+            "last_event_id": self._event_id(self._last_id)
+        }
+    
+    def on_ticket_event(self, payload: dict) -> None:
+        """ticket_events handler: schedule a delta"""
+        if not self._connections:
+            # Nobody to send deltas to: forget the baseline, clients resuming
+            # from before now get a snapshot
+            self._counters = None
+            self._resumable_from = self._last_id + 1
+            return
+        ids = set(payload["ticket_ids"])
+        if payload["type"] == "deleted":
+            self._deleted |= ids
+            self._changed -= ids
+        else:
+            self._changed |= ids
+        self._pending = True
+        if self._flush is None or self._flush.done():
+            self._flush = asyncio.get_running_loop().create_task(self._send_delta())
+    
+    async def _send_delta(self) -> None:
+        # Events arriving while a delta is queried are sent in the next round
+        while self._pending:
+            await asyncio.sleep(settings.stream_coalesce_ms / 1000)
+            await self._send_one_delta()
+    
+    async def _send_one_delta(self) -> None:
+        self._pending = False
+        changed, self._changed = self._changed, set()
+        deleted, self._deleted = self._deleted, set()
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = await TicketRepository(db).get_summaries(sorted(changed))
+                counters = (await AnalyticsService(db).compute_dashboard_counters()).model_dump(mode="json")
+        except Exception as e:
+            print(f"[DashboardStream] Delta failed, clients will get a snapshot: {e}")
+            self._counters = None
+            self._publish(RESYNC)
+            return
+        
+        tickets = [TicketSummary.model_validate(row) for row in rows]
+        # Tickets deleted since the event are gone too
+        deleted |= changed - {ticket.id for ticket in tickets}
+        delta = DashboardDelta(
+            tickets=tickets,
+            deleted=sorted(deleted),
+            counters=changed_counters(self._counters, counters)
+        )
+        self._counters = counters
+        if delta.tickets or delta.deleted or delta.counters:
+            self._last_id += 1
+            message = format_event("delta", delta.model_dump_json(), self._event_id(self._last_id))
+            if len(self._buffer) == self._buffer.maxlen:
+                self._resumable_from = self._buffer[0][0]
+            self._buffer.append((self._last_id, message))
+            self._publish(message)
+            self.deltas_sent += 1
+    
+    def _publish(self, message: Any) -> None:
+        for queue in self._connections:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Backpressure: a client this far behind gets one snapshot
+                # instead of its backlog, so slow clients cannot grow memory
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+                self.resyncs += 1
+    
+    async def _snapshot(self) -> str:
+        """All counters; clients reload their ticket lists on a snapshot"""
+        async with AsyncSessionLocal() as db:
+            counters = (await AnalyticsService(db).compute_dashboard_counters()).model_dump(mode="json")
+        if self._counters is None:
+            self._counters = counters
+        return format_event("snapshot", json.dumps({"counters": counters}), self._event_id(self._last_id))
+    
+    def _missed(self, last_event_id: Optional[str]) -> Optional[List[str]]:
+        """The buffered deltas after last_event_id, or None if some are not (other worker, too old)"""
+        worker, _, number = (last_event_id or "").partition("-")
+        if worker != WORKER_ID[:8] or not number.isdigit():
+            return None
+        last_id = int(number)
+        if not self._resumable_from <= last_id <= self._last_id:
+            return None
+        return [message for number, message in self._buffer if number > last_id]
+    
+    async def connect(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        The events of one connection: a snapshot (or the deltas missed since
+        last_event_id), then deltas as they happen, with a comment line
+        after STREAM_HEARTBEAT_SECONDS without events.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.stream_queue_size)
+        self._connections.add(queue)
+        try:
+            missed = self._missed(last_event_id)
+            if missed is None:
+                yield await self._snapshot()
+            else:
+                for message in missed:
+                    yield message
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), settings.stream_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield await self._snapshot() if message is RESYNC else message
+        finally:
+            self._connections.discard(queue)
+
+
+dashboard_stream = DashboardStream()
+ticket_events.subscribe(dashboard_stream.on_ticket_event)
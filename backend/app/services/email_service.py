@@ -6,7 +6,7 @@
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
 
@@ -185,11 +185,12 @@ class EmailService:
         self,
         category: str,
         skip: int = 0,
-        limit: int = 50
-    ) -> List[EmailSourceResponse]:
-        """Get emails by detected category"""
-        emails = await self.email_repo.get_by_category(category, skip, limit)
-        return [EmailSourceResponse.model_validate(e) for e in emails]
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[EmailSourceResponse], Optional[str]]:
+        """Get emails by detected category. Returns (emails, next_cursor)"""
+        emails, next_cursor = await self.email_repo.get_by_category(category, skip, limit, cursor)
+        return [EmailSourceResponse.model_validate(e) for e in emails], next_cursor
 
 
 class MockEmailService(EmailService):
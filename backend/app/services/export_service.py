@@ -0,0 +1,184 @@
+# ============================================
+# EXPORT SERVICE - Streaming Ticket Exports (CSV / XLSX)
+# ============================================
+# Rows come from a server-side cursor in batches (see
+# TicketRepository.stream_export_rows) and are written out batch by batch,
+# so memory use does not depend on the number of exported tickets. The
+# body is sent after the endpoint returns, when the request's session may
+# already be closed, so exports read through a session of their own.
+
+import asyncio
+import csv
+import io
+import tempfile
+from typing import AsyncIterator, Optional
+
+import xlsxwriter
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import TicketStatus, TicketPriority, TicketCategory
+from app.repositories import TicketRepository
+
+
+# Header, row field, XLSX column width
+EXPORT_COLUMNS = [
+    ("Ticket ID", "ticket_id", 12),
+    ("Title", "title", 40),
+    ("Description", "description", 60),
+    ("Status", "status", 14),
+    ("Priority", "priority", 10),
+    ("Category", "category", 10),
+    ("Raised By", "created_by_name", 20),
+    ("Assigned To", "assigned_to_name", 20),
+    ("Created On", "created_at", 17),
+    ("Updated On", "updated_at", 17),
+    ("Resolved On", "resolved_at", 17),
+    ("Resolution Time (min)", "resolution_time", 12),
+    ("SLA Due", "sla_due_date", 17),
+]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Data rows per worksheet (Excel allows 1,048,576 rows including the header)
+XLSX_MAX_ROWS = 1_048_575
+
+# Size of the chunks a finished workbook is sent in
+XLSX_CHUNK_SIZE = 64 * 1024
+
+
+# Enum columns, exported as their labels
+ENUM_FIELDS = ("status", "priority", "category")
+_ENUM_INDEXES = [i for i, (_, field, _) in enumerate(EXPORT_COLUMNS) if field in ENUM_FIELDS]
+
+
+def _values(row) -> list:
+    """Cell values of an export row (rows hold the EXPORT_COLUMNS fields in order)"""
+    values = list(row)
+    for i in _ENUM_INDEXES:
+        values[i] = values[i].value
+    return values
+
+
+class _WorkbookWriter:
+    """
+    Appends rows to an xlsxwriter workbook in constant_memory mode: each row
+    is flushed to a temporary file as soon as the next one starts, and a new
+    worksheet is started when one is full.
+    """
+    
+    def __init__(self, file):
+        self.workbook = xlsxwriter.Workbook(file, {
+            "constant_memory": True,
+            "remove_timezone": True,
+            "default_date_format": "yyyy-mm-dd hh:mm",
+        })
+        self.header_format = self.workbook.add_format({"bold": True})
+        self.sheets = 0
+        self._add_sheet()
+    
+    def _add_sheet(self) -> None:
+        self.sheets += 1
+        self.worksheet = self.workbook.add_worksheet("Tickets" if self.sheets == 1 else f"Tickets {self.sheets}")
+        for column, (_, _, width) in enumerate(EXPORT_COLUMNS):
+            self.worksheet.set_column(column, column, width)
+        self.worksheet.write_row(0, 0, [header for header, _, _ in EXPORT_COLUMNS], self.header_format)
+        self.worksheet.freeze_panes(1, 0)
+        self.row = 0
+    
+    def write_rows(self, rows: list) -> None:
+        for row in rows:
+            if self.row == XLSX_MAX_ROWS:
+                self._add_sheet()
+            self.row += 1
+            # None values become blank cells, which constant_memory mode skips
+            self.worksheet.write_row(self.row, 0, _values(row))
+    
+    def close(self) -> None:
+        self.workbook.close()
+
+
+class ExportService:
+    """Service for streaming ticket exports"""
+    
+    def export_tickets(
+        self,
+        format: str,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        category: Optional[str] = None,
+        assigned_to: Optional[int] = None,
+        created_by: Optional[int] = None,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True
+    ) -> AsyncIterator[bytes]:
+        """
+        Content of a csv or xlsx file of all tickets matching the ticket list
+        filters, in the list order, as an async iterator of byte chunks.
+        Filters are converted here, so invalid values raise ValueError before
+        the response starts.
+        """
+        batches = self._batches(
+            status=TicketStatus(status) if status else None,
+            priority=TicketPriority(priority) if priority else None,
+            category=TicketCategory(category) if category else None,
+            assigned_to=assigned_to,
+            created_by=created_by,
+            search=search,
+            order_by=order_by,
+            order_desc=order_desc,
+            batch_size=settings.export_batch_size
+        )
+        if format == "xlsx":
+            return self._xlsx_chunks(batches)
+        return self._csv_chunks(batches)
+    
+    @staticmethod
+    async def _batches(**filters) -> AsyncIterator[list]:
+        """stream_export_rows batches, read in a session opened and closed by the stream itself"""
+        async with AsyncSessionLocal() as db:
+            batches = TicketRepository(db).stream_export_rows(**filters)
+            try:
+                async for rows in batches:
+                    yield rows
+            finally:
+                await batches.aclose()
+    
+    async def _csv_chunks(self, batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+        """One chunk per batch of rows; the header goes out before the query runs"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # The byte order mark makes Excel open the file as UTF-8
+        yield ("\ufeff" + ",".join(header for header, _, _ in EXPORT_COLUMNS) + "\r\n").encode("utf-8")
+        
+        try:
+            async for rows in batches:
+                writer.writerows(map(_values, rows))
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        finally:
+            # Releases the server-side cursor if the client disconnects
+            await batches.aclose()
+    
+    async def _xlsx_chunks(self, batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+        """
+        The workbook is built in a temporary file (a zip archive can only be
+        sent once complete), then sent in chunks. xlsxwriter calls run in a
+        worker thread to keep the event loop free.
+        """
+        with tempfile.TemporaryFile() as file:
+            writer = _WorkbookWriter(file)
+            try:
+                async for rows in batches:
+                    await asyncio.to_thread(writer.write_rows, rows)
+            finally:
+                await batches.aclose()
+            await asyncio.to_thread(writer.close)
+            
+            file.seek(0)
+            while chunk := file.read(XLSX_CHUNK_SIZE):
+                yield chunk
@@ -0,0 +1,342 @@
+# ============================================
+# IMPORT SERVICE - Bulk Import of Ticket History
+# ============================================
+# Loads tickets, ticket logs or comments exported from another tool. The
+# source (CSV with a header row, or JSON Lines) is read and validated in
+# chunks of IMPORT_CHUNK_SIZE rows. The valid rows of a chunk are copied
+# into a staging table and merged in one INSERT ... SELECT (see
+# ImportRepository), then committed. Invalid rows are reported by line
+# number and do not stop the import.
+
+import asyncio
+import csv
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.events import queue_ticket_event
+from app.models import Ticket, TicketLog, TicketStatus, TicketPriority, TicketCategory, LogType
+from app.repositories import ImportRepository, TicketRepository, UserRepository
+from app.schemas import ImportJobResponse, ImportRowError
+
+
+IMPORT_KINDS = ("tickets", "logs", "comments")
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Failed rows kept in a job report (all of them go to on_error)
+MAX_REPORTED_ERRORS = 1000
+
+# Imports started through the API, by job id (reports stay until restart)
+_import_jobs: Dict[str, ImportJobResponse] = {}
+_import_tasks: set = set()
+
+
+class RowError(ValueError):
+    """A source row that cannot be imported"""
+    pass
+
+
+def _enum_values(enum_class, column) -> Dict[str, str]:
+    """Accepted spellings (label or name, any case) -> value stored by the column type"""
+    values = {}
+    for member, stored in zip(enum_class, column.type.enums):
+        values[member.value.lower()] = stored
+        values[member.name.lower()] = stored
+    return values
+
+
+STATUS_VALUES = _enum_values(TicketStatus, Ticket.__table__.c.status)
+PRIORITY_VALUES = _enum_values(TicketPriority, Ticket.__table__.c.priority)
+CATEGORY_VALUES = _enum_values(TicketCategory, Ticket.__table__.c.category)
+LOG_TYPE_VALUES = _enum_values(LogType, TicketLog.__table__.c.log_type)
+
+
+# ============================================
+# Row Parsing
+# ============================================
+
+def _text(row: dict, field: str, max_length: Optional[int] = None, required: bool = False) -> Optional[str]:
+    value = row.get(field)
+    if value is None or value == "":
+        if required:
+            raise RowError(f"{field} is required")
+        return None
+    value = str(value)
+    if max_length and len(value) > max_length:
+        raise RowError(f"{field} is longer than {max_length} characters")
+    return value
+
+
+def _choice(row: dict, field: str, values: Dict[str, str], default: Optional[str] = None) -> str:
+    value = row.get(field)
+    if value is None or value == "":
+        if default is None:
+            raise RowError(f"{field} is required")
+        return default
+    stored = values.get(str(value).strip().lower())
+    if stored is None:
+        raise RowError(f"{field}: unknown value {value!r}")
+    return stored
+
+
+def _timestamp(row: dict, field: str, default: Optional[datetime] = None) -> Optional[datetime]:
+    value = row.get(field)
+    if value is None or value == "":
+        return default
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise RowError(f"{field}: invalid timestamp {value!r}")
+    # Timestamps without an offset are taken as UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _user(
+    row: dict,
+    field: str,
+    users: Dict[str, int],
+    default: Optional[int] = None,
+    required: bool = True
+) -> Optional[int]:
+    value = row.get(field)
+    if value is None or value == "":
+        if default is None and required:
+            raise RowError(f"{field} is required")
+        return default
+    user_id = users.get(str(value).strip().lower())
+    if user_id is None:
+        raise RowError(f"{field}: no user with email {value!r}")
+    return user_id
+
+
+def _flag(row: dict, field: str) -> bool:
+    value = row.get(field)
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y", "t")
+
+
+def _read_rows(file: TextIO, format: str) -> Iterator[Tuple[int, Optional[dict]]]:
+    """(line number, row) pairs; row is None for a line that is not a JSON object"""
+    if format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, content in enumerate(file, 1):
+        if not content.strip():
+            continue
+        try:
+            row = json.loads(content)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else None
+
+
+class ImportService:
+    """Service for bulk imports of tickets, ticket logs and comments"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.import_repo = ImportRepository(db)
+        self.ticket_repo = TicketRepository(db)
+        self.user_repo = UserRepository(db)
+    
+    async def run(
+        self,
+        kind: str,
+        file: TextIO,
+        format: str,
+        report: ImportJobResponse,
+        default_user_id: Optional[int] = None,
+        on_error: Optional[Callable[[ImportRowError], None]] = None,
+        on_progress: Optional[Callable[[ImportJobResponse], None]] = None
+    ) -> ImportJobResponse:
+        """
+        Import every row of file into report.kind, one committed chunk at a
+        time, updating report as chunks finish. default_user_id stands in for
+        an empty creator/user/author column. on_error receives every failed
+        row, on_progress the report after each chunk.
+        """
+        start = time.perf_counter()
+        users = await self.user_repo.get_ids_by_email()
+        validate = getattr(self, f"_{kind}_row")
+        rows = _read_rows(file, format)
+        
+        try:
+            while True:
+                # Reading and validating is plain CPU work; keep it off the event loop
+                chunk = await asyncio.to_thread(list, islice(rows, settings.import_chunk_size))
+                if not chunk:
+                    break
+                valid, errors = await asyncio.to_thread(
+                    self._validate, chunk, validate, users, default_user_id
+                )
+                
+                if kind == "tickets":
+                    rejected = await self.import_repo.import_tickets(valid)
+                    errors += [ImportRowError(line=line, error=f"ticket_id {ref} already exists") for line, ref in rejected]
+                    if len(rejected) < len(valid):
+                        # The tickets keep their updated_at from the file, so
+                        # clients syncing through /tickets/changes reload
+                        await self.ticket_repo.mark_changes_reset()
+                        queue_ticket_event(self.db, "created")
+                else:
+                    merge = self.import_repo.import_logs if kind == "logs" else self.import_repo.import_comments
+                    rejected = await merge(valid)
+                    errors += [ImportRowError(line=line, error=f"no ticket with ticket_id {ref!r}") for line, ref in rejected]
+                await self.db.commit()
+                
+                report.rows_read += len(chunk)
+                report.rows_imported += len(valid) - len(rejected)
+                self._record_errors(report, errors, on_error)
+                report.rows_per_second = round(report.rows_read / (time.perf_counter() - start), 1)
+                if on_progress:
+                    on_progress(report)
+            report.status = "completed"
+        except Exception as e:
+            await self.db.rollback()
+            report.status = "failed"
+            report.error = str(e)
+            print(f"[Import] {kind} import {report.id} failed after {report.rows_read} rows: {e}")
+        
+        report.finished_at = datetime.now(timezone.utc)
+        return report
+    
+    # ============================================
+    # Job Tracking (API imports run in the background)
+    # ============================================
+    
+    @classmethod
+    def start_job(cls, kind: str, format: str, path: str, default_user_id: int) -> ImportJobResponse:
+        """
+        Import the file at path in a background task with its own session and
+        return the job report, which is updated as the import progresses.
+        The file is deleted when the import ends.
+        """
+        report = ImportJobResponse(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            format=format,
+            started_at=datetime.now(timezone.utc)
+        )
+        _import_jobs[report.id] = report
+        task = asyncio.create_task(cls._run_job(report, path, default_user_id))
+        # The event loop keeps only weak references to tasks
+        _import_tasks.add(task)
+        task.add_done_callback(_import_tasks.discard)
+        return report
+    
+    @staticmethod
+    def get_job(job_id: str) -> Optional[ImportJobResponse]:
+        """Report of an import started by this process"""
+        return _import_jobs.get(job_id)
+    
+    @staticmethod
+    async def _run_job(report: ImportJobResponse, path: str, default_user_id: int) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                with open(path, encoding="utf-8-sig", newline="") as file:
+                    await ImportService(db).run(report.kind, file, report.format, report, default_user_id)
+        finally:
+            os.unlink(path)
+    
+    # ============================================
+    # Validation
+    # ============================================
+    
+    @staticmethod
+    def _validate(
+        chunk: List[Tuple[int, Optional[dict]]],
+        validate: Callable,
+        users: Dict[str, int],
+        default_user_id: Optional[int]
+    ) -> Tuple[List[tuple], List[ImportRowError]]:
+        """Split a chunk into COPY-ready tuples and row errors"""
+        now = datetime.now(timezone.utc)
+        valid, errors = [], []
+        for line, row in chunk:
+            if row is None:
+                errors.append(ImportRowError(line=line, error="not a JSON object"))
+                continue
+            try:
+                valid.append(validate(line, row, users, default_user_id, now))
+            except RowError as e:
+                errors.append(ImportRowError(line=line, error=str(e)))
+        return valid, errors
+    
+    @staticmethod
+    def _tickets_row(line: int, row: dict, users: Dict[str, int], default_user_id: Optional[int], now: datetime) -> tuple:
+        """Ticket tuple in TICKET_IMPORT_COLUMNS order (without a ticket_id, the merge numbers it)"""
+        created_at = _timestamp(row, "created_at", now)
+        resolved_at = _timestamp(row, "resolved_at")
+        resolution_time = None
+        if resolved_at:
+            resolution_time = int((resolved_at - created_at).total_seconds() / 60)
+        priority = _choice(row, "priority", PRIORITY_VALUES, PRIORITY_VALUES["medium"])
+        # Without a due date in the file, the SLA target of the priority applies
+        sla_due_date = _timestamp(row, "sla_due_date") or created_at + settings.sla_target(priority)
+        return (
+            line,
+            _text(row, "ticket_id", 50),
+            _text(row, "title", 500, required=True),
+            _text(row, "description", required=True),
+            _choice(row, "status", STATUS_VALUES, STATUS_VALUES["open"]),
+            priority,
+            _choice(row, "category", CATEGORY_VALUES, CATEGORY_VALUES["other"]),
+            _user(row, "created_by", users, default_user_id),
+            _user(row, "assigned_to", users, required=False),
+            sla_due_date,
+            resolution_time,
+            created_at,
+            _timestamp(row, "updated_at", created_at),
+            resolved_at,
+        )
+    
+    @staticmethod
+    def _logs_row(line: int, row: dict, users: Dict[str, int], default_user_id: Optional[int], now: datetime) -> tuple:
+        """Ticket log tuple in LOG_IMPORT_COLUMNS order"""
+        return (
+            line,
+            _text(row, "ticket_id", 50, required=True),
+            _user(row, "user", users, default_user_id),
+            _choice(row, "log_type", LOG_TYPE_VALUES),
+            _text(row, "action", 500, required=True),
+            _text(row, "old_value", 255),
+            _text(row, "new_value", 255),
+            _timestamp(row, "created_at", now),
+        )
+    
+    @staticmethod
+    def _comments_row(line: int, row: dict, users: Dict[str, int], default_user_id: Optional[int], now: datetime) -> tuple:
+        """Comment tuple in COMMENT_IMPORT_COLUMNS order"""
+        return (
+            line,
+            _text(row, "ticket_id", 50, required=True),
+            _user(row, "author", users, default_user_id),
+            _text(row, "content", required=True),
+            _flag(row, "is_internal"),
+            False,
+            _timestamp(row, "created_at", now),
+        )
+    
+    @staticmethod
+    def _record_errors(
+        report: ImportJobResponse,
+        errors: List[ImportRowError],
+        on_error: Optional[Callable[[ImportRowError], None]]
+    ) -> None:
+        errors.sort(key=lambda error: error.line)
+        report.rows_failed += len(errors)
+        report.errors.extend(errors[:max(0, MAX_REPORTED_ERRORS - len(report.errors))])
+        if on_error:
+            for error in errors:
+                on_error(error)
@@ -0,0 +1,213 @@
+# ============================================
+# PIVOT ENGINE - Ad-hoc Pivots over the Ticket Snapshot (DuckDB)
+# ============================================
+# Pivots such as category x week or assignee x status are aggregated by an
+# embedded DuckDB over the Parquet files of the latest analytics snapshot
+# (services/snapshot_service.py), so they never reach PostgreSQL. Only the
+# dimensions and measures listed below can be asked for; each maps to a
+# fixed SQL expression. A result only depends on the snapshot it was read
+# from, so results are kept (least recently used first out) under the
+# snapshot's taken_at and are never invalidated by ticket writes: the next
+# snapshot simply makes new keys.
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models import TicketCategory, TicketPriority, TicketStatus
+from app.schemas import PivotResponse
+from app.services.snapshot_service import snapshot_writer
+
+
+_UTC_CREATED_AT = "timezone('UTC', created_at)"
+
+# Dimension name -> SQL expression over the tickets snapshot
+DIMENSIONS = {
+    "status": "status",
+    "priority": "priority",
+    "category": "category",
+    "assignee": "assigned_to",
+    "creator": "created_by",
+    "day": f"CAST({_UTC_CREATED_AT} AS DATE)",
+    "week": f"CAST(date_trunc('week', {_UTC_CREATED_AT}) AS DATE)",  # Weeks start on Monday
+    "month": f"CAST(date_trunc('month', {_UTC_CREATED_AT}) AS DATE)"
+}
+
+_CLOSED_LABELS = ", ".join(f"'{status.value}'" for status in (TicketStatus.RESOLVED, TicketStatus.CLOSED))
+
+# Measure name -> (SQL aggregate, value of an empty cell)
+MEASURES = {
+    "count": ("count(*)", 0),
+    "open": (f"count(*) FILTER (WHERE status NOT IN ({_CLOSED_LABELS}))", 0),
+    "resolved": ("count(resolved_at)", 0),
+    "avg_resolution_hours": ("round(avg(resolution_time) / 60.0, 2)", None),
+    "median_resolution_hours": ("round(median(resolution_time) / 60.0, 2)", None),
+    "p90_resolution_hours": ("round(quantile_cont(resolution_time, 0.9) / 60.0, 2)", None)
+}
+
+# Enum dimensions are listed in enum order, others by value
+_ENUM_ORDER = {
+    "status": [status.value for status in TicketStatus],
+    "priority": [priority.value for priority in TicketPriority],
+    "category": [category.value for category in TicketCategory]
+}
+
+
+class PivotUnavailableError(RuntimeError):
+    """No pivot engine (duckdb is not installed) or no snapshot to query yet"""
+
+
+def _key_label(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _sorted_keys(dimension: str, keys: set) -> List[Any]:
+    """Keys in enum order or by value, missing values (None) last"""
+    present = [key for key in keys if key is not None]
+    if dimension in _ENUM_ORDER:
+        order = {label: position for position, label in enumerate(_ENUM_ORDER[dimension])}
+        present.sort(key=lambda key: order.get(key, len(order)))
+    else:
+        present.sort()
+    return present + ([None] if None in keys else [])
+
+
+class PivotEngine:
+    """Pivot queries over the tickets of the analytics snapshot (one DuckDB per process)"""
+    
+    def __init__(self):
+        self._connection = None
+        self._results: "OrderedDict[tuple, PivotResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def status(self) -> dict:
+        return {
+            "available": self._connection is not None,
+            "cached_results": len(self._results),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+    
+    def _connect(self):
+        if self._connection is None:
+            try:
+                import duckdb
+            except ImportError:
+                raise PivotUnavailableError("Pivot queries need the duckdb package")
+            self._connection = duckdb.connect()
+        return self._connection
+    
+    async def pivot(
+        self,
+        rows: str,
+        cols: Optional[str] = None,
+        measure: str = "count",
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> PivotResponse:
+        """
+        measure per rows value (and cols value) over the tickets created in
+        [start, end] (UTC days; default: all) of the latest snapshot.
+        Raises ValueError for an unknown dimension or measure, an empty
+        range or more than PIVOT_MAX_CELLS cells.
+        """
+        if rows not in DIMENSIONS or (cols is not None and cols not in DIMENSIONS):
+            raise ValueError(f"Unknown dimension (expected one of: {', '.join(DIMENSIONS)})")
+        if cols == rows:
+            raise ValueError("rows and cols must be different dimensions")
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure (expected one of: {', '.join(MEASURES)})")
+        if start and end and start > end:
+            raise ValueError("start must not be after end")
+        
+        manifest = snapshot_writer.manifest()
+        if manifest is None:
+            raise PivotUnavailableError("No analytics snapshot has been written yet")
+        connection = self._connect()
+        
+        key = (manifest["taken_at"], rows, cols, measure, start, end)
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return cached.model_copy(update={"cached": True})
+        self.misses += 1
+        
+        started = time.perf_counter()
+        # Only the months in range are read
+        months = [
+            month for month in manifest["tables"].get("tickets", {})
+            if (start is None or month >= start.strftime("%Y-%m")) and (end is None or month <= end.strftime("%Y-%m"))
+        ]
+        files = [snapshot_writer.partition_path("tickets", month) for month in months]
+        cells = await asyncio.to_thread(self._query, connection, files, rows, cols, measure, start, end) if files else []
+        
+        row_keys = _sorted_keys(rows, {row for row, _, _ in cells})
+        col_keys = _sorted_keys(cols, {col for _, col, _ in cells}) if cols else ["total"]
+        if len(row_keys) * len(col_keys) > settings.pivot_max_cells:
+            raise ValueError(
+                f"{len(row_keys)} x {len(col_keys)} cells; at most {settings.pivot_max_cells} are allowed"
+            )
+        empty = MEASURES[measure][1]
+        row_index = {row: position for position, row in enumerate(row_keys)}
+        col_index = {col: position for position, col in enumerate(col_keys)}
+        values = [[empty] * len(col_keys) for _ in row_keys]
+        for row, col, value in cells:
+            values[row_index[row]][col_index[col if cols else "total"]] = value
+        
+        result = PivotResponse(
+            rows=rows,
+            cols=cols,
+            measure=measure,
+            row_keys=[_key_label(row) for row in row_keys],
+            col_keys=[_key_label(col) for col in col_keys],
+            values=values,
+            snapshot_taken_at=manifest["taken_at"],
+            query_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+        self._results[key] = result
+        while len(self._results) > settings.pivot_cache_size:
+            self._results.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _query(
+        connection: Any,
+        files: List[str],
+        rows: str,
+        cols: Optional[str],
+        measure: str,
+        start: Optional[date],
+        end: Optional[date]
+    ) -> List[Tuple[Any, Any, Any]]:
+        """(row, col, value) of the non-empty cells; col is None without cols"""
+        conditions, parameters = [], {"files": files}
+        if start:
+            conditions.append("created_at >= $start")
+            parameters["start"] = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+        if end:
+            conditions.append("created_at < $end")
+            parameters["end"] = datetime(end.year, end.month, end.day, tzinfo=timezone.utc) + timedelta(days=1)
+        query = f"""
+            SELECT {DIMENSIONS[rows]}, {DIMENSIONS[cols] if cols else 'NULL'}, {MEASURES[measure][0]}
+            FROM read_parquet($files)
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            GROUP BY ALL
+        """
+        # A cursor per query: one DuckDB connection is not shared across threads
+        cursor = connection.cursor()
+        try:
+            return cursor.execute(query, parameters).fetchall()
+        finally:
+            cursor.close()
+
+
+pivot_engine = PivotEngine()
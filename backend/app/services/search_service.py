@@ -0,0 +1,56 @@
+# ============================================
+# SEARCH SERVICE - Cross-entity Search Operations
+# ============================================
+
+import re
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories import TicketRepository, UserRepository, SearchTermRepository
+from app.repositories.ticket_repository import TICKET_ID_PATTERN
+from app.schemas import SearchSuggestResponse, TicketSuggestion, UserBrief
+
+
+# Alphanumeric words of the input; at most MAX_SUGGEST_WORDS are used
+WORD_PATTERN = re.compile(r"[^\W_]+")
+MAX_SUGGEST_WORDS = 5
+
+
+class SearchService:
+    """Service for search across tickets and users"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.ticket_repo = TicketRepository(db)
+        self.user_repo = UserRepository(db)
+        self.term_repo = SearchTermRepository(db)
+    
+    async def suggest(self, query: str, limit: int = 5) -> SearchSuggestResponse:
+        """
+        Typo-tolerant autocomplete.
+        Ticket ids ("T-12") are matched by prefix. Otherwise each word is also
+        tried in its closest spelling from the title lexicon, and users are
+        matched by trigram similarity of name or email.
+        """
+        if TICKET_ID_PATTERN.match(query):
+            tickets = await self.ticket_repo.suggest_by_ticket_id(query, limit)
+            return SearchSuggestResponse(
+                tickets=[TicketSuggestion.model_validate(t) for t in tickets],
+                users=[]
+            )
+        
+        words = WORD_PATTERN.findall(query.lower())[:MAX_SUGGEST_WORDS]
+        corrections = await self.term_repo.correct(words)
+        word_variants = [
+            [word] if correction in (None, word) else [word, correction]
+            for word, correction in zip(words, corrections)
+        ]
+        
+        tickets = []
+        if word_variants:
+            tickets = await self.ticket_repo.suggest_by_title(word_variants, limit)
+        users = await self.user_repo.suggest(query, limit)
+        
+        return SearchSuggestResponse(
+            tickets=[TicketSuggestion.model_validate(t) for t in tickets],
+            users=[UserBrief.model_validate(u) for u in users]
+        )
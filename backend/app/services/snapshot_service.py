@@ -0,0 +1,329 @@
+# ============================================
+# SNAPSHOT SERVICE - Columnar Analytics Snapshots (Parquet)
+# ============================================
+# Reporting tools read Parquet files instead of paging through /tickets.
+# Tickets, ticket logs and email classifications are written to
+# {SNAPSHOT_DIR}/{table}/month=YYYY-MM/part.parquet (Hive-style partitions,
+# by the UTC month a row was created or received), with the enum columns
+# dictionary-encoded. Each run after the first only rewrites the months with
+# rows changed since the previous run (updated_at, or new ids) and the
+# months that held deleted tickets, so a partition never has two versions of
+# a row. manifest.json, written last, lists the partitions of the snapshot.
+
+import asyncio
+import json
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum as SQLEnum, Float, Integer
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, advisory_lock
+from app.repositories import SnapshotRepository, SnapshotTable, SNAPSHOT_TABLES, TicketRepository
+from app.schemas import SnapshotPartition, SnapshotTableInfo, SnapshotManifestResponse
+
+
+# Advisory lock key: one worker writes snapshots at a time
+SNAPSHOT_LOCK_KEY = 48_0001
+MANIFEST_FILE = "manifest.json"
+PARTITION_FILE = "part.parquet"
+
+
+def _arrow_type(column: Any, dictionary: bool = False) -> pa.DataType:
+    """Arrow type of a model column"""
+    sql_type = column.type
+    if isinstance(sql_type, SQLEnum):
+        return pa.dictionary(pa.int8(), pa.string())
+    if dictionary:
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(sql_type, BigInteger):
+        return pa.int64()
+    if isinstance(sql_type, Integer):
+        return pa.int32()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    return pa.string()
+
+
+def _arrow_schema(table: SnapshotTable) -> pa.Schema:
+    dictionary = {column.key for column in table.dictionary_columns}
+    return pa.schema([
+        pa.field(column.key, _arrow_type(column, column.key in dictionary))
+        for column in table.columns
+    ])
+
+
+def _arrow_array(column: Any, field: pa.Field, values: List[Any]) -> pa.Array:
+    sql_type = column.type
+    if isinstance(sql_type, SQLEnum):
+        # The same dictionary (all labels, in enum order) in every partition
+        members = list(sql_type.enum_class)
+        codes = {member: code for code, member in enumerate(members)}
+        indices = pa.array([None if value is None else codes[value] for value in values], pa.int8())
+        return pa.DictionaryArray.from_arrays(indices, pa.array([member.value for member in members]))
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, pa.string()).dictionary_encode()
+    return pa.array(values, field.type)
+
+
+def _record_batch(table: SnapshotTable, schema: pa.Schema, rows: List[Any]) -> pa.RecordBatch:
+    columns = list(zip(*rows))
+    return pa.record_batch(
+        [_arrow_array(column, field, list(values)) for column, field, values in zip(table.columns, schema, columns)],
+        schema=schema
+    )
+
+
+def _month_bounds(month: date) -> tuple:
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end = datetime(month.year + month.month // 12, month.month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def _contains_any(path: str, column: str, ids: List[int]) -> bool:
+    """Whether a partition file has a row with one of the ids in column"""
+    values = pq.read_table(path, columns=[column]).column(column)
+    return pc.any(pc.is_in(values, value_set=pa.array(ids, values.type))).as_py() or False
+
+
+class SnapshotWriter:
+    """Writes the Parquet snapshots of this deployment (one run at a time)"""
+    
+    def __init__(self, batch_size: int = 10000):
+        self.batch_size = batch_size
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_run_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+    
+    @property
+    def directory(self) -> str:
+        return settings.snapshot_dir
+    
+    @property
+    def running(self) -> bool:
+        return self._lock.locked() or (self._task is not None and not self._task.done())
+    
+    def status(self) -> dict:
+        manifest = self.manifest()
+        return {
+            "running": self.running,
+            "taken_at": manifest["taken_at"] if manifest else None,
+            "last_run_ms": self._last_run_ms,
+            "last_error": self._last_error
+        }
+    
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """The manifest of the latest snapshot, or None before the first one"""
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+    
+    def describe(self) -> SnapshotManifestResponse:
+        """The manifest with the download path of each partition"""
+        manifest = self.manifest() or {}
+        tables = []
+        for name, months in manifest.get("tables", {}).items():
+            partitions = [
+                SnapshotPartition(month=month, path=f"/api/v1/admin/snapshots/{name}/{month}", **partition)
+                for month, partition in months.items()
+            ]
+            tables.append(SnapshotTableInfo(
+                name=name,
+                rows=sum(partition.rows for partition in partitions),
+                partitions=partitions
+            ))
+        return SnapshotManifestResponse(
+            taken_at=manifest.get("taken_at"),
+            full_at=manifest.get("full_at"),
+            running=self.running,
+            last_run_ms=self._last_run_ms,
+            tables=tables
+        )
+    
+    def partition_path(self, table: str, month: str) -> str:
+        return os.path.join(self.directory, table, f"month={month}", PARTITION_FILE)
+    
+    def start(self, full: bool = False) -> bool:
+        """Run in the background; False if a run is already going"""
+        if self.running:
+            return False
+        self._task = asyncio.get_running_loop().create_task(self._run_in_background(full))
+        return True
+    
+    async def _run_in_background(self, full: bool) -> None:
+        try:
+            await self.run(full)
+        except Exception:
+            pass  # Printed and kept for status() by run
+    
+    async def run(self, full: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Write the snapshot and return its manifest (None if another worker
+        is writing it). The months changed since the previous snapshot are
+        rewritten; full rewrites every month, as do runs after a ticket
+        import or truncate, when the tombstones of deleted tickets since
+        the previous snapshot were pruned, and every SNAPSHOT_REBUILD_DAYS
+        (which also picks up rows committed with an older updated_at).
+        """
+        async with self._lock, advisory_lock(SNAPSHOT_LOCK_KEY) as locked:
+            if not locked:
+                print("[Snapshot] Another worker is writing the snapshot")
+                return None
+            started = time.perf_counter()
+            try:
+                manifest = await self._write(full)
+            except Exception as e:
+                self._last_error = str(e)
+                print(f"[Snapshot] Snapshot failed: {e}")
+                raise
+            self._last_error = None
+            self._last_run_ms = round((time.perf_counter() - started) * 1000, 2)
+            return manifest
+    
+    async def _write(self, full: bool) -> Dict[str, Any]:
+        previous = self.manifest()
+        async with AsyncSessionLocal() as db:
+            ticket_repo = TicketRepository(db)
+            repo = SnapshotRepository(db)
+            # Rows changed from here on are picked up by the next run
+            taken_at = await ticket_repo.get_change_horizon()
+            last_ids = {name: await repo.get_max_id(table) for name, table in SNAPSHOT_TABLES.items()}
+            
+            since: Optional[datetime] = None
+            deleted: List[int] = []
+            if not full and not await self._needs_rebuild(previous, ticket_repo, taken_at):
+                since = datetime.fromisoformat(previous["taken_at"])
+                deleted = await repo.get_deleted_ticket_ids(since)
+            await db.commit()
+            
+            manifest = {
+                "taken_at": taken_at.isoformat(),
+                "full_at": taken_at.isoformat() if since is None else previous["full_at"],
+                "last_ids": last_ids,
+                "tables": {}
+            }
+            for name, table in SNAPSHOT_TABLES.items():
+                partitions = {} if since is None else dict(previous["tables"].get(name, {}))
+                if since is None:
+                    months = {month.strftime("%Y-%m") for month in await repo.get_months(table)}
+                else:
+                    months = {
+                        month.strftime("%Y-%m")
+                        for month in await repo.get_months(table, since, previous["last_ids"].get(name, 0))
+                    }
+                    if deleted and table.ticket_column is not None:
+                        months |= await self._months_with_tickets(name, table, partitions, deleted)
+                await db.commit()
+                
+                for month in sorted(months):
+                    rows, size = await self._write_partition(repo, table, month)
+                    # Each month is read in its own short transaction
+                    await db.commit()
+                    if rows:
+                        partitions[month] = {
+                            "rows": rows,
+                            "bytes": size,
+                            "written_at": datetime.now(timezone.utc).isoformat()
+                        }
+                    else:
+                        partitions.pop(month, None)
+                if since is None:
+                    await asyncio.to_thread(self._remove_other_partitions, name, set(partitions))
+                manifest["tables"][name] = dict(sorted(partitions.items()))
+                print(f"[Snapshot] {name}: {len(months)} of {len(partitions)} months written")
+        
+        await asyncio.to_thread(self._write_manifest, manifest)
+        return manifest
+    
+    async def _needs_rebuild(
+        self,
+        previous: Optional[Dict[str, Any]],
+        ticket_repo: TicketRepository,
+        taken_at: datetime
+    ) -> bool:
+        if previous is None:
+            return True
+        previous_at = datetime.fromisoformat(previous["taken_at"])
+        if taken_at - datetime.fromisoformat(previous["full_at"]) > timedelta(days=settings.snapshot_rebuild_days):
+            return True
+        # Tombstones of tickets deleted since then may be pruned already
+        if taken_at - previous_at > timedelta(days=settings.ticket_tombstone_retention_days):
+            return True
+        reset_at = await ticket_repo.get_changes_reset_at()
+        return reset_at is not None and reset_at >= previous_at
+    
+    async def _months_with_tickets(
+        self,
+        name: str,
+        table: SnapshotTable,
+        partitions: Dict[str, Any],
+        ticket_ids: List[int]
+    ) -> set:
+        """The written months of a table with rows of the tickets"""
+        months = set()
+        for month in partitions:
+            path = self.partition_path(name, month)
+            if not os.path.exists(path) or await asyncio.to_thread(
+                _contains_any, path, table.ticket_column.key, ticket_ids
+            ):
+                months.add(month)
+        return months
+    
+    async def _write_partition(self, repo: SnapshotRepository, table: SnapshotTable, month: str) -> tuple:
+        """Rewrite the file of one month: (rows, bytes); the file is removed when the month has no rows"""
+        path = self.partition_path(table.name, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        schema = _arrow_schema(table)
+        start, end = _month_bounds(datetime.strptime(month, "%Y-%m").date())
+        
+        rows = 0
+        writer = pq.ParquetWriter(temp_path, schema, compression="zstd")
+        try:
+            async for batch in repo.stream_month(table, start, end, self.batch_size):
+                record_batch = _record_batch(table, schema, batch)
+                await asyncio.to_thread(writer.write_batch, record_batch)
+                rows += len(batch)
+        except BaseException:
+            writer.close()
+            os.remove(temp_path)
+            raise
+        writer.close()
+        
+        if not rows:
+            os.remove(temp_path)
+            shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+            return 0, 0
+        os.replace(temp_path, path)
+        return rows, os.path.getsize(path)
+    
+    def _remove_other_partitions(self, name: str, months: set) -> None:
+        table_dir = os.path.join(self.directory, name)
+        if not os.path.isdir(table_dir):
+            return
+        for entry in os.listdir(table_dir):
+            if entry.partition("=")[2] not in months:
+                shutil.rmtree(os.path.join(table_dir, entry), ignore_errors=True)
+    
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+
+snapshot_writer = SnapshotWriter()
@@ -0,0 +1,250 @@
+# ============================================
+# TICKET MIRROR - In-memory Columns of the Ticket Dimensions
+# ============================================
+# Status, priority and category counts under any combination of filters
+# are the most frequent dashboard queries. The mirror keeps the columns
+# they filter on in NumPy arrays indexed by ticket id: one int16 group code
+# for (status, priority, category), an int32 assignee and datetime64[us]
+# created_at and resolved_at, 22 bytes a ticket (plus up to a quarter more
+# of room to grow). It also keeps the number of tickets per group, so
+# counts filtered by status, priority and category only are read from that
+# small table; assignee and date filters are vectorized comparisons over
+# the columns followed by one bincount of the groups. It is loaded in
+# the background at startup. After ticket writes commit (ticket_events,
+# including the events relayed from other workers) the changed tickets are
+# read again by id; an event without ticket ids (imports) reloads it all.
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from itertools import product
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.database import AsyncSessionLocal
+from app.core.events import ticket_events
+from app.models import TicketCategory, TicketPriority, TicketStatus
+from app.repositories import TicketRepository
+from app.schemas import TicketCountFilters
+
+
+STATUSES = list(TicketStatus)
+PRIORITIES = list(TicketPriority)
+CATEGORIES = list(TicketCategory)
+GROUP_SHAPE = (len(STATUSES), len(PRIORITIES), len(CATEGORIES))
+_GROUPS = len(STATUSES) * len(PRIORITIES) * len(CATEGORIES)
+# (status, priority, category) -> code, in the order of a GROUP_SHAPE array
+_GROUP_CODES = {group: code for code, group in enumerate(product(STATUSES, PRIORITIES, CATEGORIES))}
+
+_NO_TICKET = _GROUPS  # Group code of ids without a ticket
+_NOT_RESOLVED = np.iinfo(np.int64).min  # Read as NaT (never matches a range)
+
+
+def _datetime64(value: datetime) -> np.datetime64:
+    """A UTC datetime64[us] (naive datetimes are UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+class TicketMirror:
+    """The dimension columns of every ticket, in memory (per process)"""
+    
+    def __init__(self, batch_size: int = 50000):
+        self.batch_size = batch_size
+        self._lock = asyncio.Lock()
+        self._allocate(0)
+        self._group_counts = np.zeros(_GROUPS + 1, dtype=np.int64)  # Tickets per group code
+        self.loaded = False
+        self._active = False  # Following ticket events (between start and stop)
+        self._load_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._pending: Set[int] = set()
+        self._reload = False
+        self._last_load_ms: Optional[float] = None
+        self.refreshed_tickets = 0
+    
+    def _allocate(self, capacity: int) -> None:
+        self._group = np.full(capacity, _NO_TICKET, dtype=np.int16)
+        self._assigned_to = np.zeros(capacity, dtype=np.int32)  # 0: unassigned
+        self._created_at = np.zeros(capacity, dtype="datetime64[us]")
+        self._resolved_at = np.full(capacity, np.datetime64("NaT"), dtype="datetime64[us]")
+    
+    @property
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        return self._group, self._assigned_to, self._created_at, self._resolved_at
+    
+    def _grow(self, max_id: int) -> None:
+        """Make room for ids up to max_id (a quarter more each time, so appends stay amortized O(1))"""
+        if max_id < len(self._group):
+            return
+        old = self._columns
+        self._allocate(max(max_id + 1, len(self._group) + len(self._group) // 4, 1024))
+        for new, column in zip(self._columns, old):
+            new[:len(column)] = column
+    
+    def status(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "tickets": int(self._group_counts[:_GROUPS].sum()),
+            "bytes": sum(column.nbytes for column in self._columns),
+            "last_load_ms": self._last_load_ms,
+            "refreshed_tickets": self.refreshed_tickets
+        }
+    
+    # ============================================
+    # Loading and events
+    # ============================================
+    
+    def start(self) -> None:
+        """Load the mirror in the background (counts use SQL until it is loaded)"""
+        self._active = True
+        if self._load_task is None or self._load_task.done():
+            self._load_task = asyncio.get_running_loop().create_task(self.load())
+    
+    async def stop(self) -> None:
+        self._active = False
+        for task in (self._load_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self.loaded = False
+    
+    async def load(self) -> None:
+        """Read the dimensions of every ticket, by id in batches (counts use SQL meanwhile)"""
+        async with self._lock:
+            started = time.perf_counter()
+            self.loaded = False
+            self._pending.clear()
+            self._reload = False
+            self._allocate(0)
+            self._group_counts[:] = 0
+            last_id = 0
+            try:
+                async with AsyncSessionLocal() as db:
+                    tickets = TicketRepository(db)
+                    while True:
+                        rows = await tickets.get_dimensions(last_id, self.batch_size)
+                        if rows:
+                            self._store(rows)
+                            last_id = rows[-1][0]
+                        if len(rows) < self.batch_size:
+                            break
+            except Exception as e:
+                print(f"[TicketMirror] Load failed, counts use SQL: {e}")
+                self.loaded = False
+                return
+            self.loaded = True
+            self._last_load_ms = round((time.perf_counter() - started) * 1000, 2)
+            print(f"[TicketMirror] Loaded {self.status()['tickets']} tickets in {self._last_load_ms} ms")
+    
+    def _store(self, rows: List[tuple]) -> None:
+        ids, statuses, priorities, categories, assignees, created, resolved = zip(*rows)
+        ids = np.array(ids, dtype=np.int64)
+        self._grow(int(ids.max()))
+        groups = np.array(
+            [_GROUP_CODES[group] for group in zip(statuses, priorities, categories)], dtype=np.int16
+        )
+        self._set_groups(ids, groups)
+        self._assigned_to[ids] = [assignee or 0 for assignee in assignees]
+        self._created_at[ids] = np.array(created, dtype=np.int64).view("datetime64[us]")
+        self._resolved_at[ids] = np.array(
+            [_NOT_RESOLVED if value is None else value for value in resolved], dtype=np.int64
+        ).view("datetime64[us]")
+    
+    def _set_groups(self, ids: np.ndarray, groups: np.ndarray) -> None:
+        """Move tickets (unique ids) to new group codes, keeping the counts per group"""
+        self._group_counts -= np.bincount(self._group[ids], minlength=_GROUPS + 1)
+        self._group_counts += np.bincount(groups, minlength=_GROUPS + 1)
+        self._group[ids] = groups
+    
+    def on_ticket_event(self, payload: dict) -> None:
+        """ticket_events handler: read the changed tickets again"""
+        if not self._active:
+            return
+        if payload["ticket_ids"]:
+            self._pending.update(payload["ticket_ids"])
+        else:
+            self._reload = True
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh())
+    
+    async def _refresh(self) -> None:
+        # Events arriving while a refresh runs are picked up by its next round
+        while self._pending or self._reload:
+            if self._reload:
+                await self.load()
+                continue
+            async with self._lock:
+                ids, self._pending = sorted(self._pending), set()
+                try:
+                    async with AsyncSessionLocal() as db:
+                        rows = await TicketRepository(db).get_dimensions(ids=ids)
+                except Exception as e:
+                    print(f"[TicketMirror] Refresh failed, reloading: {e}")
+                    self._reload = True
+                    continue
+                # Tickets that are gone were deleted
+                gone = np.array(sorted(set(ids) - {row[0] for row in rows}), dtype=np.int64)
+                gone = gone[gone < len(self._group)]
+                self._set_groups(gone, np.full(len(gone), _NO_TICKET, dtype=np.int16))
+                if rows:
+                    self._store(rows)
+                self.refreshed_tickets += len(ids)
+    
+    # ============================================
+    # Counts
+    # ============================================
+    
+    def count(self, filters: TicketCountFilters) -> Tuple[int, Dict[str, int], Dict[str, int], Dict[str, int]]:
+        """(total, per status label, per priority label, per category label) of the matching tickets"""
+        mask = None
+        
+        def narrow(condition: np.ndarray) -> None:
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+        
+        if filters.assigned_to:
+            if len(filters.assigned_to) <= 8:
+                # A few comparisons beat np.isin, which sorts
+                narrow(np.logical_or.reduce([self._assigned_to == user_id for user_id in filters.assigned_to]))
+            else:
+                narrow(np.isin(self._assigned_to, filters.assigned_to))
+        if filters.assigned is not None:
+            narrow((self._assigned_to != 0) if filters.assigned else (self._assigned_to == 0))
+        if filters.created_after:
+            narrow(self._created_at >= _datetime64(filters.created_after))
+        if filters.created_before:
+            narrow(self._created_at < _datetime64(filters.created_before))
+        if filters.resolved_after:
+            narrow(self._resolved_at >= _datetime64(filters.resolved_after))
+        if filters.resolved_before:
+            narrow(self._resolved_at < _datetime64(filters.resolved_before))
+        
+        if mask is None:
+            counts = self._group_counts[:_GROUPS]
+        else:
+            counts = np.bincount(self._group[mask], minlength=_GROUPS + 1)[:_GROUPS]
+        counts = counts.reshape(GROUP_SHAPE).copy()
+        
+        # Status, priority and category filters select groups, not tickets
+        for axis, (selected, members) in enumerate((
+            (filters.status, STATUSES), (filters.priority, PRIORITIES), (filters.category, CATEGORIES)
+        )):
+            if selected:
+                labels = {value.value for value in selected}
+                excluded = [code for code, member in enumerate(members) if member.value not in labels]
+                np.moveaxis(counts, axis, 0)[excluded] = 0
+        
+        def by(axes: tuple, members: list) -> Dict[str, int]:
+            return {member.value: int(count) for member, count in zip(members, counts.sum(axis=axes))}
+        
+        return int(counts.sum()), by((1, 2), STATUSES), by((0, 2), PRIORITIES), by((0, 1), CATEGORIES)
+
+
+ticket_mirror = TicketMirror()
+ticket_events.subscribe(ticket_mirror.on_ticket_event)
@@ -2,11 +2,21 @@
 # TICKET SERVICE - Ticket Management Operations
 # ============================================
 
-from typing import Optional, List, Tuple
+import uuid
+from typing import Optional, List, Tuple, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from sqlalchemy.orm.attributes import set_committed_value
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.database import is_database_unavailable
+from app.core.events import queue_ticket_event
+from app.core.spool import ticket_spool
 
 from app.repositories import (
+    encode_cursor,
+    decode_cursor,
+    InvalidCursorError,
     TicketRepository,
     TicketLogRepository,
     TicketCommentRepository,
@@ -17,6 +27,7 @@ from app.models import (
     Ticket,
     TicketLog,
     TicketComment,
+    User,
     TicketStatus,
     TicketPriority,
     TicketCategory,
@@ -25,20 +36,37 @@ from app.models import (
 from app.schemas import (
     TicketCreate,
     TicketUpdate,
+    TicketBulkUpdate,
+    TicketBulkResult,
+    TicketBulkResponse,
     TicketResponse,
     TicketDetailResponse,
     TicketListResponse,
+    TicketChangesResponse,
     TicketLogResponse,
+    TicketLogPage,
     TicketCommentCreate,
     TicketCommentUpdate,
     TicketCommentResponse,
+    TicketCommentPage,
+    AttachmentResponse,
+    AttachmentPage,
+    TimelineItem,
+    TicketTimelinePage,
     CurrentUser
 )
 
 
+# order_by of /tickets/changes cursors
+CHANGES_CURSOR = "changes"
+
+
 class TicketService:
     """Service for ticket management operations"""
     
+    # Fields whose changes are written to the ticket log
+    LOGGED_FIELDS = ("status", "priority", "assigned_to")
+    
     def __init__(self, db: AsyncSession):
         self.db = db
         self.ticket_repo = TicketRepository(db)
@@ -50,13 +78,18 @@ class TicketService:
     async def create_ticket(
         self,
         ticket_data: TicketCreate,
-        current_user: CurrentUser
+        current_user: CurrentUser,
+        idempotency_key: Optional[str] = None
     ) -> TicketResponse:
-        """Create a new ticket"""
+        """
+        Create a new ticket. If the database is unreachable the ticket is
+        spooled to disk and stored later (see _spool_ticket);
+        idempotency_key then keeps client retries from creating duplicates.
+        """
         try:
             # Generate ticket ID
             ticket_id = await self.ticket_repo.get_next_ticket_id()
-
+            
             # Create ticket
             ticket = await self.ticket_repo.create({
                 "ticket_id": ticket_id,
@@ -66,9 +99,10 @@ class TicketService:
                 "priority": ticket_data.priority,
                 "category": ticket_data.category,
                 "created_by": current_user.id,
-                "assigned_to": ticket_data.assigned_to
+                "assigned_to": ticket_data.assigned_to,
+                "sla_due_date": self._sla_due_date(ticket_data.priority, datetime.now(timezone.utc))
             })
-
+            
             # Create log entry
             await self._create_log(
                 ticket_id=ticket.id,
@@ -76,30 +110,57 @@ class TicketService:
                 log_type=LogType.CREATED,
                 action=f"Ticket {ticket_id} created"
             )
-
-            # Reload with relationships
-            ticket = await self.ticket_repo.get_with_details(ticket.id)
+            queue_ticket_event(self.db, "created", [ticket.id])
+            
+            # Creator and assignee for the response, one query
+            users = await self.user_repo.get_by_ids([ticket.created_by, ticket.assigned_to])
+            self._attach_users(ticket, users)
             return TicketResponse.model_validate(ticket)
-
+        
         except Exception as e:
-            # Database not reachable - fallback to file storage
-            print(f"Database error: {e}. Falling back to file storage.")
-            return await self._create_ticket_in_file(ticket_data, current_user)
+            if not is_database_unavailable(e):
+                raise
+            print(f"Database unreachable: {e}. Spooling ticket for replay.")
+            return await self._spool_ticket(ticket_data, current_user, idempotency_key)
     
-    async def get_ticket(self, ticket_id: int) -> Optional[TicketDetailResponse]:
-        """Get ticket with all details"""
-        ticket = await self.ticket_repo.get_with_details(ticket_id)
+    async def get_ticket(self, ticket_id: int, section_limit: int = 20) -> Optional[TicketDetailResponse]:
+        """
+        Get ticket with the first section_limit logs, comments and attachments
+        and the size of each section. Payload size is bounded however long
+        the ticket's history is; the rest is paged via get_ticket_logs etc.
+        """
+        ticket = await self.ticket_repo.get_with_users(ticket_id)
         if not ticket:
             return None
-        return TicketDetailResponse.model_validate(ticket)
+        
+        logs, logs_cursor = await self.log_repo.get_ticket_logs(ticket_id, section_limit)
+        comments, comments_cursor = await self.comment_repo.get_ticket_comments(
+            ticket_id, include_internal=True, limit=section_limit
+        )
+        attachments, attachments_cursor = await self.attachment_repo.get_ticket_attachments(
+            ticket_id, section_limit
+        )
+        counts = await self.ticket_repo.get_section_counts(ticket_id)
+        
+        return TicketDetailResponse(
+            **TicketResponse.model_validate(ticket).model_dump(),
+            logs=[TicketLogResponse.model_validate(log) for log in logs],
+            comments=[TicketCommentResponse.model_validate(c) for c in comments],
+            attachments=[AttachmentResponse.model_validate(a) for a in attachments],
+            logs_total=counts["logs"],
+            comments_total=counts["comments"],
+            attachments_total=counts["attachments"],
+            logs_next_cursor=logs_cursor,
+            comments_next_cursor=comments_cursor,
+            attachments_next_cursor=attachments_cursor
+        )
     
-    async def get_ticket_by_ticket_id(self, ticket_id: str) -> Optional[TicketDetailResponse]:
+    async def get_ticket_by_ticket_id(self, ticket_id: str, section_limit: int = 20) -> Optional[TicketDetailResponse]:
         """Get ticket by ticket_id (T-001 format)"""
         ticket = await self.ticket_repo.get_by_ticket_id(ticket_id)
         if not ticket:
             return None
-        ticket = await self.ticket_repo.get_with_details(ticket.id)
-        return TicketDetailResponse.model_validate(ticket)
+        return await self.get_ticket(ticket.id, section_limit)
     
     async def get_tickets(
         self,
@@ -112,15 +173,25 @@ class TicketService:
         created_by: Optional[int] = None,
         search: Optional[str] = None,
         order_by: str = "created_at",
-        order_desc: bool = True
+        order_desc: bool = True,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        count_mode: str = "exact"
     ) -> TicketListResponse:
-        """Get paginated list of tickets"""
+        """
+        Get paginated list of tickets (offset or cursor based).
+        The total is only computed with include_total: count_mode="exact" counts
+        in the page query itself, "estimated" uses planner statistics.
+        search is full-text (websearch syntax); order_by="relevance" ranks matches.
+        """
         # Convert string filters to enums
         status_enum = TicketStatus(status) if status else None
         priority_enum = TicketPriority(priority) if priority else None
         category_enum = TicketCategory(category) if category else None
         
-        tickets, total = await self.ticket_repo.get_paginated(
+        estimated = include_total and count_mode == "estimated"
+        
+        tickets, total, next_cursor = await self.ticket_repo.get_paginated(
             skip=skip,
             limit=limit,
             status=status_enum,
@@ -130,88 +201,228 @@ class TicketService:
             created_by=created_by,
             search=search,
             order_by=order_by,
-            order_desc=order_desc
+            order_desc=order_desc,
+            cursor=cursor,
+            include_total=include_total and not estimated
         )
         
-        pages = (total + limit - 1) // limit
+        highlights = None
+        if search:
+            highlights = await self.ticket_repo.get_search_headlines(
+                [t.id for t in tickets], search
+            )
+        
+        total_is_estimate = False
+        if estimated:
+            total, total_is_estimate = await self.ticket_repo.estimate_count(
+                status=status_enum,
+                priority=priority_enum,
+                category=category_enum,
+                assigned_to=assigned_to,
+                created_by=created_by,
+                search=search
+            )
         
         return TicketListResponse(
             items=[TicketResponse.model_validate(t) for t in tickets],
             total=total,
-            page=(skip // limit) + 1,
+            total_is_estimate=total_is_estimate,
+            page=None if cursor else (skip // limit) + 1,
             size=limit,
-            pages=pages
+            pages=(total + limit - 1) // limit if total is not None else None,
+            next_cursor=next_cursor,
+            highlights=highlights
         )
     
+    async def get_changes(self, since: Optional[str] = None, limit: int = 500) -> TicketChangesResponse:
+        """
+        Tickets changed since the cursor `since` (all tickets without it, to
+        fill a local copy), oldest change first, and the tickets deleted
+        meanwhile. The cursor never passes the change horizon, so a write
+        committing later is still returned by the next call.
+        """
+        horizon = await self.ticket_repo.get_change_horizon()
+        after, synced_at = self._decode_changes_cursor(since) if since else (None, horizon)
+        if after and await self._changes_reset(synced_at, horizon):
+            return TicketChangesResponse(reset=True)
+        
+        tickets = await self.ticket_repo.get_changed(after, horizon, limit + 1)
+        has_more = len(tickets) > limit
+        tickets = tickets[:limit]
+        # Caught up, the copy is current as of the horizon
+        until = (tickets[-1].updated_at, tickets[-1].id) if has_more else (horizon, 0)
+        if after and until < after:
+            until = after
+        
+        # Without since the client has no tickets yet, so none to delete;
+        # tickets deleted before it started syncing never reached it
+        deleted = []
+        if after:
+            deleted = await self.ticket_repo.get_deleted_ids(max(after, (synced_at, 0)), until)
+        
+        return TicketChangesResponse(
+            tickets=[TicketResponse.model_validate(t) for t in tickets],
+            deleted=deleted,
+            next_cursor=encode_cursor(CHANGES_CURSOR, [until[0], synced_at if has_more else horizon], until[1]),
+            has_more=has_more
+        )
+    
+    @staticmethod
+    def _decode_changes_cursor(since: str) -> Tuple[Tuple[datetime, int], datetime]:
+        """
+        A /tickets/changes cursor: the (updated_at, id) position, and the
+        horizon the local copy was last caught up at (or started syncing)
+        """
+        value, row_id = decode_cursor(since, CHANGES_CURSOR)
+        if not (isinstance(value, list) and len(value) == 2 and all(isinstance(v, datetime) for v in value)):
+            raise InvalidCursorError("Invalid changes cursor")
+        position, synced_at = value
+        return (position, row_id), synced_at
+    
+    async def _changes_reset(self, synced_at: datetime, horizon: datetime) -> bool:
+        """Whether changes after synced_at are lost: tombstones pruned, or tickets imported or truncated"""
+        if synced_at < horizon - timedelta(days=settings.ticket_tombstone_retention_days):
+            return True
+        reset_at = await self.ticket_repo.get_changes_reset_at()
+        return reset_at is not None and reset_at >= synced_at
+    
     async def update_ticket(
         self,
         ticket_id: int,
         update_data: TicketUpdate,
         current_user: CurrentUser
     ) -> Optional[TicketResponse]:
-        """Update a ticket"""
-        ticket = await self.ticket_repo.get_by_id(ticket_id)
+        """
+        Update a ticket. Query budget: load ticket with users, look up a new
+        assignee (only when reassigned), insert all change logs, UPDATE ... RETURNING.
+        """
+        ticket = await self.ticket_repo.get_with_users(ticket_id)
         if not ticket:
             return None
         
         update_dict = update_data.model_dump(exclude_unset=True)
+        users = {user.id: user for user in (ticket.created_by_user, ticket.assigned_to_user) if user}
+        logs = []
         
         # Track changes for logging
-        for field, new_value in update_dict.items():
-            old_value = getattr(ticket, field)
-            
-            if field == "status" and old_value != new_value:
-                await self._create_log(
-                    ticket_id=ticket_id,
-                    user_id=current_user.id,
-                    log_type=LogType.STATUS_CHANGE,
-                    action=f"Status changed from {old_value.value if old_value else 'None'} to {new_value.value if hasattr(new_value, 'value') else new_value}",
-                    old_value=old_value.value if old_value else None,
-                    new_value=new_value.value if hasattr(new_value, 'value') else str(new_value)
-                )
-                
-                # Set resolved_at if status is Resolved
-                if new_value == TicketStatus.RESOLVED:
-                    update_dict["resolved_at"] = datetime.utcnow()
-                    # Calculate resolution time
-                    if ticket.created_at:
-                        resolution_minutes = int((datetime.utcnow() - ticket.created_at).total_seconds() / 60)
-                        update_dict["resolution_time"] = resolution_minutes
+        for field, new_value in list(update_dict.items()):
+            if field not in self.LOGGED_FIELDS or getattr(ticket, field) == new_value:
+                continue
+            if field == "assigned_to" and new_value and new_value not in users:
+                users.update(await self.user_repo.get_by_ids([new_value]))
+            logs.append(self._change_log(ticket, field, new_value, users, current_user.id))
             
-            elif field == "priority" and old_value != new_value:
-                await self._create_log(
-                    ticket_id=ticket_id,
-                    user_id=current_user.id,
-                    log_type=LogType.PRIORITY_CHANGE,
-                    action=f"Priority changed from {old_value.value if old_value else 'None'} to {new_value.value if hasattr(new_value, 'value') else new_value}",
-                    old_value=old_value.value if old_value else None,
-                    new_value=new_value.value if hasattr(new_value, 'value') else str(new_value)
-                )
+            # The SLA target follows the priority
+            if field == "priority":
+                update_dict["sla_due_date"] = self._sla_due_date(new_value, ticket.created_at)
             
-            elif field == "assigned_to" and old_value != new_value:
-                old_user = await self.user_repo.get_by_id(old_value) if old_value else None
-                new_user = await self.user_repo.get_by_id(new_value) if new_value else None
-                await self._create_log(
-                    ticket_id=ticket_id,
-                    user_id=current_user.id,
-                    log_type=LogType.ASSIGNMENT,
-                    action=f"Assigned to {new_user.name if new_user else 'Unassigned'}",
-                    old_value=old_user.name if old_user else None,
-                    new_value=new_user.name if new_user else None
-                )
+            # Set resolved_at if status is Resolved
+            if field == "status" and new_value == TicketStatus.RESOLVED:
+                now = datetime.now(timezone.utc)
+                update_dict["resolved_at"] = now
+                # Calculate resolution time
+                if ticket.created_at:
+                    resolution_minutes = int((now - ticket.created_at).total_seconds() / 60)
+                    update_dict["resolution_time"] = resolution_minutes
+        
+        await self.log_repo.create_many(logs)
         
         # Update the ticket
-        updated_ticket = await self.ticket_repo.update(ticket_id, update_dict)
-        if not updated_ticket:
-            return None
+        if update_dict:
+            ticket = await self.ticket_repo.update(ticket_id, update_dict)
+            if not ticket:
+                return None
+            queue_ticket_event(self.db, "updated", [ticket_id])
         
-        # Reload with relationships
-        updated_ticket = await self.ticket_repo.get_with_details(ticket_id)
-        return TicketResponse.model_validate(updated_ticket)
+        self._attach_users(ticket, users)
+        return TicketResponse.model_validate(ticket)
+    
+    async def bulk_update(
+        self,
+        update_data: TicketBulkUpdate,
+        current_user: CurrentUser
+    ) -> TicketBulkResponse:
+        """
+        Apply the same status, priority and/or assignee to several tickets.
+        Query budget, whatever the number of tickets: load tickets with users,
+        look up the new assignee (only when not loaded yet), one
+        UPDATE ... WHERE id IN ... RETURNING per combination of changed
+        fields, insert all change logs. Raises ValueError if the new
+        assignee does not exist.
+        """
+        ticket_ids = list(dict.fromkeys(update_data.ticket_ids))
+        changes = update_data.model_dump(exclude={"ticket_ids"}, exclude_none=True)
+        
+        tickets = await self.ticket_repo.get_many_with_users(ticket_ids)
+        users = {
+            user.id: user
+            for ticket in tickets.values()
+            for user in (ticket.created_by_user, ticket.assigned_to_user)
+            if user
+        }
+        new_assignee = changes.get("assigned_to")
+        if new_assignee is not None and new_assignee not in users:
+            users.update(await self.user_repo.get_by_ids([new_assignee]))
+            if new_assignee not in users:
+                raise ValueError(f"User with ID {new_assignee} not found")
+        
+        changed = {
+            ticket.id: [field for field, new_value in changes.items() if getattr(ticket, field) != new_value]
+            for ticket in tickets.values()
+        }
+        # Logs first: they read the old values the UPDATEs overwrite
+        logs = [
+            self._change_log(tickets[ticket_id], field, changes[field], users, current_user.id)
+            for ticket_id, fields in changed.items()
+            for field in fields
+        ]
+        
+        # One set-based UPDATE per combination of changed fields, so every
+        # row is written once (usually a single statement for all tickets)
+        groups = {}
+        for ticket_id, fields in changed.items():
+            if fields:
+                groups.setdefault(tuple(fields), []).append(ticket_id)
+        now = datetime.now(timezone.utc)
+        for fields, ids in groups.items():
+            values = {field: changes[field] for field in fields}
+            if values.get("status") == TicketStatus.RESOLVED:
+                values["resolved_at"] = now
+                values["resolution_time"] = self.ticket_repo.minutes_since_created(now)
+            if "priority" in values:
+                values["sla_due_date"] = self._sla_due_date(values["priority"], Ticket.created_at)
+            await self.ticket_repo.update_by_ids(ids, values)
+        
+        await self.log_repo.create_many(logs)
+        if groups:
+            queue_ticket_event(self.db, "updated", [ticket_id for ids in groups.values() for ticket_id in ids])
+        
+        results = []
+        for ticket_id in ticket_ids:
+            ticket = tickets.get(ticket_id)
+            if not ticket:
+                results.append(TicketBulkResult(id=ticket_id, success=False, error="Ticket not found"))
+                continue
+            self._attach_users(ticket, users)
+            results.append(TicketBulkResult(
+                id=ticket_id,
+                success=True,
+                changed=changed[ticket_id],
+                ticket=TicketResponse.model_validate(ticket)
+            ))
+        
+        return TicketBulkResponse(
+            updated=sum(1 for fields in changed.values() if fields),
+            failed=len(ticket_ids) - len(tickets),
+            results=results
+        )
     
     async def delete_ticket(self, ticket_id: int) -> bool:
         """Delete a ticket"""
-        return await self.ticket_repo.delete(ticket_id)
+        deleted = await self.ticket_repo.delete(ticket_id)
+        if deleted:
+            queue_ticket_event(self.db, "deleted", [ticket_id])
+        return deleted
     
     async def add_comment(
         self,
@@ -239,6 +450,9 @@ class TicketService:
             action=f"Comment added by {current_user.name}"
         )
         
+        # Attach the author without lazy loading (not possible under asyncio)
+        author = await self.user_repo.get_by_id(current_user.id)
+        set_committed_value(comment, "author", author)
         return TicketCommentResponse.model_validate(comment)
     
     async def update_comment(
@@ -258,6 +472,8 @@ class TicketService:
             "edited_at": datetime.utcnow()
         })
         
+        author = await self.user_repo.get_by_id(current_user.id)
+        set_committed_value(updated_comment, "author", author)
         return TicketCommentResponse.model_validate(updated_comment)
     
     async def delete_comment(
@@ -276,32 +492,100 @@ class TicketService:
         
         return await self.comment_repo.delete(comment_id)
     
-    async def get_ticket_logs(self, ticket_id: int) -> List[TicketLogResponse]:
-        """Get all logs for a ticket"""
-        logs = await self.log_repo.get_ticket_logs(ticket_id)
-        return [TicketLogResponse.model_validate(log) for log in logs]
+    async def get_ticket_logs(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> TicketLogPage:
+        """Get one page of a ticket's logs, newest first"""
+        logs, next_cursor = await self.log_repo.get_ticket_logs(ticket_id, limit, cursor)
+        return TicketLogPage(
+            items=[TicketLogResponse.model_validate(log) for log in logs],
+            next_cursor=next_cursor
+        )
+    
+    async def get_ticket_comments(
+        self,
+        ticket_id: int,
+        include_internal: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> TicketCommentPage:
+        """Get one page of a ticket's comments, oldest first"""
+        comments, next_cursor = await self.comment_repo.get_ticket_comments(
+            ticket_id, include_internal, limit, cursor
+        )
+        return TicketCommentPage(
+            items=[TicketCommentResponse.model_validate(c) for c in comments],
+            next_cursor=next_cursor
+        )
+    
+    async def get_ticket_attachments(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> AttachmentPage:
+        """Get one page of a ticket's attachments, oldest first"""
+        attachments, next_cursor = await self.attachment_repo.get_ticket_attachments(
+            ticket_id, limit, cursor
+        )
+        return AttachmentPage(
+            items=[AttachmentResponse.model_validate(a) for a in attachments],
+            next_cursor=next_cursor
+        )
+    
+    async def get_ticket_timeline(
+        self,
+        ticket_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        order_desc: bool = True
+    ) -> TicketTimelinePage:
+        """Get one page of a ticket's logs, comments and attachments in time order"""
+        entries, next_cursor = await self.ticket_repo.get_timeline(ticket_id, limit, cursor, order_desc)
+        schemas = {
+            "log": TicketLogResponse,
+            "comment": TicketCommentResponse,
+            "attachment": AttachmentResponse
+        }
+        return TicketTimelinePage(
+            items=[
+                TimelineItem(**{
+                    "kind": kind,
+                    "created_at": row.created_at,
+                    kind: schemas[kind].model_validate(row)
+                })
+                for kind, row in entries
+            ],
+            next_cursor=next_cursor
+        )
     
     async def get_user_tickets(
         self,
         user_id: int,
         skip: int = 0,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> TicketListResponse:
         """Get tickets for a specific user"""
-        tickets, total = await self.ticket_repo.get_user_tickets(
+        tickets, total, next_cursor = await self.ticket_repo.get_user_tickets(
             user_id=user_id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total
         )
         
-        pages = (total + limit - 1) // limit
-        
         return TicketListResponse(
             items=[TicketResponse.model_validate(t) for t in tickets],
             total=total,
-            page=(skip // limit) + 1,
+            page=None if cursor else (skip // limit) + 1,
             size=limit,
-            pages=pages
+            pages=(total + limit - 1) // limit if total is not None else None,
+            next_cursor=next_cursor
         )
     
     async def get_recent_tickets(self, limit: int = 10) -> List[TicketResponse]:
@@ -320,7 +604,28 @@ class TicketService:
         log_metadata: Optional[dict] = None
     ) -> TicketLog:
         """Create a ticket log entry"""
-        return await self.log_repo.create({
+        return await self.log_repo.create(self._log_entry(
+            ticket_id=ticket_id,
+            user_id=user_id,
+            log_type=log_type,
+            action=action,
+            old_value=old_value,
+            new_value=new_value,
+            log_metadata=log_metadata
+        ))
+    
+    @staticmethod
+    def _log_entry(
+        ticket_id: int,
+        user_id: int,
+        log_type: LogType,
+        action: str,
+        old_value: Optional[str] = None,
+        new_value: Optional[str] = None,
+        log_metadata: Optional[dict] = None
+    ) -> dict:
+        """Values of a ticket log entry, for log_repo.create/create_many"""
+        return {
             "ticket_id": ticket_id,
             "user_id": user_id,
             "log_type": log_type,
@@ -328,7 +633,52 @@ class TicketService:
             "old_value": old_value,
             "new_value": new_value,
             "log_metadata": log_metadata
-        })
+        }
+    
+    @classmethod
+    def _change_log(
+        cls,
+        ticket: Ticket,
+        field: str,
+        new_value,
+        users: Dict[int, User],
+        user_id: int
+    ) -> dict:
+        """Log entry for a status, priority or assignee change (ticket still holds the old value)"""
+        old_value = getattr(ticket, field)
+        if field == "assigned_to":
+            old_user = users.get(old_value)
+            new_user = users.get(new_value)
+            return cls._log_entry(
+                ticket_id=ticket.id,
+                user_id=user_id,
+                log_type=LogType.ASSIGNMENT,
+                action=f"Assigned to {new_user.name if new_user else 'Unassigned'}",
+                old_value=old_user.name if old_user else None,
+                new_value=new_user.name if new_user else None
+            )
+        
+        old_label = old_value.value if old_value else None
+        new_label = new_value.value if hasattr(new_value, 'value') else str(new_value)
+        return cls._log_entry(
+            ticket_id=ticket.id,
+            user_id=user_id,
+            log_type=LogType.STATUS_CHANGE if field == "status" else LogType.PRIORITY_CHANGE,
+            action=f"{field.capitalize()} changed from {old_label or 'None'} to {new_label}",
+            old_value=old_label,
+            new_value=new_label
+        )
+    
+    @staticmethod
+    def _attach_users(ticket: Ticket, users: Dict[int, User]) -> None:
+        """Set created_by_user/assigned_to_user from already loaded users (no lazy load)"""
+        set_committed_value(ticket, "created_by_user", users.get(ticket.created_by))
+        set_committed_value(ticket, "assigned_to_user", users.get(ticket.assigned_to))
+    
+    @staticmethod
+    def _sla_due_date(priority, created_at: datetime) -> datetime:
+        """SLA due date: creation time plus the resolution target of the priority"""
+        return created_at + settings.sla_target(TicketPriority(priority).name)
     
     async def create_ticket_from_email(
         self,
@@ -354,6 +704,7 @@ class TicketService:
             "priority": priority,
             "category": category,
             "created_by": created_by,
+            "sla_due_date": self._sla_due_date(priority, datetime.now(timezone.utc)),
             "source_email_id": source_email_id,
             "source_email_from": source_email_from,
             "source_email_subject": source_email_subject,
@@ -369,136 +720,105 @@ class TicketService:
             action=f"Ticket auto-created from email: {source_email_subject}",
             log_metadata={"source_email": source_email_from, "llm_confidence": llm_confidence}
         )
+        queue_ticket_event(self.db, "created", [ticket.id])
         
         return ticket
-
-    async def _create_ticket_in_file(
+    
+    async def _spool_ticket(
         self,
         ticket_data: TicketCreate,
-        current_user: CurrentUser
+        current_user: CurrentUser,
+        idempotency_key: Optional[str]
     ) -> TicketResponse:
-        """Create ticket in frontend file when database is not reachable"""
-        import json
-        import os
-        from datetime import datetime
-
-        # Generate a unique ID (start from 1000 to avoid conflicts with mock data)
-        ticket_id_num = int(datetime.now().timestamp() * 1000) % 1000000 + 1000
-        ticket_id_str = f"T-{ticket_id_num:03d}"
-
-        # Create ticket data in frontend format
-        ticket_dict = {
-            "id": ticket_id_num,
+        """
+        Append a ticket to the write-behind spool when the database is not
+        reachable. It is stored by the spool replayer once the database is
+        back; until then the response carries a provisional ticket ID and
+        id 0.
+        """
+        key = idempotency_key or uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        await ticket_spool.append({
+            "key": key,
             "title": ticket_data.title,
-            "description": ticket_data.description or "",
-            "status": "Open",
-            "priority": ticket_data.priority.value if hasattr(ticket_data.priority, 'value') else str(ticket_data.priority),
-            "assignedTo": "Auto-assigned",  # Default assignment
-            "raisedBy": current_user.name if hasattr(current_user, 'name') else str(current_user.id),
-            "completionBy": ticket_data.completion_by.isoformat() if ticket_data.completion_by else datetime.now().date().isoformat(),
-            "createdOn": datetime.now().date().isoformat(),
-            "closedOn": None,
-            "module": ticket_data.category.value if hasattr(ticket_data.category, 'value') else str(ticket_data.category),
-            "tags": ["db-fallback"],
-            "logs": [{
-                "id": 1,
-                "action": "ticket_created",
-                "performedBy": "System (DB Fallback)",
-                "timestamp": datetime.now().isoformat(),
-                "details": "Ticket created when database was not reachable"
-            }],
-            "comments": []
-        }
-
-        # Path to frontend data2.ts file
-        frontend_data_file = os.path.join(
-            os.path.dirname(__file__),  # backend/app/services/
-            "..", "..", "..",          # go up to project root
-            "frontend-up", "src", "data", "tickets2.ts"
+            "description": ticket_data.description,
+            "priority": ticket_data.priority.value,
+            "category": ticket_data.category.value,
+            "assigned_to": ticket_data.assigned_to,
+            "created_by": current_user.id,
+            "created_at": now.isoformat()
+        })
+        print(f"Ticket spooled for replay (key {key})")
+        
+        return TicketResponse(
+            id=0,
+            ticket_id=f"PENDING-{key[:8]}",
+            title=ticket_data.title,
+            description=ticket_data.description,
+            status=TicketStatus.OPEN.value,
+            priority=ticket_data.priority,
+            category=ticket_data.category,
+            created_by=current_user.id,
+            assigned_to=ticket_data.assigned_to,
+            created_at=now,
+            updated_at=now
         )
-
-        try:
-            # Read existing file
-            if os.path.exists(frontend_data_file):
-                with open(frontend_data_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            else:
-                # Create new file with initial structure
-                content = """// ============================================
-// LLM-PARSED TICKETS DATA - Auto-generated from email parsing
-// ============================================
-
-import { Ticket } from '@/types';
-
-export const llmParsedTickets: Ticket[] = [
-    // LLM will add parsed tickets here
-];
-"""
-
-            # Parse existing tickets
-            if 'export const llmParsedTickets: Ticket[] = [' in content:
-                # Find the array content
-                start_idx = content.find('[')
-                end_idx = content.rfind(']')
-
-                if start_idx != -1 and end_idx != -1:
-                    existing_array_content = content[start_idx+1:end_idx].strip()
-                    if existing_array_content and existing_array_content != '// LLM will add parsed tickets here':
-                        # Parse existing JSON-like content and add new ticket
-                        existing_tickets = []
-                        if existing_array_content.strip():
-                            # This is a simplified parser - in production you'd want proper JSON parsing
-                            pass
-
-                        # Add new ticket to the array
-                        new_array_content = existing_array_content
-                        if new_array_content and not new_array_content.endswith(','):
-                            new_array_content += ','
-                        new_array_content += f"""
-    {json.dumps(ticket_dict, indent=4)}"""
-
-                        content = content[:start_idx+1] + new_array_content + content[end_idx:]
-                    else:
-                        # Empty array, add first ticket
-                        content = content.replace('// LLM will add parsed tickets here', f"""
-    {json.dumps(ticket_dict, indent=4)}""")
-
-            # Write back to file
-            with open(frontend_data_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            print(f"Ticket {ticket_id_num} saved to frontend file: {frontend_data_file}")
-
-            # Return response in expected format
-            from app.schemas import TicketResponse
-            return TicketResponse(
-                id=ticket_id_num,
-                ticket_id=ticket_id_str,
-                title=ticket_data.title,
-                description=ticket_data.description,
-                status="Open",
-                priority=ticket_data.priority,
-                category=ticket_data.category,
-                created_by=current_user.id,
-                assigned_to=ticket_data.assigned_to,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
-
-        except Exception as file_error:
-            print(f"Error writing to frontend file: {file_error}")
-            # Return a basic response even if file write fails
-            from app.schemas import TicketResponse
-            return TicketResponse(
-                id=ticket_id_num,
-                ticket_id=ticket_id_str,
-                title=ticket_data.title,
-                description=ticket_data.description,
-                status="Open",
-                priority=ticket_data.priority,
-                category=ticket_data.category,
-                created_by=current_user.id,
-                assigned_to=ticket_data.assigned_to,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
+    
+    async def replay_spooled_tickets(self, records: List[dict]) -> List[dict]:
+        """
+        Store tickets spooled while the database was unreachable (one batch
+        from the spool replayer; the caller commits). Records whose key
+        already has a ticket are skipped, so a batch can be replayed again.
+        Returns the records that can never be stored (creator deleted).
+        """
+        # Keep the first record of each key (a client may retry with the same Idempotency-Key)
+        stored = await self.ticket_repo.get_spooled_keys([record["key"] for record in records])
+        fresh: Dict[str, dict] = {}
+        for record in records:
+            if record["key"] not in stored:
+                fresh.setdefault(record["key"], record)
+        if not fresh:
+            return []
+        
+        users = await self.user_repo.get_by_ids(
+            [record["created_by"] for record in fresh.values()] + [record["assigned_to"] for record in fresh.values()]
+        )
+        rejected = [record for record in fresh.values() if record["created_by"] not in users]
+        records = [record for record in fresh.values() if record["created_by"] in users]
+        if not records:
+            return rejected
+        
+        ticket_ids = await self.ticket_repo.get_next_ticket_ids(len(records))
+        tickets = await self.ticket_repo.create_many([
+            {
+                "ticket_id": ticket_id,
+                "title": record["title"],
+                "description": record["description"],
+                "status": TicketStatus.OPEN,
+                "priority": TicketPriority(record["priority"]),
+                "category": TicketCategory(record["category"]),
+                "created_by": record["created_by"],
+                # An assignee deleted in the meantime leaves the ticket unassigned
+                "assigned_to": record["assigned_to"] if record["assigned_to"] in users else None,
+                "spool_key": record["key"],
+                "sla_due_date": self._sla_due_date(record["priority"], datetime.fromisoformat(record["created_at"])),
+                # updated_at is left to the database (now): it orders /tickets/changes
+                "created_at": datetime.fromisoformat(record["created_at"])
+            }
+            for ticket_id, record in zip(ticket_ids, records)
+        ])
+        await self.log_repo.create_many([
+            {
+                **self._log_entry(
+                    ticket_id=ticket.id,
+                    user_id=ticket.created_by,
+                    log_type=LogType.CREATED,
+                    action=f"Ticket {ticket.ticket_id} created",
+                    log_metadata={"spooled": True}
+                ),
+                "created_at": ticket.created_at
+            }
+            for ticket in tickets
+        ])
+        queue_ticket_event(self.db, "created", [ticket.id for ticket in tickets])
+        return rejected
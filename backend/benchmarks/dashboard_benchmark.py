@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Dashboard benchmark: sequential per-breakdown scans of tickets vs. reads of
+the ticket_daily_rollup table run concurrently.
+
+Times GET /analytics/dashboard and /analytics/full through AnalyticsService,
+once with the original implementation (status, priority, category counts,
+average resolution time and recent tickets one after another, each scanning
+tickets) and once with the current one, and counts the SQL statements each
+sends. The analytics cache is bypassed (compute_* methods), so every run
+queries the database. Runs against a scratch copy of the ticket tables (see
+benchmarks/scratch.py), whose rollup the triggers fill while seeding.
+
+Usage (from backend/):
+    python -m benchmarks.dashboard_benchmark --rows 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, desc
+from sqlalchemy.orm import selectinload
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.models import Ticket
+from app.services.analytics_service import AnalyticsService
+from benchmarks.scratch import seed, drop, percentiles, StatementCounter
+
+
+statements = StatementCounter()
+
+
+class LegacyAnalyticsService(AnalyticsService):
+    """The original sequential dashboard queries, kept here as the baseline"""
+
+    async def compute_dashboard_stats(self):
+        repo = self.ticket_repo
+        status_counts = await repo.get_status_counts()
+        priority_counts = await repo.get_priority_counts()
+        recent = await self.db.execute(
+            select(Ticket)
+            .options(selectinload(Ticket.created_by_user), selectinload(Ticket.assigned_to_user))
+            .order_by(desc(Ticket.created_at))
+            .limit(5)
+        )
+        recent.scalars().all()
+        await repo.get_average_resolution_time()
+        return status_counts, priority_counts
+
+    async def compute_full_analytics(self, days: int = 30):
+        repo = self.ticket_repo
+        await repo.get_status_counts()
+        await repo.get_priority_counts()
+        await repo.get_category_counts()
+        await repo.get_daily_ticket_counts(days)
+        await repo.get_average_resolution_time()
+
+
+async def measure(operation, repeat: int) -> dict:
+    """Run operation repeat times; statements per run and latency in ms"""
+    timings = []
+    start_statements = statements.count
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await operation()
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p95 = percentiles(timings)
+    return {"statements": (statements.count - start_statements) / repeat, "p50": p50, "p95": p95}
+
+
+async def run_variant(service_class, repeat: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        service = service_class(db)
+        await service.compute_dashboard_stats()
+        return {
+            "dashboard": await measure(service.compute_dashboard_stats, repeat),
+            "full analytics": await measure(service.compute_full_analytics, repeat),
+        }
+
+
+async def main(rows: int, repeat: int, keep: bool) -> None:
+    print("=" * 78)
+    print(f"Dashboard benchmark - {rows:,} tickets, {repeat} runs per endpoint")
+    print("=" * 78)
+
+    start = time.perf_counter()
+    await seed(rows)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+
+    try:
+        legacy = await run_variant(LegacyAnalyticsService, repeat)
+        current = await run_variant(AnalyticsService, repeat)
+
+        print(f"{'endpoint':<16}{'variant':<24}{'statements':>11}{'p50 ms':>9}{'p95 ms':>9}")
+        for endpoint in legacy:
+            for name, stats in (("sequential", legacy[endpoint]), ("rollup + gather", current[endpoint])):
+                print(f"{endpoint:<16}{name:<24}{stats['statements']:>11.1f}{stats['p50']:>9.1f}{stats['p95']:>9.1f}")
+            print()
+    finally:
+        if not keep:
+            await drop()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.keep))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Percentile benchmark: resolution time percentiles sorted from tickets vs.
+merged from the daily DDSketches in ticket_resolution_sketch.
+
+Resolves a share of the scratch tickets (see benchmarks/scratch.py) with
+long-tailed resolution times, then times p50 / p90 / p99 overall, per
+category and per priority for a 30-day and an all-time window, once with
+percentile_disc over tickets and once with
+ResolutionSketchRepository.get_percentiles, and reports the largest relative
+error of the sketch estimates.
+
+Usage (from backend/):
+    python -m benchmarks.percentile_benchmark --rows 200000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text, bindparam
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.models import Ticket, TicketStatus
+from app.repositories import ResolutionSketchRepository
+from benchmarks.scratch import SCHEMA, seed, drop, percentiles
+
+
+# percentile_disc uses the same rank as the sketch, so differences are the sketch error
+EXACT = """
+    SELECT {group} AS grp, {key} AS key, count(*) AS total,
+           percentile_disc(0.5) WITHIN GROUP (ORDER BY resolution_time) AS p50,
+           percentile_disc(0.9) WITHIN GROUP (ORDER BY resolution_time) AS p90,
+           percentile_disc(0.99) WITHIN GROUP (ORDER BY resolution_time) AS p99
+    FROM tickets
+    WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+      AND (resolved_at AT TIME ZONE 'UTC')::date >= :since
+    {group_by}"""
+
+EXACT_QUERY = text(" UNION ALL ".join((
+    EXACT.format(group="'overall'", key="''", group_by=""),
+    EXACT.format(group="'category'", key="category::text", group_by="GROUP BY category"),
+    EXACT.format(group="'priority'", key="priority::text", group_by="GROUP BY priority"),
+)))
+
+
+async def resolve_tickets(share: float) -> None:
+    """Resolve a share of the scratch tickets with log-uniform resolution times (1 min to ~6 days)"""
+    async with async_engine.begin() as conn:
+        await conn.execute(text(f"""
+            UPDATE {SCHEMA}.tickets SET
+                status = :status,
+                priority = (enum_range(priority))[1 + id % 4],
+                category = (enum_range(category))[1 + id % 5],
+                resolution_time = exp(random() * 9)::int,
+                resolved_at = created_at + interval '1 day'
+            WHERE random() < :share
+        """).bindparams(bindparam("status", type_=Ticket.__table__.c.status.type)),
+            {"share": share, "status": TicketStatus.RESOLVED})
+        await conn.execute(text(f"ANALYZE {SCHEMA}.tickets"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.ticket_resolution_sketch"))
+
+
+async def measure(operation, repeat: int) -> tuple:
+    """Run operation repeat times; (last result, p50 ms, p95 ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await operation()
+        timings.append((time.perf_counter() - start) * 1000)
+    return (result, *percentiles(timings))
+
+
+def largest_error(exact_rows, estimates: dict) -> float:
+    """Largest relative error of the sketch percentiles (exact values of at least an hour)"""
+    worst = 0.0
+    for row in exact_rows:
+        if row.grp == "overall":
+            estimate = estimates["overall"]
+        else:
+            estimate = next(v for k, v in estimates[row.grp].items() if k.upper().replace(" ", "_") == row.key)
+        for name in ("p50", "p90", "p99"):
+            exact = getattr(row, name)
+            if exact >= 60:
+                worst = max(worst, abs(estimate[name] * 60 - exact) / exact)
+    return worst
+
+
+async def main(rows: int, repeat: int, share: float, keep: bool) -> None:
+    print("=" * 78)
+    print(f"Percentile benchmark - {rows:,} tickets, {share:.0%} resolved, {repeat} runs per window")
+    print("=" * 78)
+
+    start = time.perf_counter()
+    await seed(rows)
+    await resolve_tickets(share)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+    async with AsyncSessionLocal() as db:
+        resolved = await db.scalar(text("SELECT count(*) FROM tickets WHERE resolution_time IS NOT NULL"))
+        buckets = await db.scalar(text("SELECT count(*) FROM ticket_resolution_sketch"))
+    print(f"{resolved:,} resolved tickets in {buckets:,} sketch buckets\n")
+
+    try:
+        today = datetime.now(timezone.utc).date()
+        print(f"{'window':<10}{'variant':<16}{'p50 ms':>9}{'p95 ms':>9}{'max error':>11}")
+        async with AsyncSessionLocal() as db:
+            sketches = ResolutionSketchRepository(db)
+            for window, since in (("30 days", today - timedelta(days=30)), ("all time", today - timedelta(days=36500))):
+                exact, exact_p50, exact_p95 = await measure(
+                    lambda: db.execute(EXACT_QUERY, {"since": since}), repeat
+                )
+                estimates, sketch_p50, sketch_p95 = await measure(lambda: sketches.get_percentiles(since), repeat)
+                error = largest_error(exact.all(), estimates)
+                print(f"{window:<10}{'sort tickets':<16}{exact_p50:>9.1f}{exact_p95:>9.1f}{'':>11}")
+                print(f"{window:<10}{'merge sketches':<16}{sketch_p50:>9.1f}{sketch_p95:>9.1f}{error:>10.2%}")
+                print()
+    finally:
+        if not keep:
+            await drop()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--share", type=float, default=0.6, help="Share of tickets to resolve")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.share, args.keep))
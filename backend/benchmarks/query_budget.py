@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Query budget check for the ticket write endpoints.
+
+Runs the service call behind each endpoint against a scratch copy of the
+ticket tables (see benchmarks/scratch.py) and counts the SQL statements it
+sends. Exits with status 1 when any endpoint exceeds its budget, so it can
+run in CI next to the linters.
+
+Usage (from backend/):
+    python -m benchmarks.query_budget
+"""
+
+import asyncio
+import sys
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.models import Ticket
+from app.schemas import TicketCreate, TicketUpdate, TicketBulkUpdate, TicketCommentCreate, CurrentUser
+from app.services.ticket_service import TicketService
+from benchmarks.scratch import seed, drop, StatementCounter
+
+
+USER = CurrentUser(id=1, azure_id="benchmark", email="benchmark@example.com", name="Benchmark", is_admin=False)
+
+# Endpoint -> maximum number of SQL statements
+BUDGETS = {
+    # next ticket id, INSERT ticket, INSERT log, creator + assignee
+    "POST /tickets": 4,
+    # ticket + users, INSERT logs, UPDATE ... RETURNING
+    "PATCH /tickets/{id}": 3,
+    # ticket + users, new assignee, INSERT log, UPDATE ... RETURNING
+    "PATCH /tickets/{id} (reassign)": 4,
+    # ticket exists, INSERT comment, INSERT log, author
+    "POST /tickets/{id}/comments": 4,
+    # tickets + users, new assignee, one UPDATE (same change for all), INSERT logs
+    "POST /tickets/bulk (100 tickets)": 4,
+}
+
+statements = StatementCounter()
+
+
+async def count(operation) -> int:
+    """Number of statements sent while awaiting operation"""
+    start = statements.count
+    await operation
+    return statements.count - start
+
+
+async def main() -> int:
+    await seed(100)
+    try:
+        async with AsyncSessionLocal() as db:
+            service = TicketService(db)
+            ticket = await service.create_ticket(
+                TicketCreate(title="Budget check", description="Created by the query budget check", assigned_to=2),
+                USER
+            )
+            # Seeded tickets, all in the same state (the ticket above is the newest)
+            batch = [t.id for t in await service.ticket_repo.get_all(limit=100, order_by=Ticket.id)]
+            used = {
+                "POST /tickets": await count(service.create_ticket(
+                    TicketCreate(title="Budget check", description="Created by the query budget check", assigned_to=2),
+                    USER
+                )),
+                "PATCH /tickets/{id}": await count(service.update_ticket(
+                    ticket.id, TicketUpdate(status="Resolved", priority="High", title="Budget check 2"), USER
+                )),
+                "PATCH /tickets/{id} (reassign)": await count(service.update_ticket(
+                    ticket.id, TicketUpdate(assigned_to=3), USER
+                )),
+                "POST /tickets/{id}/comments": await count(service.add_comment(
+                    ticket.id, TicketCommentCreate(ticket_id=ticket.id, content="Budget check"), USER
+                )),
+                "POST /tickets/bulk (100 tickets)": await count(service.bulk_update(
+                    TicketBulkUpdate(ticket_ids=batch, status="In Progress", priority="High", assigned_to=3),
+                    USER
+                )),
+            }
+            await db.rollback()
+    finally:
+        await drop()
+        await async_engine.dispose()
+
+    failed = False
+    for endpoint, budget in BUDGETS.items():
+        ok = used[endpoint] <= budget
+        failed = failed or not ok
+        print(f"{'OK ' if ok else 'FAIL'} {endpoint:<36}{used[endpoint]:>3} / {budget} statements")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
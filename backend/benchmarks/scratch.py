@@ -0,0 +1,141 @@
+"""
+Scratch ticket tables shared by the benchmarks.
+
+Copies the tickets, ticket_logs, ticket_comments, search_terms,
+ticket_daily_rollup and ticket_resolution_sketch table definitions (columns,
+generated columns, indexes, with sequences of their own) and their triggers into a separate schema, fills it with synthetic
+tickets and builds the search lexicon from them. Importing this module
+points every new connection's search_path at the scratch schema, so the unmodified
+repositories run against the copies; the real tables are never touched.
+"""
+
+from sqlalchemy import text, bindparam, event
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.models import (
+    Ticket, TicketStatus, TicketPriority, TicketCategory,
+    TICKET_ROLLUP_DDL, RESOLUTION_SKETCH_DDL, TICKET_NUMBER_DDL
+)
+from app.repositories import SearchTermRepository
+
+
+SCHEMA = "bench_scratch"
+TABLES = (
+    "tickets", "ticket_logs", "ticket_comments", "search_terms", "ticket_daily_rollup", "ticket_resolution_sketch"
+)
+
+VOCABULARY = [
+    "goods", "receipt", "invoice", "verification", "posting", "period", "vendor",
+    "purchase", "order", "material", "master", "stock", "transfer", "plant",
+    "billing", "delivery", "sales", "pricing", "condition", "customer", "credit",
+    "ledger", "asset", "depreciation", "cost", "center", "profit", "journal",
+    "transport", "request", "authorization", "role", "batch", "job", "dump",
+    "interface", "idoc", "error", "mismatch", "blocked", "payment", "run",
+    "tax", "code", "reconciliation", "account", "company", "warehouse", "release",
+    "strategy", "workflow", "approval", "quantity", "valuation", "class",
+]
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _use_scratch_schema(dbapi_connection, connection_record):
+    """Resolve the unqualified table names to the scratch copies"""
+    # Outside a transaction, or the pool's rollback on checkin would undo the SET
+    autocommit = dbapi_connection.autocommit
+    dbapi_connection.autocommit = True
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET search_path TO {SCHEMA}, public")
+    cursor.close()
+    dbapi_connection.autocommit = autocommit
+
+
+async def seed(rows: int, title_words: int = 6, description_words: int = 25) -> None:
+    """Create the scratch table and fill it with synthetic tickets"""
+    words = "(ARRAY[" + ", ".join(f"'{w}'" for w in VOCABULARY) + "])"
+    pick = f"{words}[1 + floor(random() * {len(VOCABULARY)})::int]"
+    
+    # Enum columns are bound through the model types so labels always match
+    insert = text(f"""
+        INSERT INTO {SCHEMA}.tickets (
+            ticket_id, title, description, status, priority, category,
+            created_by, created_at, updated_at
+        )
+        SELECT
+            'T-' || lpad(g::text, greatest(3, length(g::text)), '0'),
+            (SELECT string_agg({pick}, ' ') FROM generate_series(1, :title_words) WHERE g > 0),
+            (SELECT string_agg({pick}, ' ') FROM generate_series(1, :description_words) WHERE g > 0),
+            :status, :priority, :category, 1,
+            now() - g * interval '1 minute',
+            now() - g * interval '1 minute'
+        FROM generate_series(1, :rows) g
+    """).bindparams(
+        bindparam("status", type_=Ticket.__table__.c.status.type),
+        bindparam("priority", type_=Ticket.__table__.c.priority.type),
+        bindparam("category", type_=Ticket.__table__.c.category.type),
+    )
+    
+    async with async_engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        # LIKE ... INCLUDING ALL copies generated columns and every index
+        for table in TABLES:
+            await conn.execute(text(
+                f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"
+            ))
+        # The copied serial defaults still call nextval() on the public sequences;
+        # give the copies their own so benchmarks never use up real ticket ids
+        serials = await conn.execute(text("""
+            SELECT table_name, column_name FROM information_schema.columns
+            WHERE table_schema = :schema AND column_default LIKE 'nextval(%'
+        """), {"schema": SCHEMA})
+        for table, column in serials.all():
+            sequence = f"{SCHEMA}.{table}_{column}_seq"
+            await conn.execute(text(f"CREATE SEQUENCE {sequence} OWNED BY {SCHEMA}.{table}.{column}"))
+            await conn.execute(text(
+                f"ALTER TABLE {SCHEMA}.{table} ALTER COLUMN {column} SET DEFAULT nextval('{sequence}')"
+            ))
+        # LIKE does not copy triggers; the search_path puts these on the scratch tickets
+        for statement in TICKET_ROLLUP_DDL + RESOLUTION_SKETCH_DDL:
+            await conn.execute(text(statement))
+        await conn.execute(insert, {
+            "rows": rows,
+            "title_words": title_words,
+            "description_words": description_words,
+            "status": TicketStatus.OPEN,
+            "priority": TicketPriority.MEDIUM,
+            "category": TicketCategory.OTHER,
+        })
+        # A ticket number sequence of its own, continuing after the seeded T-<g>
+        for statement in TICKET_NUMBER_DDL:
+            await conn.execute(text(statement))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.tickets"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.ticket_daily_rollup"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.ticket_resolution_sketch"))
+    
+    async with AsyncSessionLocal() as db:
+        await SearchTermRepository(db).refresh()
+        await db.commit()
+
+
+async def drop() -> None:
+    """Remove the scratch schema"""
+    async with async_engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+class StatementCounter:
+    """Counts the SQL statements (database round trips) sent by the engine"""
+    
+    def __init__(self):
+        self.count = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._on_execute)
+    
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def percentiles(timings: list) -> tuple:
+    """(p50, p95) of a list of timings"""
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2]
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return p50, p95
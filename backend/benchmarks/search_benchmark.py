@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Ticket search latency benchmark: LIKE scan vs. full-text search.
+
+Times TicketRepository.get_paginated with the old LIKE filter and with the
+tsvector/GIN filter against a scratch copy of the tickets table (see
+benchmarks/scratch.py). The real tickets table is never touched.
+
+Usage (from backend/):
+    python -m benchmarks.search_benchmark --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func, or_
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.models import Ticket
+from app.repositories.ticket_repository import TicketRepository
+from benchmarks.scratch import seed, drop, percentiles
+
+
+QUERIES = [
+    "invoice",                   # common term
+    "idoc dump",                 # two terms (AND)
+    '"goods receipt"',           # phrase
+    "depreciation -asset",       # exclusion
+    "reconciliation warehouse",  # rarer combination
+]
+
+
+class LikeTicketRepository(TicketRepository):
+    """The pre-full-text search filter, kept here as the baseline"""
+
+    def _build_filters(self, status=None, priority=None, category=None,
+                       assigned_to=None, created_by=None, search=None):
+        filters = super()._build_filters(status, priority, category, assigned_to, created_by)
+        if search:
+            search_term = f"%{search.lower()}%"
+            filters.append(
+                or_(
+                    func.lower(Ticket.title).like(search_term),
+                    func.lower(Ticket.description).like(search_term),
+                    func.lower(Ticket.ticket_id).like(search_term)
+                )
+            )
+        return filters
+
+
+async def time_search(repo_class, search: str, repeat: int, **kwargs) -> dict:
+    """Run one search repeat times (after a warm-up) and summarize latency in ms"""
+    timings = []
+    async with AsyncSessionLocal() as db:
+        repo = repo_class(db)
+        tickets, total, _ = await repo.get_paginated(limit=20, search=search, **kwargs)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await repo.get_paginated(limit=20, search=search, **kwargs)
+            timings.append((time.perf_counter() - start) * 1000)
+    p50, p95 = percentiles(timings)
+    return {"p50": p50, "p95": p95, "total": total}
+
+
+async def main(rows: int, repeat: int, keep: bool) -> None:
+    print("=" * 78)
+    print(f"Ticket search benchmark - {rows:,} tickets, {repeat} runs per query")
+    print("=" * 78)
+
+    start = time.perf_counter()
+    await seed(rows)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+
+    variants = [
+        ("LIKE (baseline)", LikeTicketRepository, {"include_total": True}),
+        ("FTS, newest first", TicketRepository, {"include_total": True}),
+        ("FTS, no total", TicketRepository, {}),
+        ("FTS, by relevance", TicketRepository, {"order_by": "relevance"}),
+    ]
+
+    try:
+        print(f"{'query':<28}{'variant':<22}{'p50 ms':>9}{'p95 ms':>9}{'matches':>10}")
+        for search in QUERIES:
+            for name, repo_class, kwargs in variants:
+                stats = await time_search(repo_class, search, repeat, **kwargs)
+                total = "" if stats["total"] is None else f"{stats['total']:,}"
+                print(f"{search:<28}{name:<22}{stats['p50']:>9.1f}{stats['p95']:>9.1f}{total:>10}")
+            print()
+    finally:
+        if not keep:
+            await drop()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.keep))
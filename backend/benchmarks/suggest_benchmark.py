@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Autocomplete latency benchmark for GET /search/suggest.
+
+Times SearchService.suggest - ticket id prefix lookup, or lexicon spelling
+correction plus full-text title lookup, plus the user lookup - for partial
+ids and misspelled words against a scratch copy of the tickets table (see
+benchmarks/scratch.py). Target: top-k in under 20 ms at 1M tickets.
+
+Usage (from backend/):
+    python -m benchmarks.suggest_benchmark --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.services.search_service import SearchService
+from benchmarks.scratch import seed, drop, percentiles
+
+
+QUERIES = [
+    "T-12",               # partial ticket id
+    "T-4711",             # full ticket id
+    "reconcilation",      # missing letter
+    "warehuose",          # transposition
+    "depreciaton run",    # typo + second word
+    "idoc",               # exact common word
+    "wareh",              # word still being typed
+]
+
+
+async def main(rows: int, repeat: int, limit: int, keep: bool) -> None:
+    print("=" * 70)
+    print(f"Suggest benchmark - {rows:,} tickets, top {limit}, {repeat} runs per query")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    await seed(rows)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+
+    try:
+        print(f"{'query':<22}{'p50 ms':>9}{'p95 ms':>9}  best match")
+        async with AsyncSessionLocal() as db:
+            service = SearchService(db)
+            for query in QUERIES:
+                suggestions = (await service.suggest(query, limit)).tickets
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    await service.suggest(query, limit)
+                    timings.append((time.perf_counter() - start) * 1000)
+                p50, p95 = percentiles(timings)
+                best = f"{suggestions[0].ticket_id} {suggestions[0].title}" if suggestions else "-"
+                print(f"{query:<22}{p50:>9.1f}{p95:>9.1f}  {best[:40]}")
+    finally:
+        if not keep:
+            await drop()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.limit, args.keep))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Write path benchmark: add/flush/refresh vs. INSERT/UPDATE ... RETURNING.
+
+Counts the SQL statements (database round trips) and times ticket creation
+and comment posting through TicketService, once with the previous
+BaseRepository write methods and once with the RETURNING ones, plus a batch
+of comments through create() in a loop vs. create_many(). Runs against a
+scratch copy of the ticket tables (see benchmarks/scratch.py).
+
+Usage (from backend/):
+    python -m benchmarks.write_benchmark --rows 10000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import update
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.repositories import TicketRepository, TicketLogRepository, TicketCommentRepository
+from app.schemas import TicketCreate, TicketCommentCreate, CurrentUser
+from app.services.ticket_service import TicketService
+from benchmarks.scratch import seed, drop, percentiles, StatementCounter
+
+
+USER = CurrentUser(id=1, azure_id="benchmark", email="benchmark@example.com", name="Benchmark", is_admin=False)
+BATCH = 100
+
+statements = StatementCounter()
+
+
+class LegacyWrites:
+    """The previous BaseRepository.create/update, kept here as the baseline"""
+
+    async def create(self, obj_in: dict):
+        db_obj = self.model(**obj_in)
+        self.db.add(db_obj)
+        await self.db.flush()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def update(self, id: int, obj_in: dict):
+        update_data = {k: v for k, v in obj_in.items() if v is not None}
+        if not update_data:
+            return await self.get_by_id(id)
+        await self.db.execute(
+            update(self.model).where(self.model.id == id).values(**update_data)
+        )
+        await self.db.flush()
+        return await self.get_by_id(id)
+
+
+class LegacyTicketRepository(LegacyWrites, TicketRepository):
+    pass
+
+
+class LegacyTicketLogRepository(LegacyWrites, TicketLogRepository):
+    pass
+
+
+class LegacyTicketCommentRepository(LegacyWrites, TicketCommentRepository):
+    pass
+
+
+def make_service(db, legacy: bool) -> TicketService:
+    service = TicketService(db)
+    if legacy:
+        service.ticket_repo = LegacyTicketRepository(db)
+        service.log_repo = LegacyTicketLogRepository(db)
+        service.comment_repo = LegacyTicketCommentRepository(db)
+    return service
+
+
+async def measure(operation, repeat: int) -> dict:
+    """Run operation repeat times; statements per run and latency in ms"""
+    timings = []
+    start_statements = statements.count
+    for i in range(repeat):
+        start = time.perf_counter()
+        await operation(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p95 = percentiles(timings)
+    return {"statements": (statements.count - start_statements) / repeat, "p50": p50, "p95": p95}
+
+
+async def run_variant(legacy: bool, repeat: int) -> dict:
+    results = {}
+    async with AsyncSessionLocal() as db:
+        service = make_service(db, legacy)
+        ticket = await service.create_ticket(
+            TicketCreate(title="Benchmark ticket", description="Warm-up ticket for the write benchmark"),
+            USER
+        )
+
+        async def create_ticket(i):
+            await service.create_ticket(
+                TicketCreate(title=f"Benchmark ticket {i}", description="Created by the write benchmark"),
+                USER
+            )
+
+        async def post_comment(i):
+            await service.add_comment(
+                ticket.id, TicketCommentCreate(ticket_id=ticket.id, content=f"Comment {i}"), USER
+            )
+
+        comments = [
+            {"ticket_id": ticket.id, "author_id": USER.id, "content": f"Batch comment {i}"}
+            for i in range(BATCH)
+        ]
+
+        async def create_batch(i):
+            if legacy:
+                for comment in comments:
+                    await service.comment_repo.create(comment)
+            else:
+                await service.comment_repo.create_many(comments)
+
+        results["create ticket"] = await measure(create_ticket, repeat)
+        results["post comment"] = await measure(post_comment, repeat)
+        results[f"{BATCH} comments"] = await measure(create_batch, max(1, repeat // 10))
+        await db.rollback()
+    return results
+
+
+async def main(rows: int, repeat: int, keep: bool) -> None:
+    print("=" * 78)
+    print(f"Write path benchmark - {rows:,} tickets, {repeat} runs per operation")
+    print("=" * 78)
+
+    start = time.perf_counter()
+    await seed(rows)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+
+    try:
+        legacy = await run_variant(True, repeat)
+        returning = await run_variant(False, repeat)
+
+        print(f"{'operation':<18}{'variant':<22}{'statements':>11}{'p50 ms':>9}{'p95 ms':>9}")
+        for operation in legacy:
+            for name, stats in (("add/flush/refresh", legacy[operation]), ("RETURNING", returning[operation])):
+                print(f"{operation:<18}{name:<22}{stats['statements']:>11.1f}{stats['p50']:>9.1f}{stats['p95']:>9.1f}")
+            print()
+    finally:
+        if not keep:
+            await drop()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat, args.keep))
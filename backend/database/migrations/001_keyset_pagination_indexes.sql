@@ -0,0 +1,18 @@
+-- ============================================
+-- MIGRATION 001 - Keyset pagination indexes
+-- ============================================
+-- Composite (order column, id) indexes backing cursor pagination on
+-- GET /tickets, /tickets/my, /emails/by-category and /admin/audit-logs.
+-- CONCURRENTLY avoids locking writes; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_created_at_id ON tickets(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_updated_at_id ON tickets(updated_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_title_id ON tickets(title, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_status_created_at_id ON tickets(status, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_assigned_created_at_id ON tickets(assigned_to, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_created_by_created_at_id ON tickets(created_by, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_email_category_received_at_id ON email_sources(detected_category, received_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_email_processed_at_id ON email_sources(processed_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_created_at_id ON admin_audit_logs(created_at, id);
@@ -0,0 +1,18 @@
+-- ============================================
+-- MIGRATION 002 - Full-text ticket search
+-- ============================================
+-- Replaces the expression index idx_ticket_search (which no query matched)
+-- with a stored, generated tsvector column and a GIN index on it.
+-- ADD COLUMN ... STORED rewrites the table under an exclusive lock; run it in
+-- a maintenance window. The index statements must run outside a transaction.
+
+ALTER TABLE tickets ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(ticket_id, '') || ' ' || coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_search_vector ON tickets USING gin(search_vector);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_ticket_search;
+
+ANALYZE tickets;
@@ -0,0 +1,22 @@
+-- ============================================
+-- MIGRATION 003 - Fuzzy search (pg_trgm)
+-- ============================================
+-- GiST trigram indexes for typo-tolerant GET /users/search and
+-- GET /search/suggest, the search_terms lexicon used to correct misspelled
+-- ticket title words, and a prefix index for partial ticket ids.
+-- GiST (not GIN) because suggestions are ordered by trigram distance, which
+-- only GiST can return in order. The index statements must run outside a
+-- transaction block.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_name_trgm ON users USING gist(name gist_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_email_trgm ON users USING gist(email gist_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_ticket_id_prefix ON tickets(ticket_id varchar_pattern_ops);
+
+CREATE TABLE IF NOT EXISTS search_terms (
+    term VARCHAR(100) PRIMARY KEY,
+    ndoc INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_term_trgm ON search_terms USING gist(term gist_trgm_ops);
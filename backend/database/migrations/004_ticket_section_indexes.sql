@@ -0,0 +1,11 @@
+-- ============================================
+-- MIGRATION 004 - Ticket detail section indexes
+-- ============================================
+-- (ticket_id, created_at, id) composites backing the cursor-paginated
+-- GET /tickets/{id}/logs, /comments and /attachments and the first page of
+-- each section in GET /tickets/{id}.
+-- CONCURRENTLY avoids locking writes; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_log_ticket_created_at_id ON ticket_logs(ticket_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comment_ticket_created_at_id ON ticket_comments(ticket_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_attachment_ticket_created_at_id ON attachments(ticket_id, created_at, id);
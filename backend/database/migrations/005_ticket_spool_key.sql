@@ -0,0 +1,12 @@
+-- ============================================
+-- MIGRATION 005 - Ticket spool idempotency key
+-- ============================================
+-- Tickets created while the database was unreachable are spooled to disk
+-- and replayed later; spool_key holds the idempotency key of a replayed
+-- ticket so a spool segment replayed twice does not create duplicates.
+-- Adding a nullable column without a default does not rewrite the table.
+-- CONCURRENTLY avoids locking writes; run the index outside a transaction block.
+
+ALTER TABLE tickets ADD COLUMN IF NOT EXISTS spool_key VARCHAR(64);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_spool_key ON tickets(spool_key) WHERE spool_key IS NOT NULL;
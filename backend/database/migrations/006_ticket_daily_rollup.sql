@@ -0,0 +1,150 @@
+-- ============================================
+-- MIGRATION 006 - Ticket daily rollup for analytics
+-- ============================================
+-- Dashboard and analytics counts are read from ticket_daily_rollup (ticket
+-- counts per creation day, status, priority, category and assignee) instead
+-- of scanning tickets. Statement-level triggers keep it current: each write
+-- statement applies the net change of all its rows with one upsert.
+-- The application creates the table and triggers empty at startup if they
+-- are missing, so this script also (re)fills the table. It runs in one
+-- transaction that blocks ticket writes (SHARE mode, reads continue) for one
+-- scan of tickets, so no write is lost between the backfill and the triggers.
+-- The table takes its enum types from tickets, whatever their names.
+-- The resolved_at index (tickets resolved today, still counted from tickets)
+-- is built CONCURRENTLY after the transaction.
+
+BEGIN;
+
+LOCK TABLE tickets IN SHARE MODE;
+
+CREATE TABLE IF NOT EXISTS ticket_daily_rollup AS
+SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+       0::integer AS ticket_count, 0::integer AS resolved_count, 0::bigint AS resolution_minutes
+FROM tickets
+WITH NO DATA;
+
+ALTER TABLE ticket_daily_rollup
+    ADD COLUMN IF NOT EXISTS id BIGSERIAL PRIMARY KEY,
+    ALTER COLUMN day SET NOT NULL,
+    ALTER COLUMN status SET NOT NULL,
+    ALTER COLUMN priority SET NOT NULL,
+    ALTER COLUMN category SET NOT NULL,
+    ALTER COLUMN ticket_count SET NOT NULL,
+    ALTER COLUMN resolved_count SET NOT NULL,
+    ALTER COLUMN resolution_minutes SET NOT NULL;
+
+-- Upsert target of the triggers; unassigned tickets (NULL) share one row per group
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ticket_rollup_group
+    ON ticket_daily_rollup(day, status, priority, category, assigned_to) NULLS NOT DISTINCT;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               1 AS tickets,
+               1 * (resolution_time IS NOT NULL)::int AS resolved,
+               1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM new_rows
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               1 AS tickets,
+               1 * (resolution_time IS NOT NULL)::int AS resolved,
+               1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM new_rows
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               -1 AS tickets,
+               -1 * (resolution_time IS NOT NULL)::int AS resolved,
+               -1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM old_rows
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               -1 AS tickets,
+               -1 * (resolution_time IS NOT NULL)::int AS resolved,
+               -1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM old_rows
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_daily_rollup;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_rollup_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_insert();
+
+CREATE OR REPLACE TRIGGER tickets_rollup_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_update();
+
+CREATE OR REPLACE TRIGGER tickets_rollup_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_delete();
+
+CREATE OR REPLACE TRIGGER tickets_rollup_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_truncate();
+
+TRUNCATE ticket_daily_rollup;
+
+INSERT INTO ticket_daily_rollup
+    (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+SELECT (created_at AT TIME ZONE 'UTC')::date, status, priority, category, assigned_to,
+       count(*), count(resolution_time), coalesce(sum(resolution_time), 0)
+FROM tickets
+GROUP BY 1, 2, 3, 4, 5;
+
+COMMIT;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_resolved_at ON tickets(resolved_at) WHERE resolved_at IS NOT NULL;
+
+ANALYZE ticket_daily_rollup;
@@ -0,0 +1,24 @@
+-- ============================================
+-- MIGRATION 007 - Ticket SLA due dates and SLA metric indexes
+-- ============================================
+-- New tickets get sla_due_date = created_at + the resolution target of their
+-- priority (SLA_HOURS_CRITICAL / HIGH / MEDIUM / LOW). This fills it in for
+-- existing tickets with the default targets; adjust the hours below if the
+-- deployment overrides them. The UPDATE rewrites every ticket without a due
+-- date; run it in a quiet period.
+-- Enum labels are the names stored by the application's tables.
+-- The partial indexes keep the dashboard SLA counts to index range scans:
+-- open tickets by due date (breached / at risk); resolved tickets by
+-- resolved_at (added in 006). CONCURRENTLY: run outside a transaction block.
+
+UPDATE tickets SET sla_due_date = created_at + CASE priority
+        WHEN 'CRITICAL' THEN interval '4 hours'
+        WHEN 'HIGH' THEN interval '24 hours'
+        WHEN 'MEDIUM' THEN interval '48 hours'
+        ELSE interval '120 hours'
+    END
+WHERE sla_due_date IS NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_open_sla_due ON tickets(sla_due_date) WHERE status NOT IN ('RESOLVED', 'CLOSED');
+
+ANALYZE tickets;
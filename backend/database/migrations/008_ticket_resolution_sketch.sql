@@ -0,0 +1,140 @@
+-- ============================================
+-- MIGRATION 008 - Resolution time sketches for percentiles
+-- ============================================
+-- /analytics/full reports p50 / p90 / p99 resolution times, read from
+-- ticket_resolution_sketch: a DDSketch (ticket counts per logarithmic
+-- bucket, 1% relative accuracy) per resolution day, category and priority.
+-- Statement-level triggers keep it current, like the daily rollup (006).
+-- The application creates the table and triggers empty at startup if they
+-- are missing, so this script also (re)fills the table, in one transaction
+-- that blocks ticket writes (SHARE mode, reads continue) for one scan of
+-- tickets. The bucket expression must match RESOLUTION_SKETCH_BUCKET in
+-- app/models/models.py.
+
+BEGIN;
+
+LOCK TABLE tickets IN SHARE MODE;
+
+CREATE TABLE IF NOT EXISTS ticket_resolution_sketch AS
+SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+       0::smallint AS bucket, 0::integer AS ticket_count
+FROM tickets
+WITH NO DATA;
+
+ALTER TABLE ticket_resolution_sketch
+    ALTER COLUMN day SET NOT NULL,
+    ALTER COLUMN category SET NOT NULL,
+    ALTER COLUMN priority SET NOT NULL,
+    ALTER COLUMN bucket SET NOT NULL,
+    ALTER COLUMN ticket_count SET NOT NULL;
+
+-- Upsert target of the triggers
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ticket_resolution_sketch_pkey') THEN
+        ALTER TABLE ticket_resolution_sketch ADD PRIMARY KEY (day, category, priority, bucket);
+    END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM (
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               1 AS tickets
+        FROM new_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM (
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               1 AS tickets
+        FROM new_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+        UNION ALL
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               -1 AS tickets
+        FROM old_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM (
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               -1 AS tickets
+        FROM old_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_resolution_sketch;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_sketch_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_insert();
+
+CREATE OR REPLACE TRIGGER tickets_sketch_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_update();
+
+CREATE OR REPLACE TRIGGER tickets_sketch_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_delete();
+
+CREATE OR REPLACE TRIGGER tickets_sketch_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_truncate();
+
+TRUNCATE ticket_resolution_sketch;
+
+INSERT INTO ticket_resolution_sketch (day, category, priority, bucket, ticket_count)
+SELECT (resolved_at AT TIME ZONE 'UTC')::date, category, priority,
+       CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END,
+       count(*)
+FROM tickets
+WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+
+COMMIT;
+
+ANALYZE ticket_resolution_sketch;
@@ -0,0 +1,12 @@
+-- ============================================
+-- MIGRATION 009 - SLA breaches over time
+-- ============================================
+-- GET /analytics/timeseries?metric=breaches counts the tickets that were not
+-- resolved by their SLA due date, bucketed by that due date. This partial
+-- index holds only those tickets (open, or resolved late), so a range of due
+-- dates is an index range scan. CONCURRENTLY: run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ticket_sla_missed ON tickets(sla_due_date)
+    WHERE resolved_at IS NULL OR resolved_at > sla_due_date;
+
+ANALYZE tickets;
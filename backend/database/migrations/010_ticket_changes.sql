@@ -0,0 +1,56 @@
+-- ============================================
+-- MIGRATION 010 - Ticket change feed
+-- ============================================
+-- GET /tickets/changes returns the tickets updated after a cursor, by
+-- (updated_at, id) on idx_ticket_updated_at_id (migration 001), and the
+-- tickets deleted since, from ticket_tombstones, which a trigger fills on
+-- every DELETE. Every UPDATE must move updated_at, so the tickets_updated_at
+-- trigger of schema.sql is (re)created for databases the application
+-- created. A TRUNCATE of tickets resets all cursors (system_settings key
+-- ticket_changes_reset_at). Safe to run again.
+
+CREATE TABLE IF NOT EXISTS ticket_tombstones (
+    id INTEGER PRIMARY KEY,  -- Id of the deleted ticket
+    ticket_id VARCHAR(50) NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ticket_tombstone_deleted_at_id ON ticket_tombstones(deleted_at, id);
+
+CREATE OR REPLACE FUNCTION update_updated_at() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_updated_at BEFORE UPDATE ON tickets
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+CREATE OR REPLACE FUNCTION ticket_tombstone_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_tombstones (id, ticket_id, deleted_at)
+    SELECT id, ticket_id, now() FROM old_rows
+    ORDER BY id
+    ON CONFLICT (id) DO UPDATE SET ticket_id = excluded.ticket_id, deleted_at = excluded.deleted_at;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_changes_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_tombstones;
+    INSERT INTO system_settings (key, value, value_type, description, updated_at)
+    VALUES ('ticket_changes_reset_at', now()::text, 'datetime',
+            'Ticket change cursors from before this time must reload', now())
+    ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_tombstone_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_tombstone_delete();
+
+CREATE OR REPLACE TRIGGER tickets_changes_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_changes_truncate();
@@ -0,0 +1,15 @@
+-- ============================================
+-- MIGRATION 011 - Ticket number sequence
+-- ============================================
+-- Ticket ids (T-001) were numbered from count(*) + 1 by the API and from
+-- tickets.id by imports, so the two could hand out the same number. Both
+-- now take numbers from ticket_number_seq. The sequence starts after the
+-- highest T-<number> stored so far. Safe to run again (it never moves back).
+
+CREATE SEQUENCE IF NOT EXISTS ticket_number_seq;
+
+SELECT setval('ticket_number_seq', stored.number)
+FROM (
+    SELECT max(substring(ticket_id FROM '^T-([0-9]{1,18})$')::bigint) AS number FROM tickets
+) stored, ticket_number_seq sequence
+WHERE stored.number > CASE WHEN sequence.is_called THEN sequence.last_value ELSE sequence.last_value - 1 END;
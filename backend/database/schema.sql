@@ -6,6 +6,9 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Trigram matching for fuzzy ticket/user search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ============================================
 -- ENUM TYPES
 -- ============================================
@@ -79,6 +82,8 @@ CREATE TABLE users (
 CREATE INDEX idx_user_email ON users(email);
 CREATE INDEX idx_user_azure_id ON users(azure_id);
 CREATE INDEX idx_user_is_admin ON users(is_admin) WHERE is_admin = TRUE;
+CREATE INDEX idx_user_name_trgm ON users USING gist(name gist_trgm_ops);
+CREATE INDEX idx_user_email_trgm ON users USING gist(email gist_trgm_ops);
 
 -- Trigger to update updated_at
 CREATE OR REPLACE FUNCTION update_updated_at()
@@ -117,6 +122,9 @@ CREATE TABLE tickets (
     source_email_from VARCHAR(255),
     source_email_subject VARCHAR(500),
     
+    -- Idempotency key of a ticket replayed from the write-behind spool
+    spool_key VARCHAR(64),
+    
     -- LLM Classification Metadata
     llm_confidence FLOAT,
     llm_raw_response JSONB,
@@ -128,7 +136,13 @@ CREATE TABLE tickets (
     -- Timestamps
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
-    resolved_at TIMESTAMP WITH TIME ZONE
+    resolved_at TIMESTAMP WITH TIME ZONE,
+    
+    -- Full-text search document (title/ticket_id weight A, description weight B)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(ticket_id, '') || ' ' || coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 -- Indexes
@@ -140,10 +154,31 @@ CREATE INDEX idx_ticket_assigned_to ON tickets(assigned_to);
 CREATE INDEX idx_ticket_created_by ON tickets(created_by);
 CREATE INDEX idx_ticket_ticket_id ON tickets(ticket_id);
 
--- Full-text search index
-CREATE INDEX idx_ticket_search ON tickets USING gin(
-    to_tsvector('english', title || ' ' || description)
-);
+-- Keyset (cursor) pagination: (order column, id) composites
+CREATE INDEX idx_ticket_created_at_id ON tickets(created_at, id);
+CREATE INDEX idx_ticket_updated_at_id ON tickets(updated_at, id);
+CREATE INDEX idx_ticket_title_id ON tickets(title, id);
+CREATE INDEX idx_ticket_status_created_at_id ON tickets(status, created_at, id);
+CREATE INDEX idx_ticket_assigned_created_at_id ON tickets(assigned_to, created_at, id);
+CREATE INDEX idx_ticket_created_by_created_at_id ON tickets(created_by, created_at, id);
+
+-- Full-text search index (queried with search_vector @@ websearch_to_tsquery(...))
+CREATE INDEX idx_ticket_search_vector ON tickets USING gin(search_vector);
+
+-- Ticket id prefix lookup ("T-12" -> T-12, T-120, ...) in any collation
+CREATE INDEX idx_ticket_ticket_id_prefix ON tickets(ticket_id varchar_pattern_ops);
+
+-- Spool replay deduplication (partial: regular tickets add no entries)
+CREATE UNIQUE INDEX idx_ticket_spool_key ON tickets(spool_key) WHERE spool_key IS NOT NULL;
+
+-- Recently resolved tickets (resolved today; partial: open tickets add no entries)
+CREATE INDEX idx_ticket_resolved_at ON tickets(resolved_at) WHERE resolved_at IS NOT NULL;
+
+-- SLA breached / at risk: open tickets by due date (partial: resolved tickets add no entries)
+CREATE INDEX idx_ticket_open_sla_due ON tickets(sla_due_date) WHERE status NOT IN ('Resolved', 'Closed');
+
+-- SLA breaches over time: tickets not resolved by their due date, by due date
+CREATE INDEX idx_ticket_sla_missed ON tickets(sla_due_date) WHERE resolved_at IS NULL OR resolved_at > sla_due_date;
 
 CREATE TRIGGER tickets_updated_at
     BEFORE UPDATE ON tickets
@@ -171,6 +206,7 @@ CREATE TABLE ticket_logs (
 CREATE INDEX idx_log_ticket_id ON ticket_logs(ticket_id);
 CREATE INDEX idx_log_created_at ON ticket_logs(created_at DESC);
 CREATE INDEX idx_log_user_id ON ticket_logs(user_id);
+CREATE INDEX idx_log_ticket_created_at_id ON ticket_logs(ticket_id, created_at, id);
 
 
 -- ============================================
@@ -192,6 +228,7 @@ CREATE TABLE ticket_comments (
 CREATE INDEX idx_comment_ticket_id ON ticket_comments(ticket_id);
 CREATE INDEX idx_comment_created_at ON ticket_comments(created_at);
 CREATE INDEX idx_comment_author_id ON ticket_comments(author_id);
+CREATE INDEX idx_comment_ticket_created_at_id ON ticket_comments(ticket_id, created_at, id);
 
 
 -- ============================================
@@ -213,6 +250,7 @@ CREATE TABLE attachments (
 
 -- Indexes
 CREATE INDEX idx_attachment_ticket_id ON attachments(ticket_id);
+CREATE INDEX idx_attachment_ticket_created_at_id ON attachments(ticket_id, created_at, id);
 
 
 -- ============================================
@@ -244,6 +282,8 @@ CREATE INDEX idx_email_received_at ON email_sources(received_at DESC);
 CREATE INDEX idx_email_processed_at ON email_sources(processed_at);
 CREATE INDEX idx_email_is_sap_related ON email_sources(is_sap_related) WHERE is_sap_related = TRUE;
 CREATE INDEX idx_email_unprocessed ON email_sources(received_at) WHERE processed_at IS NULL;
+CREATE INDEX idx_email_category_received_at_id ON email_sources(detected_category, received_at, id);
+CREATE INDEX idx_email_processed_at_id ON email_sources(processed_at, id);
 
 
 -- ============================================
@@ -265,6 +305,7 @@ CREATE TABLE admin_audit_logs (
 CREATE INDEX idx_audit_admin_id ON admin_audit_logs(admin_id);
 CREATE INDEX idx_audit_created_at ON admin_audit_logs(created_at DESC);
 CREATE INDEX idx_audit_action ON admin_audit_logs(action);
+CREATE INDEX idx_audit_created_at_id ON admin_audit_logs(created_at, id);
 
 
 -- ============================================
@@ -285,6 +326,93 @@ CREATE TABLE system_settings (
 CREATE INDEX idx_setting_key ON system_settings(key);
 
 
+-- ============================================
+-- SEARCH TERMS TABLE
+-- ============================================
+-- Distinct words of ticket titles (rebuilt by the scheduler from ts_stat),
+-- used to correct misspelled autocomplete input
+
+CREATE TABLE search_terms (
+    term VARCHAR(100) PRIMARY KEY,
+    ndoc INTEGER NOT NULL  -- Number of tickets containing the term
+);
+
+CREATE INDEX idx_search_term_trgm ON search_terms USING gist(term gist_trgm_ops);
+
+
+-- ============================================
+-- TICKET DAILY ROLLUP TABLE
+-- ============================================
+-- Ticket counts per creation day (UTC), status, priority, category and
+-- assignee, maintained by the rollup triggers on tickets (see FUNCTIONS);
+-- dashboard and analytics counts are read from here
+
+CREATE TABLE ticket_daily_rollup (
+    id BIGSERIAL PRIMARY KEY,
+    day DATE NOT NULL,
+    status ticket_status NOT NULL,
+    priority ticket_priority NOT NULL,
+    category ticket_category NOT NULL,
+    assigned_to INTEGER,
+    ticket_count INTEGER NOT NULL,
+    resolved_count INTEGER NOT NULL,  -- Tickets with a resolution_time
+    resolution_minutes BIGINT NOT NULL  -- Sum of their resolution_time
+);
+
+-- Upsert target of the triggers; unassigned tickets (NULL) share one row per group
+CREATE UNIQUE INDEX idx_ticket_rollup_group
+    ON ticket_daily_rollup(day, status, priority, category, assigned_to) NULLS NOT DISTINCT;
+
+
+-- ============================================
+-- TICKET RESOLUTION SKETCH TABLE
+-- ============================================
+-- DDSketch of resolution times per resolution day (UTC), category and
+-- priority: ticket counts per logarithmic bucket (1% relative accuracy),
+-- maintained by the sketch triggers on tickets (see FUNCTIONS); resolution
+-- time percentiles merge the sketches of the requested days
+
+CREATE TABLE ticket_resolution_sketch (
+    day DATE NOT NULL,
+    category ticket_category NOT NULL,
+    priority ticket_priority NOT NULL,
+    bucket SMALLINT NOT NULL,  -- 0: zero minutes; b > 0: (1.0202^(b-2), 1.0202^(b-1)] minutes
+    ticket_count INTEGER NOT NULL,
+    PRIMARY KEY (day, category, priority, bucket)
+);
+
+
+-- ============================================
+-- ANALYTICS CACHE TABLE
+-- ============================================
+-- Cached analytics responses shared by all server processes when
+-- ANALYTICS_CACHE_BACKEND=postgres. UNLOGGED: a crash empties it, which
+-- only costs a recompute.
+
+CREATE UNLOGGED TABLE analytics_cache (
+    key VARCHAR(200) PRIMARY KEY,
+    value JSON NOT NULL,
+    fresh_until DOUBLE PRECISION NOT NULL,
+    stale_until DOUBLE PRECISION NOT NULL
+);
+
+
+-- ============================================
+-- TICKET TOMBSTONES TABLE
+-- ============================================
+-- Deleted tickets, filled by the tombstone trigger on tickets (see
+-- FUNCTIONS), so clients syncing through /tickets/changes learn of deletes;
+-- pruned by the scheduler after TICKET_TOMBSTONE_RETENTION_DAYS
+
+CREATE TABLE ticket_tombstones (
+    id INTEGER PRIMARY KEY,  -- Id of the deleted ticket
+    ticket_id VARCHAR(50) NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX idx_ticket_tombstone_deleted_at_id ON ticket_tombstones(deleted_at, id);
+
+
 -- ============================================
 -- VIEWS
 -- ============================================
@@ -333,14 +461,17 @@ GROUP BY u.id, u.name, u.email;
 -- FUNCTIONS
 -- ============================================
 
+-- Ticket numbers (the 1 of T-001), shared by every path that creates tickets
+CREATE SEQUENCE ticket_number_seq;
+
 -- Function to generate next ticket ID
 CREATE OR REPLACE FUNCTION generate_ticket_id()
 RETURNS VARCHAR AS $$
 DECLARE
-    next_id INTEGER;
+    next_id BIGINT;
 BEGIN
-    SELECT COALESCE(MAX(id), 0) + 1 INTO next_id FROM tickets;
-    RETURN 'T-' || LPAD(next_id::TEXT, 3, '0');
+    next_id := nextval('ticket_number_seq');
+    RETURN 'T-' || LPAD(next_id::TEXT, GREATEST(3, LENGTH(next_id::TEXT)), '0');
 END;
 $$ LANGUAGE plpgsql;
 
@@ -363,6 +494,228 @@ CREATE TRIGGER trigger_calculate_resolution_time
     EXECUTE FUNCTION calculate_resolution_time();
 
 
+-- Ticket daily rollup maintenance: each statement folds the rows it changed
+-- (its transition table) into +1 / -1 deltas per group and applies them with
+-- one upsert, in key order so concurrent writers lock rollup rows alike
+CREATE OR REPLACE FUNCTION ticket_rollup_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               1 AS tickets,
+               1 * (resolution_time IS NOT NULL)::int AS resolved,
+               1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM new_rows
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               1 AS tickets,
+               1 * (resolution_time IS NOT NULL)::int AS resolved,
+               1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM new_rows
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               -1 AS tickets,
+               -1 * (resolution_time IS NOT NULL)::int AS resolved,
+               -1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM old_rows
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_daily_rollup AS r
+        (day, status, priority, category, assigned_to, ticket_count, resolved_count, resolution_minutes)
+    SELECT day, status, priority, category, assigned_to, sum(tickets), sum(resolved), sum(minutes)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, status, priority, category, assigned_to,
+               -1 AS tickets,
+               -1 * (resolution_time IS NOT NULL)::int AS resolved,
+               -1 * coalesce(resolution_time, 0)::bigint AS minutes
+        FROM old_rows
+    ) AS deltas
+    GROUP BY day, status, priority, category, assigned_to
+    HAVING sum(tickets) <> 0 OR sum(resolved) <> 0 OR sum(minutes) <> 0
+    ORDER BY day, status, priority, category, assigned_to
+    ON CONFLICT (day, status, priority, category, assigned_to) DO UPDATE SET
+        ticket_count = r.ticket_count + excluded.ticket_count,
+        resolved_count = r.resolved_count + excluded.resolved_count,
+        resolution_minutes = r.resolution_minutes + excluded.resolution_minutes;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_rollup_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_daily_rollup;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_rollup_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_insert();
+
+CREATE OR REPLACE TRIGGER tickets_rollup_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_update();
+
+CREATE OR REPLACE TRIGGER tickets_rollup_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_delete();
+
+CREATE OR REPLACE TRIGGER tickets_rollup_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_rollup_truncate();
+
+-- Resolution time sketch maintenance, same pattern as the rollup: tickets with
+-- a resolution time count in the bucket of their resolution day
+CREATE OR REPLACE FUNCTION ticket_sketch_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM (
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               1 AS tickets
+        FROM new_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM (
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               1 AS tickets
+        FROM new_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+        UNION ALL
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               -1 AS tickets
+        FROM old_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_resolution_sketch AS s (day, category, priority, bucket, ticket_count)
+    SELECT day, category, priority, bucket, sum(tickets)
+    FROM (
+        SELECT (resolved_at AT TIME ZONE 'UTC')::date AS day, category, priority,
+               CASE WHEN resolution_time > 0 THEN 1 + ceil(ln(resolution_time::float8) / 0.020000666706669435)::int ELSE 0 END AS bucket,
+               -1 AS tickets
+        FROM old_rows
+        WHERE resolution_time IS NOT NULL AND resolved_at IS NOT NULL
+    ) AS deltas
+    GROUP BY day, category, priority, bucket
+    HAVING sum(tickets) <> 0
+    ORDER BY day, category, priority, bucket
+    ON CONFLICT (day, category, priority, bucket) DO UPDATE SET
+        ticket_count = s.ticket_count + excluded.ticket_count;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_sketch_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_resolution_sketch;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_sketch_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_insert();
+
+CREATE OR REPLACE TRIGGER tickets_sketch_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_update();
+
+CREATE OR REPLACE TRIGGER tickets_sketch_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_delete();
+
+CREATE OR REPLACE TRIGGER tickets_sketch_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_sketch_truncate();
+
+
+-- Ticket change feed: deletes leave tombstones, and a TRUNCATE resets the
+-- /tickets/changes cursors of all clients (they reload)
+CREATE OR REPLACE FUNCTION ticket_tombstone_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO ticket_tombstones (id, ticket_id, deleted_at)
+    SELECT id, ticket_id, now() FROM old_rows
+    ORDER BY id
+    ON CONFLICT (id) DO UPDATE SET ticket_id = excluded.ticket_id, deleted_at = excluded.deleted_at;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ticket_changes_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE ticket_tombstones;
+    INSERT INTO system_settings (key, value, value_type, description, updated_at)
+    VALUES ('ticket_changes_reset_at', now()::text, 'datetime',
+            'Ticket change cursors from before this time must reload', now())
+    ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER tickets_tombstone_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_tombstone_delete();
+
+CREATE OR REPLACE TRIGGER tickets_changes_truncate AFTER TRUNCATE ON tickets
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_changes_truncate();
+
+
 -- ============================================
 -- ROW LEVEL SECURITY (RLS) POLICIES
 -- ============================================
@@ -445,6 +798,10 @@ COMMENT ON TABLE attachments IS 'File attachments for tickets';
 COMMENT ON TABLE email_sources IS 'Emails fetched via IMAP for processing';
 COMMENT ON TABLE admin_audit_logs IS 'Audit trail for admin actions';
 COMMENT ON TABLE system_settings IS 'Application configuration settings';
+COMMENT ON TABLE ticket_daily_rollup IS 'Ticket counts per day and dimension, maintained by triggers, for analytics';
+COMMENT ON TABLE ticket_resolution_sketch IS 'Resolution time DDSketch buckets per day, category and priority, maintained by triggers';
+COMMENT ON TABLE analytics_cache IS 'Cached analytics responses (shared cache backend)';
+COMMENT ON TABLE ticket_tombstones IS 'Deleted tickets, for clients syncing ticket changes';
 
 COMMENT ON COLUMN tickets.ticket_id IS 'Human-readable ticket ID (T-001 format)';
 COMMENT ON COLUMN tickets.category IS 'SAP module category detected by LLM';
@@ -36,6 +36,9 @@ INSERT INTO tickets (ticket_id, title, description, status, priority, category,
  'User JSMITH cannot access transaction ME21N. Getting authorization error even though role Z_MM_BUYER is assigned.',
  'Resolved', 'Medium', 'BASIS', 3, 2);
 
+-- The sample tickets took T-001 to T-005; new tickets continue after them
+SELECT setval('ticket_number_seq', 5);
+
 
 -- Insert sample ticket logs
 INSERT INTO ticket_logs (ticket_id, user_id, log_type, action) VALUES
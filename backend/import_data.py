@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Bulk import of tickets, ticket logs or comments from a CSV or JSON Lines file
+into the SAP Support Ticket Dashboard database.
+
+Usage:
+    python import_data.py tickets legacy_tickets.csv --default-user admin@company.com
+    python import_data.py logs legacy_logs.jsonl --errors failed_logs.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.database import async_engine, AsyncSessionLocal
+from app.repositories import UserRepository
+from app.schemas import ImportJobResponse
+from app.services import ImportService
+from app.services.import_service import IMPORT_KINDS, IMPORT_FORMATS
+
+
+async def main(args: argparse.Namespace) -> int:
+    format = args.format or os.path.splitext(args.path)[1].lstrip(".").lower()
+    if format not in IMPORT_FORMATS:
+        print(f"Unsupported format {format!r} (use --format {' or '.join(IMPORT_FORMATS)})")
+        return 2
+
+    report = ImportJobResponse(
+        id=uuid.uuid4().hex,
+        kind=args.kind,
+        format=format,
+        started_at=datetime.now(timezone.utc)
+    )
+
+    def on_progress(report: ImportJobResponse) -> None:
+        print(
+            f"  {report.rows_read:>12,} read  {report.rows_imported:>12,} imported  "
+            f"{report.rows_failed:>10,} failed  {report.rows_per_second:>10,.0f} rows/s"
+        )
+
+    errors_file = open(args.errors, "w", newline="", encoding="utf-8") if args.errors else None
+    errors_writer = csv.writer(errors_file) if errors_file else None
+    if errors_writer:
+        errors_writer.writerow(["line", "error"])
+
+    try:
+        async with AsyncSessionLocal() as db:
+            default_user_id = None
+            if args.default_user:
+                # Matched case-insensitively, like the emails in the file
+                default_user_id = (await UserRepository(db).get_ids_by_email()).get(args.default_user.lower())
+                if not default_user_id:
+                    print(f"No user with email {args.default_user}")
+                    return 2
+
+            with open(args.path, encoding="utf-8-sig", newline="") as file:
+                await ImportService(db).run(
+                    args.kind,
+                    file,
+                    format,
+                    report,
+                    default_user_id=default_user_id,
+                    on_error=(lambda error: errors_writer.writerow([error.line, error.error])) if errors_writer else None,
+                    on_progress=on_progress
+                )
+    finally:
+        if errors_file:
+            errors_file.close()
+        await async_engine.dispose()
+
+    print("-" * 60)
+    print(f"Status: {report.status}")
+    print(f"Rows imported: {report.rows_imported:,} of {report.rows_read:,} ({report.rows_failed:,} failed)")
+    if report.error:
+        print(f"Error: {report.error}")
+    if report.rows_failed and not errors_writer:
+        for error in report.errors[:20]:
+            print(f"  line {error.line}: {error.error}")
+        if report.rows_failed > 20:
+            print(f"  ... use --errors FILE to save all {report.rows_failed:,} failed rows")
+    return 0 if report.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("kind", choices=IMPORT_KINDS)
+    parser.add_argument("path", help="CSV file with a header row, or JSON Lines file")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--errors", metavar="FILE", help="Write every failed row (line, error) to this CSV file")
+    parser.add_argument("--default-user", metavar="EMAIL", help="User for rows without a creator / user / author")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SAP Support Ticket Dashboard - Bulk Import")
+    print("=" * 60)
+    print(f"Importing {args.kind} from {args.path} in chunks of {settings.import_chunk_size:,} rows")
+    print("=" * 60)
+
+    sys.exit(asyncio.run(main(args)))
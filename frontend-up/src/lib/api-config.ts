@@ -22,11 +22,17 @@ export const API_ENDPOINTS = {
     get: (id: number) => `/tickets/${id}`,
     getByTicketId: (ticketId: string) => `/tickets/by-ticket-id/${ticketId}`,
     update: (id: number) => `/tickets/${id}`,
+    bulk: '/tickets/bulk',
     delete: (id: number) => `/tickets/${id}`,
     recent: '/tickets/recent',
     my: '/tickets/my',
+    changes: '/tickets/changes',
+    export: '/tickets/export',
     logs: (id: number) => `/tickets/${id}/logs`,
+    timeline: (id: number) => `/tickets/${id}/timeline`,
+    attachments: (id: number) => `/tickets/${id}/attachments`,
     comments: {
+      list: (ticketId: number) => `/tickets/${ticketId}/comments`,
       add: (ticketId: number) => `/tickets/${ticketId}/comments`,
       update: (commentId: number) => `/tickets/comments/${commentId}`,
       delete: (commentId: number) => `/tickets/comments/${commentId}`,
@@ -72,6 +78,11 @@ export const API_ENDPOINTS = {
     reprocess: (id: number) => `/emails/${id}/reprocess`,
     byCategory: (category: string) => `/emails/by-category/${category}`,
   },
+  
+  // Search
+  search: {
+    suggest: '/search/suggest',
+  },
 };
 
 // Request configuration
@@ -209,8 +209,8 @@ export const ticketService = {
    */
   async getTicketLogs(ticketId: number): Promise<ApiResponse<TicketLog[]>> {
     try {
-      const logs = await ticketsApi.getTicketLogs(ticketId);
-      return { success: true, data: logs };
+      const page = await ticketsApi.getTicketLogs(ticketId);
+      return { success: true, data: page.items };
     } catch (error: any) {
       return { success: false, error: error.message || 'Failed to fetch ticket logs' };
     }
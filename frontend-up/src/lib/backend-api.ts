@@ -5,7 +5,7 @@
 
 import api, { ApiError } from './api-client';
 import { API_ENDPOINTS } from './api-config';
-import type { Ticket, User, TicketLog, TicketComment } from '@/types';
+import type { Ticket, User, TicketLog, TicketComment, Attachment } from '@/types';
 
 // ============================================
 // Auth API
@@ -67,14 +67,40 @@ export interface TicketListParams {
   search?: string;
   order_by?: string;
   order_desc?: boolean;
+  cursor?: string;
+  include_total?: boolean;
+  count_mode?: 'exact' | 'estimated';
 }
 
 export interface TicketListResponse {
   items: Ticket[];
-  total: number;
-  page: number;
+  total: number | null;
+  total_is_estimate: boolean;
+  page: number | null;
   size: number;
-  pages: number;
+  pages: number | null;
+  next_cursor: string | null;
+  highlights: Record<string, string> | null;
+}
+
+/** One cursor page of a ticket detail section (logs, comments, attachments) */
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export interface SectionPageParams {
+  limit?: number;
+  cursor?: string;
+}
+
+/** One entry of the merged ticket timeline; the field named by kind is set */
+export interface TimelineItem {
+  kind: 'log' | 'comment' | 'attachment';
+  created_at: string;
+  log?: TicketLog;
+  comment?: TicketComment;
+  attachment?: Attachment;
 }
 
 export interface CreateTicketData {
@@ -96,12 +122,41 @@ export interface UpdateTicketData {
   assigned_to?: number;
 }
 
+export interface BulkUpdateTicketsData {
+  ticket_ids: number[];
+  status?: string;
+  priority?: string;
+  assigned_to?: number;
+}
+
+export interface BulkUpdateResult {
+  id: number;
+  success: boolean;
+  changed: string[];
+  error: string | null;
+  ticket: Ticket | null;
+}
+
+export interface BulkUpdateResponse {
+  updated: number;
+  failed: number;
+  results: BulkUpdateResult[];
+}
+
+export interface TicketChangesResponse {
+  tickets: Ticket[];
+  deleted: number[];
+  next_cursor: string | null;
+  has_more: boolean;
+  reset: boolean;
+}
+
 export const ticketsApi = {
   /**
    * Get paginated list of tickets
    */
   async getTickets(params: TicketListParams = {}): Promise<TicketListResponse> {
-    return api.get<TicketListResponse>(API_ENDPOINTS.tickets.list, params);
+    return api.get<TicketListResponse>(API_ENDPOINTS.tickets.list, { include_total: true, ...params });
   },
 
   /**
@@ -132,6 +187,13 @@ export const ticketsApi = {
     return api.patch<Ticket>(API_ENDPOINTS.tickets.update(id), data);
   },
 
+  /**
+   * Update status, priority and/or assignee of up to 500 tickets at once
+   */
+  async bulkUpdateTickets(data: BulkUpdateTicketsData): Promise<BulkUpdateResponse> {
+    return api.post<BulkUpdateResponse>(API_ENDPOINTS.tickets.bulk, data);
+  },
+
   /**
    * Delete a ticket
    */
@@ -149,15 +211,50 @@ export const ticketsApi = {
   /**
    * Get my tickets
    */
-  async getMyTickets(params: { skip?: number; limit?: number } = {}): Promise<TicketListResponse> {
-    return api.get<TicketListResponse>(API_ENDPOINTS.tickets.my, params);
+  async getMyTickets(params: { skip?: number; limit?: number; cursor?: string; include_total?: boolean } = {}): Promise<TicketListResponse> {
+    return api.get<TicketListResponse>(API_ENDPOINTS.tickets.my, { include_total: true, ...params });
+  },
+
+  /**
+   * Get tickets created, updated or deleted since a cursor (all tickets without it).
+   * Follow next_cursor while has_more; on reset, start again without since.
+   */
+  async getTicketChanges(params: { since?: string; limit?: number } = {}): Promise<TicketChangesResponse> {
+    return api.get<TicketChangesResponse>(API_ENDPOINTS.tickets.changes, params);
+  },
+
+  /**
+   * Get ticket logs (newest first, one cursor page)
+   */
+  async getTicketLogs(ticketId: number, params: SectionPageParams = {}): Promise<CursorPage<TicketLog>> {
+    return api.get<CursorPage<TicketLog>>(API_ENDPOINTS.tickets.logs(ticketId), params);
   },
 
   /**
-   * Get ticket logs
+   * Get the ticket's logs, comments and attachments as one timeline (one cursor page)
    */
-  async getTicketLogs(ticketId: number): Promise<TicketLog[]> {
-    return api.get<TicketLog[]>(API_ENDPOINTS.tickets.logs(ticketId));
+  async getTicketTimeline(
+    ticketId: number,
+    params: SectionPageParams & { order_desc?: boolean } = {}
+  ): Promise<CursorPage<TimelineItem>> {
+    return api.get<CursorPage<TimelineItem>>(API_ENDPOINTS.tickets.timeline(ticketId), params);
+  },
+
+  /**
+   * Get ticket comments (oldest first, one cursor page)
+   */
+  async getTicketComments(
+    ticketId: number,
+    params: SectionPageParams & { include_internal?: boolean } = {}
+  ): Promise<CursorPage<TicketComment>> {
+    return api.get<CursorPage<TicketComment>>(API_ENDPOINTS.tickets.comments.list(ticketId), params);
+  },
+
+  /**
+   * Get ticket attachments (oldest first, one cursor page)
+   */
+  async getTicketAttachments(ticketId: number, params: SectionPageParams = {}): Promise<CursorPage<Attachment>> {
+    return api.get<CursorPage<Attachment>>(API_ENDPOINTS.tickets.attachments(ticketId), params);
   },
 
   /**
@@ -403,6 +500,24 @@ export const emailsApi = {
   },
 };
 
+// ============================================
+// Search API
+// ============================================
+
+export interface SearchSuggestResponse {
+  tickets: { id: number; ticket_id: string; title: string; status: string }[];
+  users: { id: number; name: string; email: string; avatar_url?: string }[];
+}
+
+export const searchApi = {
+  /**
+   * Autocomplete tickets and users (typo tolerant)
+   */
+  async suggest(q: string, limit = 5): Promise<SearchSuggestResponse> {
+    return api.get<SearchSuggestResponse>(API_ENDPOINTS.search.suggest, { q, limit });
+  },
+};
+
 // Export all APIs
 export default {
   auth: authApi,
@@ -411,4 +526,5 @@ export default {
   admin: adminApi,
   analytics: analyticsApi,
   emails: emailsApi,
+  search: searchApi,
 };
@@ -4,6 +4,9 @@
 
 import { Ticket } from '@/types';
 import { formatDate } from './utils';
+import { API_BASE_URL, API_ENDPOINTS } from './api-config';
+import { ApiError } from './api-client';
+import { getAccessToken } from './auth-service';
 
 // Dynamic import for xlsx
 async function getXLSX() {
@@ -130,6 +133,44 @@ export function exportToCSV(
     }
 }
 
+/**
+ * Download every ticket matching the list filters as exported by the backend
+ * (GET /tickets/export). The server streams the file from the database, so
+ * unlike exportToExcel/exportToCSV the tickets do not have to be loaded first.
+ */
+export async function downloadTicketExport(
+    format: 'csv' | 'xlsx',
+    filters: Record<string, string | number | boolean | undefined> = {}
+): Promise<void> {
+    const url = new URL(`${API_BASE_URL}${API_ENDPOINTS.tickets.export}`);
+    Object.entries({ format, ...filters }).forEach(([key, value]) => {
+        if (value !== undefined && value !== null && value !== '') {
+            url.searchParams.append(key, String(value));
+        }
+    });
+    
+    const token = await getAccessToken();
+    const response = await fetch(url.toString(), {
+        headers: token ? { Authorization: `Bearer ${token}` } : {},
+    });
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({}));
+        throw new ApiError(response.status, error.detail || 'Export failed');
+    }
+    
+    const blob = await response.blob();
+    const timestamp = new Date().toISOString().split('T')[0];
+    const link = document.createElement('a');
+    const objectUrl = URL.createObjectURL(blob);
+    link.href = objectUrl;
+    link.download = `tickets_${timestamp}.${format}`;
+    link.style.visibility = 'hidden';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    URL.revokeObjectURL(objectUrl);
+}
+
 /**
  * Export report data to Excel
  */